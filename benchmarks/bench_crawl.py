@@ -0,0 +1,245 @@
+"""
+Offline crawl benchmark: runs the real fetch_all_jobs pipeline (streaming
+fetchers, incremental dedup, scoring, link checks) against the local stand-in
+server and records wall time, time to the first page, request counts, bytes,
+peak memory and per-stage timings.
+
+"KiB read in full" counts bodies the client read completely (text()/json());
+streamed validation reads that stop early are only visible in "KiB served".
+
+    python benchmarks/bench_crawl.py                       # 2 runs: cold, then warm caches
+    python benchmarks/bench_crawl.py --runs 3 --error-rate 0.05 --throttle-rate 0.02
+    python benchmarks/bench_crawl.py --compare benchmarks/results/<earlier>.json
+    python benchmarks/bench_crawl.py --block linkedin=captcha --block indeed=hang
+
+Results are written to benchmarks/results/crawl-<timestamp>.json.
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import logging
+import argparse
+import resource
+import tempfile
+import tracemalloc
+import urllib.parse
+from dataclasses import asdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+
+
+def _isolate_state():
+    """Point every persistent cache/store at a throwaway directory before scraper is imported."""
+    workdir = tempfile.mkdtemp(prefix="crawl-bench-")
+    os.environ["LINK_CACHE_FILE"] = os.path.join(workdir, "link_cache.json")
+    os.environ["JOBS_DB"] = os.path.join(workdir, "jobs.db")
+    return workdir
+
+
+def _point_scraper_at(scraper, bases: dict[str, str], real_limits: bool):
+    """Redirect every source to the stand-in and give each local port its real host budget."""
+    from ratelimit import HostLimit, RateLimiter
+    from standin import PORTAL_NAMES
+
+    scraper.MCF_BASE_URL = bases["mcf"]
+    scraper.INDEED_BASE_URL = bases["indeed"]
+    scraper.LINKEDIN_BASE_URL = bases["linkedin"]
+    scraper.AVIATION_PORTALS = [
+        dict(portal, url=f"{bases['portal_' + name]}/careers/{name}/")
+        for portal, name in zip(scraper.AVIATION_PORTALS, PORTAL_NAMES)
+    ]
+
+    real_hosts = {
+        "mcf": "www.mycareersfuture.gov.sg",
+        "indeed": "sg.indeed.com",
+        "linkedin": "www.linkedin.com",
+    }
+    limits = {}
+    for site, base in bases.items():
+        netloc = urllib.parse.urlsplit(base).netloc
+        if not real_limits:
+            limits[netloc] = HostLimit(rate=1000, burst=1000, concurrency=100)
+        else:
+            limits[netloc] = scraper.HOST_RATE_LIMITS.get(real_hosts.get(site), scraper.DEFAULT_HOST_LIMIT)
+    scraper.rate_limiter = RateLimiter(limits, scraper.DEFAULT_HOST_LIMIT)
+
+
+def _byte_counter():
+    import aiohttp
+    counts = {"bytes": 0, "requests": 0}
+
+    async def on_request_start(session, ctx, params):
+        counts["requests"] += 1
+
+    async def on_chunk(session, ctx, params):
+        counts["bytes"] += len(params.chunk)
+
+    trace = aiohttp.TraceConfig()
+    trace.on_request_start.append(on_request_start)
+    trace.on_response_chunk_received.append(on_chunk)
+    return trace, counts
+
+
+async def _control(base: str, action: str, payload: dict = None):
+    import aiohttp
+    async with aiohttp.ClientSession() as session:
+        if action == "stats":
+            async with session.get(f"{base}/__standin/stats") as resp:
+                return await resp.json()
+        async with session.post(f"{base}/__standin/{action}", json=payload or {}) as resp:
+            return await resp.json()
+
+
+async def run_benchmark(args) -> dict:
+    import scraper
+
+    _point_scraper_at(scraper, args.bases, real_limits=not args.no_rate_limit)
+    trace, client = _byte_counter()
+    scraper.TRACE_CONFIGS.append(trace)
+    control = args.bases["mcf"]
+
+    runs = []
+    for n in range(args.runs):
+        await _control(control, "reset")
+        client["bytes"] = client["requests"] = 0
+        if args.tracemalloc:
+            tracemalloc.start()
+        start = time.perf_counter()
+        jobs = await scraper.fetch_all_jobs(force_refresh=True)
+        wall = time.perf_counter() - start
+        traced_peak = None
+        if args.tracemalloc:
+            traced_peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        server = await _control(control, "stats")
+        crawl = dict(scraper.last_crawl_stats)
+        crawl["parse"] = {src: {"pages": p, "seconds": s} for src, (p, s) in crawl.get("parse", {}).items()}
+        runs.append({
+            "run": n + 1,
+            "wall_s": wall,
+            "jobs_returned": len(jobs),
+            "client_requests": client["requests"],
+            "client_bytes_read": client["bytes"],
+            "server": server,
+            "server_requests": sum(sum(s["requests"].values()) for s in server.values()),
+            "server_bytes_sent": sum(s["bytes"] for s in server.values()),
+            "peak_traced_mb": traced_peak / 2**20 if traced_peak is not None else None,
+            "stages": crawl,
+        })
+        _print_run(runs[-1])
+    await scraper.http_client.close()
+
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": asdict(args.standin_config),
+        "real_rate_limits": not args.no_rate_limit,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "runs": runs,
+    }
+
+
+def _print_run(run: dict):
+    st = run["stages"]
+    print(
+        f"run {run['run']}: {run['wall_s']:.2f}s wall, {run['jobs_returned']} jobs, "
+        f"{run['client_requests']} requests, {run['client_bytes_read'] / 1024:.0f} KiB read in full, "
+        f"{run['server_bytes_sent'] / 1024:.0f} KiB served"
+        + (f", {run['peak_traced_mb']:.1f} MiB traced peak" if run["peak_traced_mb"] is not None else "")
+    )
+    print(
+        f"  stages: fetch {st.get('fetch_s', 0):.2f}s | dedup {st.get('dedup_s', 0) * 1000:.1f}ms | "
+        f"score {st.get('score_s', 0) * 1000:.1f}ms | validate {st.get('validate_s', 0):.2f}s after fetch"
+    )
+    if "first_page_s" in st:
+        print(f"  first page ready after {st['first_page_s']:.2f}s")
+    http = st.get("http")
+    if http:
+        print(
+            f"  http: {http['connections_opened']} connections opened, {http['connections_reused']} reused "
+            f"({http['reuse_ratio']:.0%}), {http['dns_lookups']} DNS lookups"
+        )
+    print("  sources: " + ", ".join(f"{k} {v:.2f}s" for k, v in st.get("sources", {}).items()))
+    opened = [source for source, state in st.get("breakers", {}).items() if state != "closed"]
+    if opened:
+        print(f"  breakers open: {', '.join(opened)}")
+    print(
+        f"  jobs: {st.get('fetched', 0)} fetched -> {st.get('unique', 0)} unique -> "
+        f"{st.get('validated', 0)} links checked -> {st.get('valid', 0)} valid "
+        f"({st.get('validation_saved', 0):+d} checks vs. the old top 60)"
+    )
+
+
+_COMPARED = ("wall_s", "first_page_s", "client_requests", "client_bytes_read", "server_bytes_sent", "jobs_returned")
+
+
+def _compared_value(run: dict, key: str):
+    return run.get("stages", {}).get(key) if key == "first_page_s" else run.get(key)
+
+
+def _compare(current: dict, previous_path: str):
+    with open(previous_path) as f:
+        previous = json.load(f)
+    print(f"\nCompared with {previous_path} ({previous['timestamp']}):")
+    for cur, prev in zip(current["runs"], previous["runs"]):
+        for key in _COMPARED:
+            a, b = _compared_value(prev, key), _compared_value(cur, key)
+            if a is None or b is None:
+                continue
+            change = f"{(b - a) / a * 100:+.1f}%" if a else "n/a"
+            print(f"  run {cur['run']} {key:<18} {a:>12.2f} -> {b:>12.2f}  ({change})")
+
+
+def main():
+    from standin import BLOCK_MODES, StandInConfig, start_in_subprocess
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=2, help="crawls to run back to back (first is cold)")
+    parser.add_argument("--latency-ms", default="50:150", help="min:max latency added per response")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="share of responses that are 429")
+    parser.add_argument("--expired-rate", type=float, default=0.15)
+    parser.add_argument("--dead-rate", type=float, default=0.05)
+    parser.add_argument("--block", action="append", default=[], metavar="SITE=MODE",
+                        help="make a site block every request: mcf|indeed|linkedin = 403|429|captcha|hang")
+    parser.add_argument("--no-rate-limit", action="store_true", help="lift per-host budgets (measures raw pipeline cost)")
+    parser.add_argument("--tracemalloc", action="store_true", help="trace Python allocations for peak memory (slower)")
+    parser.add_argument("--out", help="where to write the JSON result")
+    parser.add_argument("--compare", help="earlier result JSON to compare against")
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    lo, hi = (float(x) / 1000 for x in args.latency_ms.split(":"))
+    args.standin_config = StandInConfig(
+        latency_min=lo, latency_max=hi, error_rate=args.error_rate, throttle_rate=args.throttle_rate,
+        expired_rate=args.expired_rate, dead_rate=args.dead_rate,
+        blocked=dict(item.split("=", 1) for item in args.block),
+    )
+    for site, mode in args.standin_config.blocked.items():
+        if mode not in BLOCK_MODES:
+            parser.error(f"--block {site}={mode}: mode must be one of {', '.join(BLOCK_MODES)}")
+    _isolate_state()
+    proc, args.bases = start_in_subprocess(args.standin_config)
+    try:
+        result = asyncio.run(run_benchmark(args))
+    finally:
+        proc.terminate()
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    out = args.out or os.path.join(RESULTS_DIR, f"crawl-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    with open(out, "w") as f:
+        json.dump(result, f, indent=2)
+    print(f"\nPeak RSS {result['peak_rss_mb']:.0f} MiB. Results written to {out}")
+    if args.compare:
+        _compare(result, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Micro-benchmark: cross-source near-duplicate detection. Synthetic postings
+are re-listed by several sources with the variations seen in real crawls
+(company suffixes, bracketed locations, "Urgent:" prefixes, plurals,
+tracking parameters), then deduplicated with the old title/company prefix
+key and with dedup.DedupIndex. Reports postings left against the true
+count, wrong merges, and time as the input grows.
+
+    python benchmarks/bench_dedup.py [--sizes 1000 10000 40000]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dedup import DEDUP_TITLE_SIMILARITY, DedupIndex, _full_title, title_shingles  # noqa: E402
+from job import Job  # noqa: E402
+
+ROLES = [
+    "passenger service agent", "passenger service officer", "customer service officer",
+    "ramp agent", "baggage handler", "ground operations executive", "check-in agent",
+    "data analyst", "business analyst", "project coordinator", "admin assistant",
+    "operations executive", "cargo officer", "ticketing officer", "airport operations officer",
+    "flight operations coordinator", "guest service officer", "graduate trainee",
+]
+QUALIFIERS = ["", "junior", "night shift", "terminal 2", "contract", "part time", "relief"]
+COMPANIES = [
+    "SATS", "Singapore Airlines", "Changi Airport Group", "dnata", "Jetstar Asia", "Scoot",
+    "ST Engineering", "CAAS", "Certis", "Swissport", "WFS", "Ramco", "Accenture", "DHL",
+]
+SUFFIXES = ["", " Ltd", " Ltd.", " Pte. Ltd.", " (Singapore) Pte Ltd", " Limited", " LTD"]
+TITLE_VARIANTS = [
+    lambda t: t,
+    lambda t: t.title(),
+    lambda t: t.upper(),
+    lambda t: f"{t.title()} (Changi Airport)",
+    lambda t: f"URGENT: {t.title()}",
+    lambda t: f"{t.title()}s",
+    lambda t: f"{t.title()} - Singapore",
+]
+HOSTS = [
+    "https://www.mycareersfuture.gov.sg/job/{id}",
+    "https://sg.indeed.com/viewjob?jk={id}&from=serp&tk={tk}",
+    "https://www.linkedin.com/jobs/view/{id}?refId={tk}&trackingId={tk}",
+]
+HOST_SOURCES = ["MyCareersFuture", "Indeed", "LinkedIn"]
+
+
+def make_postings(n: int, seed: int = 11) -> tuple[list[Job], dict]:
+    """
+    n distinct postings (no two share employer and role), each listed 1-6
+    times. Returns the listings and id(listing) -> posting number.
+    """
+    rng = random.Random(seed)
+    roles = [" ".join(filter(None, [q, r])) for q in QUALIFIERS for r in ROLES]
+    jobs, postings = [], {}
+    for posting in range(n):
+        employer, role = divmod(posting, len(roles))
+        company = COMPANIES[employer % len(COMPANIES)]
+        if employer >= len(COMPANIES):
+            company += f" {employer // len(COMPANIES) + 1}"
+        role = roles[(role * 5 + employer) % len(roles)]
+        for host in rng.sample(HOSTS, rng.randint(1, 3)):
+            listing_id = f"{posting}-{HOSTS.index(host)}"
+            for _ in range(rng.randint(1, 2)):  # the same source via two queries
+                job = Job(
+                    source=HOST_SOURCES[HOSTS.index(host)],
+                    title=rng.choice(TITLE_VARIANTS)(role),
+                    company=company + rng.choice(SUFFIXES),
+                    url=host.format(id=listing_id, tk=rng.randrange(10 ** 6)),
+                )
+                jobs.append(job)
+                postings[id(job)] = posting
+    rng.shuffle(jobs)
+    return jobs, postings
+
+
+def prefix_key(jobs: list[Job]) -> list[Job]:
+    """What deduplicate() used to do."""
+    seen, unique = set(), []
+    for job in jobs:
+        key = (job.title.lower()[:40], job.company.lower()[:30])
+        if key not in seen:
+            seen.add(key)
+            unique.append(job)
+    return unique
+
+
+def lsh_index(jobs: list[Job]) -> list[Job]:
+    index = DedupIndex()
+    return [job for job in jobs if index.add(job) is job]
+
+
+def pairwise(jobs: list[Job]) -> list[Job]:
+    """The same rules without LSH buckets: every job against every kept job."""
+    kept = []
+    for job in jobs:
+        url, company = job.key, job.norm_company
+        shingles = title_shingles(job.title)
+        for other in kept:
+            if url == other[1]:
+                break
+            if other[0].source == job.source:
+                if company == other[2] and _full_title(job.title) == _full_title(other[0].title):
+                    break  # a repost: same source, same title
+                continue  # near matches only merge across sources
+            if company == other[2] and len(shingles & other[3]) / len(shingles | other[3]) >= DEDUP_TITLE_SIMILARITY:
+                break
+        else:
+            kept.append((job, url, company, shingles))
+    return [k[0] for k in kept]
+
+
+def report(label: str, fn, jobs: list[Job], posting_of: dict, truth: int):
+    start = time.perf_counter()
+    unique = fn(jobs)
+    elapsed = time.perf_counter() - start
+    postings = {posting_of[id(job)] for job in unique}
+    lost = truth - len(postings)  # postings wrongly merged into another
+    print(
+        f"  {label:<14} {len(unique):>7,} left (true {truth:,}): {len(unique) - len(postings):>6,} duplicates kept, "
+        f"{lost:>4} postings lost  {elapsed * 1000:9.1f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 40_000],
+                        help="distinct postings per run")
+    parser.add_argument("--pairwise-max", type=int, default=2_000,
+                        help="largest size the quadratic baseline is run at")
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        jobs, posting_of = make_postings(size)
+        truth = len(set(posting_of.values()))
+        print(f"{len(jobs):,} listings of {truth:,} postings")
+        report("title prefix", prefix_key, jobs, posting_of, truth)
+        report("minhash lsh", lsh_index, jobs, posting_of, truth)
+        if size <= args.pairwise_max:
+            report("pairwise", pairwise, jobs, posting_of, truth)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Micro-benchmark: memory held by crawled jobs as plain dicts against
+job.Job records. Listings are generated as a crawl sees them, with every
+field a separate string object per listing (as parsers and JSON decoding
+produce them), then kept alive as dicts or as Jobs. Reports bytes per job
+and build time; the Job figures include its precomputed key, normalised
+title/company and dedup key, which the dicts would need to recompute.
+
+    python benchmarks/bench_jobs.py [--sizes 1000 10000 50000]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from job import FIELDS, Job  # noqa: E402
+from bench_dedup import COMPANIES, HOSTS, QUALIFIERS, ROLES, SUFFIXES, TITLE_VARIANTS  # noqa: E402
+
+SOURCES = ["MyCareersFuture", "Indeed", "LinkedIn", "SIA Careers", "Changi Airport Careers"]
+LOCATIONS = ["Singapore", "Changi", "Central Singapore", "East Singapore", "Jurong"]
+SNIPPETS = ["Entry level", "Fresh grads welcome", "0–2 yrs exp", "1–2 yrs exp", ""]
+SALARIES = ["", "", "SGD 2,800 – 3,400/month", "SGD 3,000 – 3,800/month", "SGD 3,600 – 4,400/month"]
+
+
+def _fresh(text: str) -> str:
+    """An equal string that is a new object, as a parser would return it."""
+    return "".join([text[:1], text[1:]]) if len(text) > 1 else text
+
+
+def make_listings(n: int, seed: int = 5) -> list[tuple]:
+    rng = random.Random(seed)
+    roles = [" ".join(filter(None, [q, r])) for q in QUALIFIERS for r in ROLES]
+    listings = []
+    for i in range(n):
+        listings.append((
+            rng.choice(SOURCES),
+            rng.choice(TITLE_VARIANTS)(rng.choice(roles)),
+            rng.choice(COMPANIES) + rng.choice(SUFFIXES),
+            rng.choice(LOCATIONS),
+            rng.choice(HOSTS).format(id=f"{i}-{rng.randrange(10 ** 6)}", tk=rng.randrange(10 ** 6)),
+            rng.choice(SALARIES),
+            rng.choice(SNIPPETS),
+        ))
+    return listings
+
+
+def as_dicts(listings: list[tuple]) -> list[dict]:
+    return [dict(zip(FIELDS, map(_fresh, fields))) for fields in listings]
+
+
+def as_jobs(listings: list[tuple]) -> list[Job]:
+    return [Job(*map(_fresh, fields)) for fields in listings]
+
+
+def measure(build, listings: list[tuple]) -> tuple[float, float]:
+    """(bytes per job still held after building, seconds to build); timed without tracing."""
+    start = time.perf_counter()
+    build(listings)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    jobs = build(listings)
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del jobs
+    return held / len(listings), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 50_000],
+                        help="jobs held per run")
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        listings = make_listings(size)
+        dict_bytes, dict_s = measure(as_dicts, listings)
+        job_bytes, job_s = measure(as_jobs, listings)
+        print(f"{size:,} jobs")
+        print(f"  dict  {dict_bytes:7.0f} B/job  {dict_bytes * size / 2**20:7.1f} MiB  built in {dict_s * 1000:8.1f} ms")
+        print(
+            f"  Job   {job_bytes:7.0f} B/job  {job_bytes * size / 2**20:7.1f} MiB  built in {job_s * 1000:8.1f} ms"
+            f"  ({1 - job_bytes / dict_bytes:.0%} less, derived keys included)"
+        )
+
+
+if __name__ == "__main__":
+    main()
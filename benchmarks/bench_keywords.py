@@ -0,0 +1,84 @@
+"""
+Micro-benchmark: title labelling with the compiled keyword engine versus the
+old per-list substring loops.
+
+    python benchmarks/bench_keywords.py [--titles 50000]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from keywords import (  # noqa: E402
+    ATM_SKILLS_MAP, ENTRY_LEVEL_BONUS_KEYWORDS, HIGH_VALUE_KEYWORDS, MEDIUM_VALUE_KEYWORDS,
+    RELEVANT_KEYWORDS, SENIOR_TITLE_KEYWORDS, keyword_engine, title_labels,
+)
+
+WORDS = [
+    "senior", "junior", "airport", "operations", "officer", "executive", "ramp", "agent",
+    "data", "analyst", "business", "customer", "service", "check-in", "passenger",
+    "coordinator", "project", "admin", "assistant", "cargo", "logistics", "ground",
+    "handling", "sales", "engineer", "manager", "retail", "Changi", "SATS", "(Contract)",
+    "-", "/", "Team", "Lead", "Night", "Shift", "Terminal", "2", "trainee", "graduate",
+]
+
+
+def make_titles(n: int, distinct: int, seed: int = 7) -> list[str]:
+    rng = random.Random(seed)
+    pool = [" ".join(rng.choice(WORDS).title() for _ in range(rng.randint(3, 9))) for _ in range(distinct)]
+    return [rng.choice(pool) for _ in range(n)]
+
+
+def legacy_labels(title: str) -> int:
+    """What score_job, _is_senior_title, _is_relevant_title and get_atm_skills used to do."""
+    t = title.lower()
+    score = 0
+    for kw in HIGH_VALUE_KEYWORDS:
+        if kw in t:
+            score += 3
+    for kw in MEDIUM_VALUE_KEYWORDS:
+        if kw in t:
+            score += 2
+    for kw in ENTRY_LEVEL_BONUS_KEYWORDS:
+        if kw in t:
+            score += 2
+    senior = any(kw in t for kw in SENIOR_TITLE_KEYWORDS)
+    relevant = any(kw in t for kw in RELEVANT_KEYWORDS)
+    skills = set()
+    for keyword, skill_list in ATM_SKILLS_MAP.items():
+        if keyword in t:
+            skills.update(skill_list)
+    return score + senior + relevant + len(skills)
+
+
+def run(label: str, fn, titles: list[str]) -> float:
+    start = time.perf_counter()
+    for title in titles:
+        fn(title)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<34} {elapsed * 1000:8.1f} ms   {len(titles) / elapsed:12,.0f} titles/s")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--titles", type=int, default=50_000)
+    parser.add_argument("--distinct", type=int, default=2_000,
+                        help="distinct titles in the mix (crawls see the same titles repeatedly)")
+    args = parser.parse_args()
+
+    titles = make_titles(args.titles, args.distinct)
+    unique = list(dict.fromkeys(titles))
+    print(f"{len(titles):,} titles ({len(unique):,} distinct)\n")
+
+    run("legacy substring loops", legacy_labels, titles)
+    run("keyword engine (uncached)", keyword_engine.labels, titles)
+    title_labels.cache_clear()
+    run("keyword engine (memoised)", title_labels, titles)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Micro-benchmark: rendering digests. A pool of jobs is cut into thousands
+of overlapping digests, the way one crawl is split across /latest, the
+slots and each subscriber group, and rendered with the old
+format_jobs_message (every entry rebuilt, 18 replace() passes per field,
+messages grown by concatenation) and with the current one (cached
+entries, one-pass escaping, joined chunks). Outputs are checked to match.
+
+    python benchmarks/bench_render.py [--pool 500] [--digests 200 2000 10000]
+"""
+import os
+import re
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import formatter  # noqa: E402
+from formatter import SGT, format_jobs_message, get_atm_skills, SOURCE_EMOJI  # noqa: E402
+from bench_jobs import as_jobs, make_listings  # noqa: E402
+
+_UPDATED = re.compile(r"🕐 Updated: [^\n]*")
+
+
+# ─── What formatter.py used to do ────────────────────────────────────────────
+
+def _old_escape(text: str) -> str:
+    for ch in ["_", "*", "[", "]", "(", ")", "~", "`", ">", "#", "+", "-", "=", "|", "{", "}", ".", "!"]:
+        text = text.replace(ch, f"\\{ch}")
+    return text
+
+
+def _old_entry(job) -> str:
+    emoji = SOURCE_EMOJI.get(job.source, "📋")
+    skills = get_atm_skills(job.title)
+    exp_badge = ""
+    if job.snippet:
+        s = job.snippet.lower()
+        if "fresh" in s or ("0" in s and "year" in s):
+            exp_badge = "🟢 Fresh Grad Welcome"
+        elif "entry" in s:
+            exp_badge = "🟢 Entry Level"
+        elif "1" in s or "2" in s:
+            exp_badge = "🔵 1–2 Years Exp"
+        else:
+            exp_badge = f"📋 {job.snippet}"
+    lines = [f"{emoji} *{_old_escape(job.title or 'Untitled')}*"]
+    if exp_badge:
+        lines.append(exp_badge)
+    if job.company:
+        lines.append(f"🏢 {_old_escape(job.company)}")
+    if job.location:
+        lines.append(f"📍 {_old_escape(job.location)}")
+    if job.salary:
+        lines.append(f"💰 {_old_escape(job.salary)}")
+    if skills:
+        lines.append(f"🎓 *ATM Skills:* {', '.join(skills)}")
+    if job.url:
+        lines.append(f"🔗 [View Job]({job.url})")
+    return "\n".join(lines)
+
+
+def old_format_jobs_message(jobs, schedule_label=None) -> list[str]:
+    from datetime import datetime
+    now = datetime.now(SGT).strftime("%d %b %Y, %I:%M %p SGT")
+    slot_line = f"🔔 *{schedule_label} SGT Update*\n" if schedule_label else ""
+    header = (
+        f"✈️ *Aviation & PM Job Listings*\n{slot_line}🎯 Fresh Grad & 1–2 Years Exp\n"
+        f"🕐 Updated: {now}\n📊 {len(jobs)} jobs found\n{'─' * 30}"
+    )
+    messages = []
+    current = header + "\n\n"
+    for job in jobs:
+        entry = _old_entry(job) + "\n\n" + "─" * 30 + "\n\n"
+        if len(current) + len(entry) > 4000:
+            messages.append(current.strip())
+            current = entry
+        else:
+            current += entry
+    if current.strip():
+        messages.append(current.strip())
+    messages[-1] += (
+        "\n\n💡 *Tip:* Use /latest to refresh at any time\\."
+        "\nJobs auto\\-refresh daily at *9:00 AM SGT*\\."
+    )
+    return messages
+
+
+# ─── Benchmark ───────────────────────────────────────────────────────────────
+
+def make_digests(pool: list, n: int, seed: int = 3) -> list[tuple]:
+    """n (jobs, slot label) digests of 5-40 jobs each, drawn from the pool in rank order."""
+    rng = random.Random(seed)
+    labels = [None, "9:00 AM", "12:00 PM", "3:00 PM"]
+    digests = []
+    for _ in range(n):
+        picked = sorted(rng.sample(range(len(pool)), rng.randint(5, min(40, len(pool)))))
+        digests.append(([pool[i] for i in picked], rng.choice(labels)))
+    return digests
+
+
+def run(render, digests: list[tuple]) -> tuple[float, list]:
+    start = time.perf_counter()
+    out = [render(jobs, schedule_label=label) for jobs, label in digests]
+    return time.perf_counter() - start, out
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pool", type=int, default=500, help="distinct jobs the digests draw from")
+    parser.add_argument("--digests", type=int, nargs="+", default=[200, 2_000, 10_000])
+    args = parser.parse_args()
+
+    pool = as_jobs(make_listings(args.pool))
+    for n in args.digests:
+        digests = make_digests(pool, n)
+        old_s, old = run(old_format_jobs_message, digests)
+        formatter._entries.clear()
+        new_s, new = run(format_jobs_message, digests)
+        same = all(
+            [_UPDATED.sub("", m) for m in a] == [_UPDATED.sub("", m) for m in b] for a, b in zip(old, new)
+        )
+        messages = sum(len(m) for m in new)
+        print(
+            f"{n:,} digests ({messages:,} messages, pool of {args.pool}): "
+            f"old {old_s * 1000:8.1f} ms  new {new_s * 1000:7.1f} ms  "
+            f"({old_s / new_s:4.1f}x)  output {'identical' if same else 'DIFFERS'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Update-delivery benchmark: runs the real bot Application against the local
+fake Telegram API (benchmarks/fake_telegram.py) in polling and in webhook
+mode, and records command round-trip latency (command injected -> reply
+received) and the Bot API requests made while the bot sits idle.
+
+    python benchmarks/bench_updates.py
+    python benchmarks/bench_updates.py --commands 50 --idle 30 --modes webhook
+"""
+import os
+import sys
+import time
+import json
+import socket
+import asyncio
+import logging
+import argparse
+import statistics
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+
+# Same long-poll timeout Application.run_polling uses by default
+POLL_TIMEOUT = 10
+
+
+def _isolate_state():
+    """Point the bot's stores at a throwaway directory before bot is imported."""
+    workdir = tempfile.mkdtemp(prefix="updates-bench-")
+    for var, name in (("SUBSCRIBERS_DB", "subscribers.db"), ("OUTBOX_DB", "outbox.db"),
+                      ("JOBS_DB", "jobs.db"), ("LINK_CACHE_FILE", "link_cache.json")):
+        os.environ[var] = os.path.join(workdir, name)
+    return workdir
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def run_mode(mode: str, fake, api_base: str, args) -> dict:
+    import aiohttp
+    import bot
+    import webhook
+
+    app = bot.build_application("123:fake", base_url=f"{api_base}/bot")
+    await app.initialize()
+    await app.post_init(app)
+    runner = None
+    if mode == "webhook":
+        port = _free_port()
+        runner = await webhook.start_webhook(
+            app, bot.ALLOWED_UPDATES, url=f"http://127.0.0.1:{port}", listen="127.0.0.1", port=port,
+        )
+    else:
+        await app.bot.delete_webhook()
+        await app.updater.start_polling(allowed_updates=bot.ALLOWED_UPDATES, timeout=POLL_TIMEOUT)
+    await app.start()
+
+    latencies = []
+    async with aiohttp.ClientSession() as session:
+        for i in range(args.commands):
+            async with session.post(f"{api_base}/__fake/command",
+                                    json={"chat_id": 1000 + i, "text": "/status"}) as resp:
+                result = await resp.json()
+            if result.get("ok"):
+                latencies.append(result["seconds"])
+        fake.calls.clear()
+        await asyncio.sleep(args.idle)
+        idle_calls = dict(fake.calls)
+
+    if runner is not None:
+        await runner.cleanup()
+    if app.updater.running:
+        await app.updater.stop()
+    await app.stop()
+    await app.shutdown()
+    await app.post_shutdown(app)
+
+    latencies.sort()
+    return {
+        "mode": mode,
+        "commands": args.commands,
+        "replied": len(latencies),
+        "latency_ms_median": statistics.median(latencies) * 1000 if latencies else None,
+        "latency_ms_p95": latencies[int(len(latencies) * 0.95) - 1] * 1000 if latencies else None,
+        "idle_seconds": args.idle,
+        "idle_requests": sum(idle_calls.values()),
+        "idle_calls": idle_calls,
+        "allowed_updates": fake.webhook[2] if fake.webhook else bot.ALLOWED_UPDATES,
+    }
+
+
+async def run_benchmark(args) -> dict:
+    from fake_telegram import FakeTelegram
+
+    fake = FakeTelegram()
+    api_base = await fake.start()
+    results = []
+    try:
+        for mode in args.modes:
+            result = await run_mode(mode, fake, api_base, args)
+            results.append(result)
+            print(
+                f"{mode:<8} {result['replied']}/{result['commands']} replies, "
+                f"median {result['latency_ms_median']:.1f}ms, p95 {result['latency_ms_p95']:.1f}ms, "
+                f"{result['idle_requests']} Bot API requests in {args.idle:.0f}s idle"
+            )
+    finally:
+        await fake.stop()
+    return {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "results": results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--commands", type=int, default=30, help="/status commands sent per mode")
+    parser.add_argument("--idle", type=float, default=25, help="seconds to count idle requests for")
+    parser.add_argument("--modes", nargs="+", default=["polling", "webhook"], choices=["polling", "webhook"])
+    parser.add_argument("--out", help="where to write the JSON result")
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args()
+
+    _isolate_state()
+    import bot  # noqa: F401  (configures INFO logging on import; quietened below unless -v)
+    if not args.verbose:
+        logging.getLogger().setLevel(logging.WARNING)
+    result = asyncio.run(run_benchmark(args))
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    out = args.out or os.path.join(RESULTS_DIR, f"updates-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    with open(out, "w") as f:
+        json.dump(result, f, indent=2)
+    print(f"\nResults written to {out}")
+
+
+if __name__ == "__main__":
+    main()
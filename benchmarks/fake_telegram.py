@@ -0,0 +1,165 @@
+"""
+Local fake of the Telegram Bot API, enough for bot.py to run against it.
+
+Implements getMe, setMyCommands, setWebhook, deleteWebhook, getUpdates (long
+polling), sendMessage and close. Commands are injected through
+POST /__fake/command {"chat_id": ..., "text": "/status"}; the call returns
+once the bot has replied, with the reply and the round-trip time. Updates go
+to the registered webhook (with its secret token) or wait for getUpdates.
+
+    python benchmarks/fake_telegram.py            # then run the bot with
+    TELEGRAM_API_URL=http://127.0.0.1:8081/bot TELEGRAM_BOT_TOKEN=123:fake python bot.py
+"""
+import json
+import time
+import asyncio
+import argparse
+from collections import Counter, defaultdict
+import aiohttp
+from aiohttp import web
+
+
+class FakeTelegram:
+    def __init__(self):
+        self.calls = Counter()          # method -> requests
+        self.webhook = None             # (url, secret, allowed_updates) once set
+        self.sent = defaultdict(list)   # chat_id -> messages sent by the bot
+        self._updates: list[dict] = []
+        self._update_id = 0
+        self._message_id = 0
+        self._new_update = asyncio.Condition()
+        self._replies: dict[str, asyncio.Future] = {}
+        self._session: aiohttp.ClientSession = None
+
+    # ── Bot API ──────────────────────────────────────────────────────────────
+
+    async def api(self, request: web.Request) -> web.Response:
+        method = request.match_info["method"]
+        self.calls[method] += 1
+        params = dict(await request.post()) if request.can_read_body else {}
+        if not params and request.content_type == "application/json":
+            params = await request.json()
+        handler = getattr(self, "_" + method.lower(), None)
+        if handler is None:
+            return web.json_response({"ok": True, "result": True})
+        return web.json_response({"ok": True, "result": await handler(params)})
+
+    async def _getme(self, params):
+        return {"id": 1, "is_bot": True, "first_name": "Fake", "username": "fake_bot",
+                "can_join_groups": True, "can_read_all_group_messages": False,
+                "supports_inline_queries": False}
+
+    async def _setwebhook(self, params):
+        allowed = params.get("allowed_updates")
+        self.webhook = (params["url"], params.get("secret_token"), json.loads(allowed) if allowed else None)
+        return True
+
+    async def _deletewebhook(self, params):
+        self.webhook = None
+        return True
+
+    async def _getupdates(self, params):
+        offset = int(params.get("offset") or 0)
+        timeout = float(params.get("timeout") or 0)
+        self._updates = [u for u in self._updates if u["update_id"] >= offset]
+        if not self._updates and timeout:
+            async with self._new_update:
+                try:
+                    await asyncio.wait_for(self._new_update.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+        return list(self._updates)
+
+    async def _sendmessage(self, params):
+        chat_id = str(params["chat_id"])
+        self._message_id += 1
+        self.sent[chat_id].append(params.get("text", ""))
+        waiter = self._replies.pop(chat_id, None)
+        if waiter and not waiter.done():
+            waiter.set_result(params.get("text", ""))
+        return {"message_id": self._message_id, "date": int(time.time()),
+                "chat": {"id": int(chat_id), "type": "private"}, "text": params.get("text", "")}
+
+    # ── Control ──────────────────────────────────────────────────────────────
+
+    async def command(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        chat_id, text = str(body["chat_id"]), body["text"]
+        reply = asyncio.get_running_loop().create_future()
+        self._replies[chat_id] = reply
+        start = time.perf_counter()
+        await self.push_update(int(chat_id), text)
+        try:
+            text = await asyncio.wait_for(reply, body.get("timeout", 10))
+        except asyncio.TimeoutError:
+            return web.json_response({"ok": False, "error": "no reply"}, status=504)
+        return web.json_response({"ok": True, "reply": text, "seconds": time.perf_counter() - start})
+
+    async def push_update(self, chat_id: int, text: str):
+        self._update_id += 1
+        self._message_id += 1
+        command = text.split()[0]
+        update = {
+            "update_id": self._update_id,
+            "message": {
+                "message_id": self._message_id, "date": int(time.time()), "text": text,
+                "chat": {"id": chat_id, "type": "private"},
+                "from": {"id": chat_id, "is_bot": False, "first_name": "Tester"},
+                "entities": [{"type": "bot_command", "offset": 0, "length": len(command)}],
+            },
+        }
+        if self.webhook:
+            url, secret, _ = self.webhook
+            if self._session is None:
+                self._session = aiohttp.ClientSession()
+            headers = {"X-Telegram-Bot-Api-Secret-Token": secret} if secret else {}
+            async with self._session.post(url, json=update, headers=headers) as resp:
+                resp.raise_for_status()
+        else:
+            self._updates.append(update)
+            async with self._new_update:
+                self._new_update.notify_all()
+
+    async def stats(self, request: web.Request) -> web.Response:
+        return web.json_response({"calls": dict(self.calls), "webhook": self.webhook})
+
+    async def reset(self, request: web.Request) -> web.Response:
+        self.calls.clear()
+        return web.json_response({"ok": True})
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post("/bot{token}/{method}", self.api)
+        app.router.add_get("/bot{token}/{method}", self.api)
+        app.router.add_post("/__fake/command", self.command)
+        app.router.add_get("/__fake/stats", self.stats)
+        app.router.add_post("/__fake/reset", self.reset)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Serve on host:port (0 = any free port); returns the base URL."""
+        self._runner = web.AppRunner(self.app(), access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+        return f"http://{host}:{self._runner.addresses[0][1]}"
+
+    async def stop(self):
+        if self._session is not None:
+            await self._session.close()
+        await self._runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8081)
+    args = parser.parse_args()
+
+    async def main():
+        base = await FakeTelegram().start(port=args.port)
+        print(f"Fake Telegram API at {base}/bot<token>/<method>")
+        await asyncio.Event().wait()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
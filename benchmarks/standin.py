@@ -0,0 +1,248 @@
+"""
+Local stand-in for the job sources, serving the fixtures in benchmarks/fixtures.
+
+Each source (MCF, Indeed, LinkedIn and every career portal) listens on its own
+127.0.0.1 port so per-host budgets behave as they do against the real hosts.
+Search pages are built from the fixtures with the card order rotated per query,
+so overlapping queries return overlapping (not identical) results. Job pages
+are deterministically live, expired or 404 based on their URL.
+
+Latency, 5xx errors and 429s can be injected, and whole sites can be made to
+block every request (403, 429, a captcha page, or a hang past the client's
+timeout). The server runs in a child
+process so its CPU time and memory do not count against the crawl.
+"""
+import os
+import sys
+import json
+import zlib
+import random
+import asyncio
+import hashlib
+import multiprocessing
+from collections import Counter, defaultdict
+from dataclasses import asdict, dataclass, field
+from aiohttp import web
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+PORTAL_NAMES = ["sia", "changi", "sats", "stengg", "caas"]
+
+BLOCK_MODES = ("403", "429", "captcha", "hang")
+CAPTCHA_PAGE = (
+    "<html><head><title>Security Check</title></head><body>"
+    "<div id=\"captcha-box\">Please verify you are human to continue.</div></body></html>"
+)
+
+
+@dataclass
+class StandInConfig:
+    latency_min: float = 0.05     # seconds added to every response
+    latency_max: float = 0.15
+    error_rate: float = 0.0       # share of responses answered with 500
+    throttle_rate: float = 0.0    # share of responses answered with 429
+    expired_rate: float = 0.15    # share of job pages showing an expiry notice
+    dead_rate: float = 0.05       # share of job pages answering 404
+    blocked: dict = field(default_factory=dict)  # site -> "403" | "429" | "captcha" | "hang"
+    seed: int = 1
+
+
+def _load(name: str) -> str:
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def _split_cards(html: str, card_open: str, list_close: str):
+    """Split a results page into (prefix, [cards], suffix) around its card list."""
+    end = html.rindex(list_close)
+    head, body = html[:end], html[end:]
+    parts = head.split(card_open)
+    return parts[0], [card_open + p for p in parts[1:]], body
+
+
+def _rotate(items: list, key: str) -> list:
+    k = zlib.crc32(key.encode()) % len(items) if items else 0
+    return items[k:] + items[:k]
+
+
+def _bucket(key: str) -> float:
+    """Deterministic 0..1 value for a URL."""
+    return zlib.crc32(key.encode()) / 0xFFFFFFFF
+
+
+class StandIn:
+    def __init__(self, config: StandInConfig):
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.stats = defaultdict(lambda: {"requests": Counter(), "statuses": Counter(), "bytes": 0})
+        self.mcf = json.loads(_load("mcf_search.json"))
+        self.indeed = _split_cards(_load("indeed_search.html"), '<li><div class="cardOutline', "</ul></div></div></div>")
+        self.linkedin = _split_cards(_load("linkedin_search.html"), '<li><div class="base-card', "</ul></section>")
+        self.portal = _load("portal.html")
+        self.job_live = _load("job_live.html")
+        self.job_expired = _load("job_expired.html")
+        self.bases: dict[str, str] = {}
+
+    # ── Middleware ───────────────────────────────────────────────────────────
+
+    def _app(self, site: str, routes) -> web.Application:
+        @web.middleware
+        async def inject(request, handler):
+            cfg = self.config
+            if not request.path.startswith("/__standin"):
+                await asyncio.sleep(self.rng.uniform(cfg.latency_min, cfg.latency_max))
+                roll = self.rng.random()
+                block = cfg.blocked.get(site)
+                if block == "hang":
+                    await asyncio.sleep(60)
+                if block == "captcha":
+                    resp = web.Response(text=CAPTCHA_PAGE, content_type="text/html")
+                elif block in ("403", "429"):
+                    resp = web.Response(status=int(block), text="Blocked")
+                elif roll < cfg.throttle_rate:
+                    resp = web.Response(status=429, headers={"Retry-After": "1"}, text="Too Many Requests")
+                elif roll < cfg.throttle_rate + cfg.error_rate:
+                    resp = web.Response(status=500, text="Internal Server Error")
+                else:
+                    resp = await handler(request)
+                kind = "head" if request.method == "HEAD" else request.match_info.route.name or "other"
+                stats = self.stats[site]
+                stats["requests"][kind] += 1
+                stats["statuses"][str(resp.status)] += 1
+                if request.method != "HEAD" and resp.body is not None:
+                    stats["bytes"] += len(resp.body)
+                return resp
+            return await handler(request)
+
+        app = web.Application(middlewares=[inject])
+        for method, path, handler, name in routes:
+            app.router.add_route(method, path, handler, name=name)
+        app.router.add_get("/__standin/stats", self._stats)
+        app.router.add_post("/__standin/reset", self._reset)
+        app.router.add_post("/__standin/config", self._configure)
+        return app
+
+    async def _stats(self, request):
+        return web.json_response({site: {
+            "requests": dict(s["requests"]), "statuses": dict(s["statuses"]), "bytes": s["bytes"],
+        } for site, s in self.stats.items()})
+
+    async def _reset(self, request):
+        self.stats.clear()
+        return web.json_response({"ok": True})
+
+    async def _configure(self, request):
+        for key, value in (await request.json()).items():
+            setattr(self.config, key, value)
+        return web.json_response(asdict(self.config))
+
+    # ── Pages ────────────────────────────────────────────────────────────────
+
+    def _job_page(self, request) -> web.Response:
+        key = request.path_qs
+        etag = '"' + hashlib.md5(key.encode()).hexdigest()[:16] + '"'
+        bucket = _bucket(key)
+        if bucket < self.config.dead_rate:
+            return web.Response(status=404, text="Not Found")
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        html = self.job_expired if bucket < self.config.dead_rate + self.config.expired_rate else self.job_live
+        return web.Response(text=html, content_type="text/html", headers={"ETag": etag})
+
+    async def job(self, request):
+        return self._job_page(request)
+
+    async def mcf_search(self, request):
+        limit = int(request.query.get("limit", 15))
+        page = int(request.query.get("page", 0))
+        results = _rotate(self.mcf["results"], request.query.get("search", ""))
+        results = sorted(results[:30], key=lambda r: r["metadata"]["newPostingDate"], reverse=True)
+        return web.json_response({"results": results[page * limit:(page + 1) * limit], "total": len(results)})
+
+    def _cards_page(self, parts, key: str, base: str) -> web.Response:
+        prefix, cards, suffix = parts
+        html = prefix + "".join(_rotate(cards, key)) + suffix
+        return web.Response(text=html.replace("{LINKEDIN}", base), content_type="text/html")
+
+    async def indeed_search(self, request):
+        return self._cards_page(self.indeed, request.query.get("q", ""), self.bases["indeed"])
+
+    async def linkedin_search(self, request):
+        return self._cards_page(self.linkedin, request.query.get("keywords", ""), self.bases["linkedin"])
+
+    async def portal_page(self, request):
+        return web.Response(text=self.portal, content_type="text/html")
+
+    # ── Lifecycle ────────────────────────────────────────────────────────────
+
+    def apps(self) -> dict[str, web.Application]:
+        apps = {
+            "mcf": self._app("mcf", [
+                ("GET", "/api/v2/search", self.mcf_search, "search"),
+                ("*", "/job/{uuid}", self.job, "job"),
+            ]),
+            "indeed": self._app("indeed", [
+                ("GET", "/jobs", self.indeed_search, "search"),
+                ("*", "/viewjob", self.job, "job"),
+                ("*", "/rc/clk", self.job, "job_redirect"),
+            ]),
+            "linkedin": self._app("linkedin", [
+                ("GET", "/jobs/search", self.linkedin_search, "search"),
+                ("*", "/jobs/view/{slug}", self.job, "job"),
+            ]),
+        }
+        for name in PORTAL_NAMES:
+            apps[f"portal_{name}"] = self._app(f"portal_{name}", [
+                ("GET", f"/careers/{name}/", self.portal_page, "search"),
+                ("*", f"/careers/{name}/{{tail:.+}}", self.job, "job"),
+            ])
+        return apps
+
+    async def start(self) -> dict[str, str]:
+        """Start every site on a free port; returns {site: base_url}."""
+        self._runners = []
+        for site, app in self.apps().items():
+            runner = web.AppRunner(app, access_log=None)
+            await runner.setup()
+            tcp = web.TCPSite(runner, "127.0.0.1", 0)
+            await tcp.start()
+            port = runner.addresses[0][1]
+            self.bases[site] = f"http://127.0.0.1:{port}"
+            self._runners.append(runner)
+        return dict(self.bases)
+
+    async def stop(self):
+        for runner in self._runners:
+            await runner.cleanup()
+
+
+def _serve(config: StandInConfig, conn):
+    async def main():
+        standin = StandIn(config)
+        conn.send(await standin.start())
+        while True:
+            await asyncio.sleep(3600)
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+
+
+def start_in_subprocess(config: StandInConfig):
+    """Run the stand-in in a child process; returns (process, {site: base_url})."""
+    parent, child = multiprocessing.Pipe()
+    proc = multiprocessing.Process(target=_serve, args=(config, child), daemon=True)
+    proc.start()
+    bases = parent.recv()
+    return proc, bases
+
+
+if __name__ == "__main__":
+    # Run standalone for manual poking: python benchmarks/standin.py
+    proc, bases = start_in_subprocess(StandInConfig())
+    for site, base in bases.items():
+        print(f"{site:<16} {base}")
+    try:
+        proc.join()
+    except KeyboardInterrupt:
+        sys.exit(0)
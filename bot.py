@@ -1,14 +1,22 @@
 import os
-import json
+import time
 import logging
 import asyncio
+from collections import defaultdict
 from telegram import Update, Bot, BotCommand
 from telegram.ext import Application, CommandHandler, ContextTypes
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
-import pytz
-from scraper import fetch_all_jobs
+import metrics
+from job import Job
+from jobfeed import CRAWLER_MODE, open_feed
+from jobstore import job_key
 from formatter import format_jobs_message
+from outbox import Outbox
+from webhook import run_webhook
+from subscribers import SubscriberStore
+from filters import JOB_CATEGORIES, PORTALS, SOURCE_NAMES, JobIndex, parse_filter_args
+from slots import SGT, SCHEDULE_LABELS, PREFETCH_LEAD_MINUTES, SLOT_MAX_AGE, prefetch_time
 
 logging.basicConfig(
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
@@ -17,7 +25,12 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 BOT_TOKEN = os.environ.get("TELEGRAM_BOT_TOKEN")
-SGT = pytz.timezone("Asia/Singapore")
+# "polling" or "webhook" (served by an embedded aiohttp server, see webhook.py)
+UPDATE_MODE = os.environ.get("UPDATE_MODE", "polling")
+# Bot API endpoint; point it at a local fake Telegram server for testing
+TELEGRAM_API_URL = os.environ.get("TELEGRAM_API_URL", "https://api.telegram.org/bot")
+# Comma-separated chat IDs allowed to use /metrics
+ADMIN_CHAT_IDS = {c.strip() for c in os.environ.get("ADMIN_CHAT_IDS", "").split(",") if c.strip()}
 
 # ─── Bot Command Menu ─────────────────────────────────────────────────────────
 # These show up when users type "/" in the Telegram keyboard.
@@ -27,43 +40,23 @@ BOT_COMMANDS = [
     BotCommand("unsubscribe", "Stop receiving daily job updates"),
     BotCommand("status",      "Check if you are subscribed"),
     BotCommand("latest",      "Fetch the latest job listings right now"),
+    BotCommand("filter",      "Choose which categories, keywords and sources you get"),
 ]
 
 # ─── Subscriber Store ────────────────────────────────────────────────────────
-# Persisted as JSON so subscribers survive bot restarts.
+# Persisted in SQLite so subscribers survive bot restarts; an old
+# subscribers.json is imported on first start.
 # Note: Railway resets the filesystem on redeploy, so users re-subscribe after redeployments.
-SUBSCRIBERS_FILE = "subscribers.json"
+subscribers = SubscriberStore()
 
-def load_subscribers() -> set:
-    try:
-        with open(SUBSCRIBERS_FILE, "r") as f:
-            data = json.load(f)
-            subs = set(str(cid) for cid in data)
-    except (FileNotFoundError, json.JSONDecodeError):
-        subs = set()
-    return subs
-
-def save_subscribers(subs: set):
-    with open(SUBSCRIBERS_FILE, "w") as f:
-        json.dump(list(subs), f)
-
-subscribers: set = load_subscribers()
+# Scheduled pushes are written to a durable outbox and delivered by a
+# background worker, so a restart mid-push resumes instead of re-sending.
+outbox = Outbox()
 
-
-# ─── Helpers ─────────────────────────────────────────────────────────────────
-
-async def send_to_all(bot: Bot, messages: list):
-    for chat_id in list(subscribers):
-        try:
-            for msg in messages:
-                await bot.send_message(
-                    chat_id=chat_id,
-                    text=msg,
-                    parse_mode="Markdown",
-                    disable_web_page_preview=True
-                )
-        except Exception as e:
-            logger.warning(f"Failed to send to {chat_id}: {e}")
+# Where jobs come from: crawls run in this process (CRAWLER_MODE=inline), or
+# results a separate crawler.py process publishes to the job store (=worker)
+feed = open_feed()
+job_store = feed.store
 
 
 # ─── Command Handlers ────────────────────────────────────────────────────────
@@ -81,21 +74,20 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
         "/subscribe - Start receiving daily job updates\n"
         "/unsubscribe - Stop receiving daily updates\n"
         "/latest - Fetch the latest job listings now\n"
-        "/status - Check if you are subscribed\n\n"
+        "/status - Check if you are subscribed\n"
+        "/filter - Choose which jobs you receive\n\n"
         + status_line,
         parse_mode="Markdown"
     )
 
 async def subscribe(update: Update, context: ContextTypes.DEFAULT_TYPE):
     chat_id = str(update.effective_chat.id)
-    if chat_id in subscribers:
+    if not await subscribers.add(chat_id):
         await update.message.reply_text(
             "You are already subscribed!\n"
             "You will receive job updates at 9:00 AM, 12:00 PM, and 3:00 PM SGT daily."
         )
         return
-    subscribers.add(chat_id)
-    save_subscribers(subscribers)
     logger.info(f"New subscriber: {chat_id} (total: {len(subscribers)})")
     await update.message.reply_text(
         "*Subscribed!*\n\n"
@@ -109,11 +101,9 @@ async def subscribe(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def unsubscribe(update: Update, context: ContextTypes.DEFAULT_TYPE):
     chat_id = str(update.effective_chat.id)
-    if chat_id not in subscribers:
+    if not await subscribers.remove(chat_id):
         await update.message.reply_text("You are not currently subscribed.")
         return
-    subscribers.discard(chat_id)
-    save_subscribers(subscribers)
     logger.info(f"Unsubscribed: {chat_id} (total: {len(subscribers)})")
     await update.message.reply_text(
         "Unsubscribed. You will not receive daily updates anymore.\n"
@@ -133,24 +123,144 @@ async def status(update: Update, context: ContextTypes.DEFAULT_TYPE):
         )
 
 async def latest(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    received = time.monotonic()
+    if not feed.crawls and feed.age() is None:
+        # Worker mode before crawler.py's first publish; answer now rather than wait for it
+        await update.message.reply_text("No job results have been published yet. Please try again in a few minutes.")
+        return
     await update.message.reply_text("Fetching latest jobs... this may take a moment.")
     try:
-        jobs = await fetch_all_jobs()
-        messages = format_jobs_message(jobs)
-        for msg in messages:
-            await update.message.reply_text(msg, parse_mode="Markdown", disable_web_page_preview=True)
+        job_filter = subscribers.filters(update.effective_chat.id)
+        sent = set()
+        # A crawl in progress sends its first page early, then the rest
+        async for jobs, final in feed.stream():
+            if job_filter:
+                jobs = [jobs[i] for i in JobIndex(jobs).match(job_filter)]
+            jobs = [job for job in jobs if job_key(job) not in sent]
+            if not final:
+                part = "first"
+            elif sent:
+                part = "rest"
+            else:
+                part = None
+            if not jobs and part is not None:
+                continue
+            for msg in format_jobs_message(jobs, part=part):
+                await update.message.reply_text(msg, parse_mode="Markdown", disable_web_page_preview=True)
+            if not sent:
+                elapsed = time.monotonic() - received
+                metrics.LATEST_FIRST_MESSAGE_SECONDS.observe(elapsed)
+                logger.info(f"/latest: first jobs message after {elapsed:.1f}s ({len(jobs)} jobs)")
+            sent.update(job_key(job) for job in jobs)
     except Exception as e:
         logger.error(f"Error fetching jobs: {e}")
         await update.message.reply_text("Error fetching jobs. Please try again later.")
 
 
+FILTER_HELP = (
+    "Usage:\n"
+    "/filter categories counter admin\n"
+    "/filter keywords ramp, check in\n"
+    "/filter sources mcf portals\n"
+    "/filter clear\n\n"
+    f"Categories: {', '.join(JOB_CATEGORIES)}\n"
+    f"Sources: {', '.join([*SOURCE_NAMES, PORTALS])}\n"
+    "A type given without values is cleared."
+)
+
+async def filter_jobs(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    chat_id = str(update.effective_chat.id)
+    if chat_id not in subscribers:
+        await update.message.reply_text("Filters apply to your subscription. Use /subscribe first.")
+        return
+    current = subscribers.filters(chat_id)
+    if not context.args:
+        await update.message.reply_text(f"Your filters:\n{current.describe()}\n\n{FILTER_HELP}")
+        return
+    try:
+        updated = parse_filter_args(current, context.args)
+    except ValueError as e:
+        await update.message.reply_text(f"Could not set filter: {e}\n\n{FILTER_HELP}")
+        return
+    await subscribers.set_filters(chat_id, updated)
+    await update.message.reply_text(f"Filters updated.\n{updated.describe()}")
+
+
+async def show_metrics(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Admin-only: request, parse, drop and delivery counters since the bot started."""
+    if str(update.effective_chat.id) not in ADMIN_CHAT_IDS:
+        await update.message.reply_text("This command is only available to the bot's admins.")
+        return
+    text = metrics.summary()
+    crawl = feed.last_stats()
+    if crawl:
+        text += (
+            f"\nLast crawl: {crawl['total_s']:.1f}s (fetch {crawl['fetch_s']:.1f}s, "
+            f"dedup {crawl['dedup_s']:.2f}s, score {crawl['score_s']:.2f}s, validate {crawl['validate_s']:.1f}s), "
+            f"{crawl['fetched']} fetched, {crawl['unique']} unique, {crawl['valid']} valid"
+        )
+    for i in range(0, len(text), 4000):
+        await update.message.reply_text(text[i:i + 4000], disable_web_page_preview=True)
+
+
 # ─── Scheduled Job ───────────────────────────────────────────────────────────
 
-SCHEDULE_LABELS = {
-    9:  "9:00 AM",
-    12: "12:00 PM",
-    15: "3:00 PM",
-}
+def build_incremental_digests(jobs: list[Job], pushed: dict, batches, label: str):
+    """
+    For each batch of subscribers, group them by which of `jobs` they should
+    get — jobs passing their filter that were not in a push up to their
+    delivery watermark — and yield (chat_ids, digests, sent): the batch's
+    chat ids, one rendered digest per group, and the jobs those digests
+    carry. New subscribers get every job their filter passes; subscribers
+    with nothing new are skipped. `pushed` maps job key -> pushed_at as read
+    before this push; `batches` yields lists of (chat_id, JobFilter), as
+    SubscriberStore.batches() does. Work shared between batches (the index,
+    filter matches, rendered digests) is kept, but no batch is held after
+    it is yielded.
+    """
+    pushed_at = [pushed.get(job_key(job)) for job in jobs]
+    index = JobIndex(jobs)      # built once; each distinct filter is matched once
+    new_by_mark = {}            # watermark -> indexes of jobs new to it
+    wanted = {}                 # (watermark, filter) -> indexes of jobs to send
+    rendered = {}               # indexes of jobs to send -> digest messages
+    for batch in batches:
+        marks = job_store.watermarks([chat_id for chat_id, _ in batch])
+        groups = defaultdict(list)  # indexes of jobs to send -> chat_ids
+        for chat_id, job_filter in batch:
+            mark = marks.get(chat_id)
+            if (mark, job_filter) not in wanted:
+                if mark not in new_by_mark:
+                    new_by_mark[mark] = frozenset(
+                        i for i, t in enumerate(pushed_at) if mark is None or t is None or t > mark
+                    )
+                new = new_by_mark[mark]
+                wanted[mark, job_filter] = tuple(i for i in index.match(job_filter) if i in new)
+            send = wanted[mark, job_filter]
+            if send:
+                groups[send].append(chat_id)
+        for send in groups:
+            if send not in rendered:
+                rendered[send] = format_jobs_message([jobs[i] for i in send], schedule_label=label)
+        sent = [jobs[i] for i in sorted(set().union(*groups))]
+        yield [chat_id for chat_id, _ in batch], [(rendered[send], members) for send, members in groups.items()], sent
+
+async def prefetch_jobs(hour: int):
+    """Crawl and validate ahead of a slot; the result also serves /latest meanwhile."""
+    if not subscribers:
+        return
+    label = SCHEDULE_LABELS.get(hour, f"{hour}:00")
+    start = time.perf_counter()
+    try:
+        jobs = await feed.fetch(force_refresh=True)
+    except Exception as e:
+        logger.warning(f"[{label} SGT] Prefetch failed, the slot will crawl afresh: {e}")
+        return
+    if not jobs:
+        # Most likely every source failed; don't let the slot push an empty digest
+        feed.invalidate()
+        logger.warning(f"[{label} SGT] Prefetch found no jobs, the slot will crawl afresh.")
+        return
+    logger.info(f"[{label} SGT] Prefetched {len(jobs)} job(s) in {time.perf_counter() - start:.0f}s.")
 
 async def scheduled_job(bot: Bot, hour: int = 9):
     if not subscribers:
@@ -158,11 +268,40 @@ async def scheduled_job(bot: Bot, hour: int = 9):
         return
     label = SCHEDULE_LABELS.get(hour, f"{hour}:00")
     logger.info(f"[{label} SGT] Running scheduled job fetch for {len(subscribers)} subscriber(s)...")
+    start = time.perf_counter()
     try:
-        jobs = await fetch_all_jobs()
-        messages = format_jobs_message(jobs, schedule_label=label)
-        await send_to_all(bot, messages)
-        logger.info(f"[{label} SGT] Scheduled push complete.")
+        # Normally the prefetch for this slot is cached (or still finishing, in
+        # which case this joins it); otherwise crawl now, or in worker mode wait
+        # for the crawler to publish. Never push a stale digest while a refresh
+        # is still running.
+        age = feed.age()
+        if age is not None and age <= SLOT_MAX_AGE:
+            logger.info(f"[{label} SGT] Using prefetched result ({age:.0f}s old).")
+        elif feed.crawls:
+            logger.info(f"[{label} SGT] No prefetched result, crawling now.")
+        else:
+            logger.info(f"[{label} SGT] No fresh published result, waiting for the crawler.")
+        jobs = await feed.fetch(max_age=SLOT_MAX_AGE, allow_stale=False)
+        delivered_until = time.time()
+        # Read once, before any batch stamps it below
+        pushed = job_store.pushed_at(jobs)
+        # One streaming pass over the subscribers: each batch is queued, the
+        # jobs it carries are stamped as pushed (only jobs some digest actually
+        # holds; the rest stay new until a push carries them) and its
+        # watermarks advanced before the next is read. Chats not reached
+        # because the push was cut short still find those jobs new next time.
+        queued = recipients = 0
+        for chat_ids, digests, sent in build_incremental_digests(jobs, pushed, subscribers.batches(), label):
+            if digests:
+                outbox.enqueue(f"{label} SGT", digests)
+                job_store.mark_pushed(sent, delivered_until)
+                queued += 1
+            job_store.set_watermarks(chat_ids, delivered_until)
+            recipients += sum(len(members) for _, members in digests)
+        logger.info(
+            f"[{label} SGT] Scheduled push queued {time.perf_counter() - start:.1f}s after the slot: "
+            f"{recipients} subscriber(s) in {queued} batch(es)."
+        )
     except Exception as e:
         logger.error(f"Scheduled job error: {e}")
 
@@ -173,15 +312,37 @@ async def post_init(application: Application):
     """Runs once after the bot starts — registers the command menu with Telegram."""
     await application.bot.set_my_commands(BOT_COMMANDS)
     logger.info("Bot command menu registered.")
+    # Also resumes any push interrupted by the last shutdown
+    application.bot_data["outbox_worker"] = asyncio.create_task(outbox.run(application.bot))
+    await feed.start()
+    application.bot_data["feed"] = feed
+    if metrics.METRICS_PORT:
+        application.bot_data["metrics_server"] = await metrics.start_server()
 
-def main():
-    if not BOT_TOKEN:
-        raise ValueError("TELEGRAM_BOT_TOKEN environment variable not set")
+async def post_shutdown(application: Application):
+    """Runs once when the bot stops — stops the outbox worker, then closes the job feed and the metrics endpoint."""
+    # Progress is recorded per message, so a push cut short here resumes on the next start
+    worker = application.bot_data.pop("outbox_worker", None)
+    if worker is not None:
+        worker.cancel()
+        try:
+            await worker
+        except asyncio.CancelledError:
+            pass
+    await feed.close()
+    if "metrics_server" in application.bot_data:
+        await application.bot_data.pop("metrics_server").cleanup()
 
+# Only command messages are handled, so no other update types are requested
+ALLOWED_UPDATES = [Update.MESSAGE]
+
+def build_application(token: str, base_url: str = TELEGRAM_API_URL) -> Application:
     app = (
         Application.builder()
-        .token(BOT_TOKEN)
+        .token(token)
+        .base_url(base_url)
         .post_init(post_init)
+        .post_shutdown(post_shutdown)
         .build()
     )
 
@@ -190,17 +351,43 @@ def main():
     app.add_handler(CommandHandler("unsubscribe", unsubscribe))
     app.add_handler(CommandHandler("status",      status))
     app.add_handler(CommandHandler("latest",      latest))
+    app.add_handler(CommandHandler("filter",      filter_jobs))
+    # Not in BOT_COMMANDS: admin-only
+    app.add_handler(CommandHandler("metrics",     show_metrics))
+    return app
+
+def main():
+    if not BOT_TOKEN:
+        raise ValueError("TELEGRAM_BOT_TOKEN environment variable not set")
+    if UPDATE_MODE not in ("polling", "webhook"):
+        raise ValueError(f"UPDATE_MODE must be 'polling' or 'webhook', not {UPDATE_MODE!r}")
+
+    app = build_application(BOT_TOKEN)
 
     scheduler = AsyncIOScheduler(timezone=SGT)
-    for hour in [9, 12, 15]:
+    for hour in SCHEDULE_LABELS:
         scheduler.add_job(
             scheduled_job,
             CronTrigger(hour=hour, minute=0, timezone=SGT),
             args=[app.bot, hour]
         )
+        # In worker mode crawler.py runs the prefetches on the same schedule
+        if PREFETCH_LEAD_MINUTES > 0 and feed.crawls:
+            at_hour, at_minute = prefetch_time(hour)
+            scheduler.add_job(
+                prefetch_jobs,
+                CronTrigger(hour=at_hour, minute=at_minute, timezone=SGT),
+                args=[hour]
+            )
     scheduler.start()
-    logger.info(f"Bot started. {len(subscribers)} subscriber(s) loaded. Scheduler running (9AM, 12PM, 3PM SGT).")
-    app.run_polling(allowed_updates=Update.ALL_TYPES)
+    logger.info(
+        f"Bot started ({UPDATE_MODE}, crawler {CRAWLER_MODE}). {len(subscribers)} subscriber(s) loaded. "
+        "Scheduler running (9AM, 12PM, 3PM SGT)."
+    )
+    if UPDATE_MODE == "webhook":
+        run_webhook(app, ALLOWED_UPDATES)
+    else:
+        app.run_polling(allowed_updates=ALLOWED_UPDATES)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,113 @@
+import os
+import time
+import logging
+from metrics import BREAKER_OPENED, BREAKER_SKIPPED
+
+logger = logging.getLogger(__name__)
+
+# Consecutive failed requests (timeouts, errors, non-200s) that open a
+# source's breaker; a block signal (429, 403, captcha page) opens it at once
+BREAKER_FAILURES = int(os.environ.get("BREAKER_FAILURES", "3"))
+# Seconds an open breaker skips its source before letting one probe through.
+# Each failed probe doubles the wait, up to BREAKER_MAX_COOLDOWN.
+BREAKER_COOLDOWN = float(os.environ.get("BREAKER_COOLDOWN", "1800"))
+BREAKER_MAX_COOLDOWN = float(os.environ.get("BREAKER_MAX_COOLDOWN", str(6 * 3600)))
+
+# A half-open probe that has not reported back after this long (its task
+# was cancelled, or it never got past the request budget) is given up on
+PROBE_TIMEOUT = 60
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class CircuitBreaker:
+    """
+    Per-source breaker for a scraper. Closed, every request goes ahead; open,
+    the source is skipped until the cooldown has passed; then it is half-open
+    and exactly one probe request is let through. A successful probe closes
+    the breaker, a failed one reopens it with a doubled cooldown.
+
+    Closed/open state is saved to `store` (a JobStore) on every change, so a
+    blocked source stays skipped across crawls and restarts. Callables in
+    `listeners` run whenever the breaker opens, so queued requests for the
+    source can be cancelled instead of waiting out their rate-limit slots.
+    """
+
+    def __init__(self, source: str, store, threshold: int = BREAKER_FAILURES,
+                 cooldown: float = BREAKER_COOLDOWN, max_cooldown: float = BREAKER_MAX_COOLDOWN):
+        self.source = source
+        self.store = store
+        self.threshold = threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.listeners: list = []
+        saved = store.breaker_state(source) or {}
+        self.state = saved.get("state", CLOSED)
+        self.failures = saved.get("failures", 0)
+        self.opened_at = saved.get("opened_at")
+        self.cooldown = saved.get("cooldown", cooldown)
+        self.reason = saved.get("reason", "")
+        self._probe_started = None
+
+    def allow(self) -> bool:
+        """Whether a request to the source may go ahead now; claims the probe when half-open."""
+        if self.state == CLOSED:
+            return True
+        now = time.time()
+        if self.state == OPEN:
+            if now < self.opened_at + self.cooldown:
+                BREAKER_SKIPPED.inc(source=self.source)
+                return False
+            self.state = HALF_OPEN
+            self._probe_started = None
+            logger.info(f"Circuit breaker for {self.source} half-open: probing")
+        if self._probe_started is not None and now - self._probe_started < PROBE_TIMEOUT:
+            BREAKER_SKIPPED.inc(source=self.source)
+            return False
+        self._probe_started = now
+        return True
+
+    def retry_in(self) -> float:
+        """Seconds until an open breaker lets a probe through (0 if it is not open)."""
+        if self.state != OPEN:
+            return 0.0
+        return max(0.0, self.opened_at + self.cooldown - time.time())
+
+    def record_success(self):
+        if self.state == OPEN:
+            return  # a request that started before the breaker opened
+        if self.state == HALF_OPEN:
+            logger.info(f"Circuit breaker for {self.source} closed: probe succeeded")
+        elif self.state == CLOSED and not self.failures:
+            return
+        self.state, self.failures, self.cooldown, self.reason = CLOSED, 0, self.base_cooldown, ""
+        self._probe_started = None
+        self._save()
+
+    def record_failure(self, reason: str, blocked: bool = False):
+        """A failed request; `blocked` marks a block signal that opens the breaker at once."""
+        if self.state == OPEN:
+            return  # a request that started before the breaker opened
+        self.failures += 1
+        if self.state == HALF_OPEN:
+            self._open(reason, min(self.cooldown * 2, self.max_cooldown))
+        elif blocked or self.failures >= self.threshold:
+            self._open(reason, self.base_cooldown)
+        else:
+            self._save()
+
+    def _open(self, reason: str, cooldown: float):
+        self.state, self.opened_at, self.cooldown, self.reason = OPEN, time.time(), cooldown, reason
+        self._probe_started = None
+        self._save()
+        BREAKER_OPENED.inc(source=self.source, reason=reason)
+        logger.warning(
+            f"Circuit breaker for {self.source} opened ({reason}, {self.failures} failure(s)); "
+            f"skipping it for {cooldown / 60:.0f} min"
+        )
+        for listener in list(self.listeners):
+            listener()
+
+    def _save(self):
+        state = OPEN if self.state == HALF_OPEN else self.state
+        self.store.set_breaker_state(self.source, state, self.failures, self.opened_at, self.cooldown, self.reason)
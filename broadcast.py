@@ -0,0 +1,175 @@
+import os
+import time
+import asyncio
+import inspect
+import logging
+from dataclasses import dataclass
+from typing import NamedTuple
+from telegram import Bot
+from telegram.error import BadRequest, Forbidden, NetworkError, RetryAfter, TelegramError
+from metrics import BROADCAST_CHATS, BROADCAST_MESSAGES, BROADCAST_THROTTLED
+from ratelimit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+# Telegram allows roughly 30 messages/second overall and about one message
+# per second to the same chat (short bursts are tolerated).
+GLOBAL_RATE = float(os.environ.get("BROADCAST_GLOBAL_RATE", "30"))
+PER_CHAT_RATE = float(os.environ.get("BROADCAST_PER_CHAT_RATE", "1"))
+PER_CHAT_BURST = 3
+WORKERS = int(os.environ.get("BROADCAST_WORKERS", "30"))
+MAX_RETRIES = 3
+# Longest a single chat may keep its worker waiting out 429s (the sum of the
+# retry_after values it was given); after that it is deferred, not failed,
+# and stays in the outbox for the next drain
+MAX_THROTTLE_WAIT = float(os.environ.get("BROADCAST_MAX_THROTTLE_WAIT", "120"))
+
+
+class Delivery(NamedTuple):
+    chat_id: str
+    messages: list[str]
+    start: int = 0  # index of the first message still to send
+
+
+@dataclass
+class BroadcastReport:
+    delivered: int = 0      # chats that received every message
+    failed: int = 0         # chats given up on
+    deferred: int = 0       # chats left for a later drain after too much throttling
+    throttled: int = 0      # 429 responses from Telegram
+    messages_sent: int = 0
+    duration: float = 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.delivered} delivered, {self.failed} failed, {self.deferred} deferred, "
+            f"{self.throttled} throttled, {self.messages_sent} messages in {self.duration:.1f}s"
+        )
+
+
+async def broadcast(bot: Bot, deliveries, on_sent=None, on_done=None) -> BroadcastReport:
+    """
+    Send each Delivery's messages to its chat, many chats at once.
+
+    `deliveries` may be a plain or async iterable of Delivery (or
+    (chat_id, messages) tuples) and is consumed lazily, so large subscriber
+    lists are never held in memory as tasks. A chat's messages are always
+    sent in order by a single worker.
+
+    Optional callbacks (plain functions or coroutines):
+      on_sent(chat_id, index) — after message `index` reached the chat
+      on_done(chat_id, ok)    — once the chat is finished or given up on;
+                                not called for a chat deferred after
+                                MAX_THROTTLE_WAIT, which is left pending
+    """
+    report = BroadcastReport()
+    gate = _FloodGate()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=WORKERS * 2)
+    started = time.monotonic()
+
+    async def produce():
+        if hasattr(deliveries, "__aiter__"):
+            async for item in deliveries:
+                await queue.put(Delivery(*item))
+        else:
+            for item in deliveries:
+                await queue.put(Delivery(*item))
+        for _ in range(WORKERS):
+            await queue.put(None)
+
+    async def worker():
+        while True:
+            delivery = await queue.get()
+            if delivery is None:
+                return
+            ok = await _deliver(bot, delivery, gate, report, on_sent)
+            if ok is None:
+                report.deferred += 1
+                continue
+            if ok:
+                report.delivered += 1
+            else:
+                report.failed += 1
+            await _call(on_done, delivery.chat_id, ok)
+
+    await asyncio.gather(produce(), *[worker() for _ in range(WORKERS)])
+    report.duration = time.monotonic() - started
+    BROADCAST_CHATS.inc(report.delivered, outcome="delivered")
+    BROADCAST_CHATS.inc(report.failed, outcome="failed")
+    BROADCAST_CHATS.inc(report.deferred, outcome="deferred")
+    BROADCAST_MESSAGES.inc(report.messages_sent)
+    BROADCAST_THROTTLED.inc(report.throttled)
+    return report
+
+
+class _FloodGate:
+    """Global send budget, closed for everyone when Telegram answers 429."""
+
+    def __init__(self):
+        self.bucket = TokenBucket(GLOBAL_RATE, max(1, int(GLOBAL_RATE)))
+        self.closed_until = 0.0
+
+    async def acquire(self):
+        while (delay := self.closed_until - time.monotonic()) > 0:
+            await asyncio.sleep(delay)
+        await self.bucket.acquire()
+
+    def close_for(self, seconds: float):
+        self.closed_until = max(self.closed_until, time.monotonic() + seconds)
+
+
+async def _deliver(bot: Bot, delivery: Delivery, gate: _FloodGate,
+                   report: BroadcastReport, on_sent):
+    """True once every message is sent, False if the chat is given up on, None if deferred."""
+    chat_bucket = TokenBucket(PER_CHAT_RATE, PER_CHAT_BURST)
+    throttled_for = 0.0
+    for index in range(delivery.start, len(delivery.messages)):
+        attempt = 0
+        while True:
+            await chat_bucket.acquire()
+            await gate.acquire()
+            try:
+                await bot.send_message(
+                    chat_id=delivery.chat_id,
+                    text=delivery.messages[index],
+                    parse_mode="Markdown",
+                    disable_web_page_preview=True
+                )
+                break
+            except RetryAfter as e:
+                # Flood control: every worker pauses as long as Telegram asks;
+                # not counted against the retry budget, but bounded in total
+                report.throttled += 1
+                gate.close_for(e.retry_after)
+                throttled_for += e.retry_after
+                if throttled_for > MAX_THROTTLE_WAIT:
+                    logger.warning(
+                        f"Deferring {delivery.chat_id}: throttled for {throttled_for:.0f}s, "
+                        f"left for the next drain from message {index}"
+                    )
+                    return None
+                logger.debug(f"Throttled sending to {delivery.chat_id}, retrying in {e.retry_after}s")
+            except (Forbidden, BadRequest) as e:
+                # Blocked the bot, chat deleted, malformed message — retrying won't help
+                logger.warning(f"Failed to send to {delivery.chat_id}: {e}")
+                return False
+            except (NetworkError, TelegramError) as e:
+                attempt += 1
+                if attempt > MAX_RETRIES:
+                    logger.warning(f"Failed to send to {delivery.chat_id} after {MAX_RETRIES} retries: {e}")
+                    return False
+                await asyncio.sleep(2 ** attempt)
+            except Exception as e:
+                logger.warning(f"Failed to send to {delivery.chat_id}: {e}")
+                return False
+        report.messages_sent += 1
+        await _call(on_sent, delivery.chat_id, index)
+    return True
+
+
+async def _call(callback, *args):
+    if callback is None:
+        return
+    result = callback(*args)
+    if inspect.isawaitable(result):
+        await result
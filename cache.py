@@ -0,0 +1,172 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+# ─── Result Cache ────────────────────────────────────────────────────────────
+
+class ResultCache:
+    """
+    TTL-bounded cache for the results of expensive coroutines.
+
+    - Callers asking for a key that is already loading attach to the load in
+      flight instead of starting their own (single-flight).
+    - Entries older than the TTL but still inside the stale window are
+      returned immediately while a refresh runs in the background.
+    - At most `maxsize` keys are kept; the least recently used is evicted.
+    """
+
+    def __init__(self, ttl: float, stale_ttl: float = 0, maxsize: int = 8):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.maxsize = maxsize
+        self._entries: OrderedDict = OrderedDict()  # key -> (stored_at, value)
+        self._inflight: dict = {}                   # key -> asyncio.Task
+
+    async def get(self, key, loader, max_age: float = None, allow_stale: bool = True):
+        """
+        Return the cached value for `key`, calling `loader()` when needed.
+        `max_age` overrides the TTL for this call; `allow_stale=False` makes
+        the caller wait for a fresh load instead of taking a stale value.
+        """
+        max_age = self.ttl if max_age is None else max_age
+        entry = self._entries.get(key)
+        if entry is not None:
+            stored_at, value = entry
+            age = time.monotonic() - stored_at
+            if age <= max_age:
+                self._entries.move_to_end(key)
+                return value
+            if allow_stale and age <= max_age + self.stale_ttl:
+                logger.debug(f"Serving stale result for {key!r} ({age:.0f}s old), refreshing")
+                self._load(key, loader)
+                return value
+        # shield() so a cancelled caller does not cancel the shared load
+        return await asyncio.shield(self._load(key, loader))
+
+    async def refresh(self, key, loader):
+        """Force a load for `key` (joining one already in flight) and return it."""
+        return await asyncio.shield(self._load(key, loader))
+
+    def peek(self, key):
+        """Return (age_seconds, value) for `key` without loading, or None."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        return time.monotonic() - entry[0], entry[1]
+
+    def set(self, key, value):
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key=None):
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    def is_loading(self, key) -> bool:
+        return key in self._inflight
+
+    def cancel(self, key):
+        """Cancel the load in flight for `key`, if any, and return its task (or None)."""
+        task = self._inflight.get(key)
+        if task is not None:
+            task.cancel()
+        return task
+
+    def _load(self, key, loader) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(loader())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._on_loaded(key, t))
+        return task
+
+    def _on_loaded(self, key, task: asyncio.Task):
+        self._inflight.pop(key, None)
+        if task.cancelled():
+            return
+        exc = task.exception()  # also marks the exception as retrieved
+        if exc is not None:
+            logger.warning(f"Cache load for {key!r} failed: {exc}")
+            return
+        self.set(key, task.result())
+
+
+# ─── Link Validation Cache ───────────────────────────────────────────────────
+
+class LinkCache:
+    """
+    Persistent URL -> verdict cache for job link validation.
+
+    Live and dead verdicts expire separately; a live entry also keeps the
+    ETag / Last-Modified validators so it can be rechecked with a conditional GET.
+    Persisted as JSON so verdicts survive restarts.
+    """
+
+    def __init__(self, path: str, live_ttl: float, dead_ttl: float):
+        self.path = path
+        self.live_ttl = live_ttl
+        self.dead_ttl = dead_ttl
+        self._entries: dict = None
+        self._dirty = False
+
+    def _load(self) -> dict:
+        if self._entries is None:
+            try:
+                with open(self.path, "r") as f:
+                    self._entries = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._entries = {}
+        return self._entries
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._load()
+
+    def entry(self, url: str) -> dict:
+        """Return the stored entry for `url` (fresh or not), or None."""
+        return self._load().get(url)
+
+    def verdict(self, url: str):
+        """Return True/False for a fresh cached verdict, or None if a check is needed."""
+        entry = self.entry(url)
+        if entry is None:
+            return None
+        ttl = self.live_ttl if entry["live"] else self.dead_ttl
+        if time.time() - entry["checked_at"] > ttl:
+            return None
+        return entry["live"]
+
+    def record(self, url: str, live: bool, etag: str = None, last_modified: str = None):
+        entry = {"live": live, "checked_at": time.time()}
+        if etag:
+            entry["etag"] = etag
+        if last_modified:
+            entry["last_modified"] = last_modified
+        self._load()[url] = entry
+        self._dirty = True
+
+    def save(self):
+        """Drop long-expired entries and write the cache atomically."""
+        if not self._dirty:
+            return
+        horizon = time.time() - max(self.live_ttl, self.dead_ttl)
+        entries = {u: e for u, e in self._load().items() if e["checked_at"] >= horizon}
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not save link cache to {self.path}: {e}")
+            return
+        self._entries = entries
+        self._dirty = False
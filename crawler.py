@@ -0,0 +1,126 @@
+"""
+Standalone crawler worker: crawls ahead of each push slot (and every
+CRAWL_INTERVAL, if set) and publishes each finished, validated result to
+the job store, where a bot running with CRAWLER_MODE=worker picks it up.
+Either process can be restarted without the other; the bot keeps serving
+the last published result meanwhile.
+
+    python crawler.py
+"""
+import os
+import signal
+import asyncio
+import contextlib
+import logging
+import time
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
+import metrics
+import parsing
+import scraper
+from slots import SGT, SCHEDULE_LABELS, PREFETCH_LEAD_MINUTES, prefetch_time
+
+logging.basicConfig(
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    level=logging.INFO
+)
+logger = logging.getLogger(__name__)
+
+# Seconds between background crawls, besides the one ahead of each slot; 0 = off.
+# Pushes only need the slot crawls; extra crawls keep /latest fresher between
+# slots, but each one is a full round of searches against every source, and
+# the more often they run, the sooner the sources rate-limit or block us.
+CRAWL_INTERVAL = float(os.environ.get("CRAWL_INTERVAL", str(6 * 3600)))
+# Port for this process's /metrics; separate from the bot's METRICS_PORT. Empty = off.
+CRAWLER_METRICS_PORT = os.environ.get("CRAWLER_METRICS_PORT", "")
+
+_crawling = asyncio.Lock()
+
+
+async def crawl_and_publish(reason: str):
+    """One crawl, published unless it found nothing; skipped if a crawl is already running."""
+    if _crawling.locked():
+        logger.info(f"Crawl for {reason} skipped: one is already running.")
+        return
+    async with _crawling:
+        start = time.perf_counter()
+        try:
+            jobs = await scraper.fetch_all_jobs(force_refresh=True)
+        except Exception as e:
+            logger.error(f"Crawl for {reason} failed: {e}")
+            return
+        if not jobs:
+            # Most likely every source failed; keep serving the last good result
+            logger.warning(f"Crawl for {reason} found no jobs; nothing published.")
+            return
+        publish_id = scraper.job_store.publish(jobs, scraper.last_crawl_stats)
+        logger.info(
+            f"Published crawl #{publish_id} for {reason}: {len(jobs)} job(s) "
+            f"in {time.perf_counter() - start:.0f}s."
+        )
+
+
+async def run():
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    # One connection pool for every crawl, kept open for the worker's lifetime
+    await scraper.http_client.session()
+    metrics_server = None
+    if CRAWLER_METRICS_PORT:
+        metrics_server = await metrics.start_server(port=int(CRAWLER_METRICS_PORT))
+
+    scheduler = AsyncIOScheduler(timezone=SGT)
+    if CRAWL_INTERVAL > 0:
+        scheduler.add_job(
+            crawl_and_publish, IntervalTrigger(seconds=CRAWL_INTERVAL), args=["interval"],
+            max_instances=1, coalesce=True,
+        )
+    # Crawl ahead of each slot (at it, with no lead), so the bot's push finds
+    # a fresh result waiting
+    for hour in SCHEDULE_LABELS:
+        at_hour, at_minute = prefetch_time(hour)
+        scheduler.add_job(
+            crawl_and_publish,
+            CronTrigger(hour=at_hour, minute=at_minute, timezone=SGT),
+            args=[f"the {SCHEDULE_LABELS[hour]} SGT slot"],
+        )
+    scheduler.start()
+    every = f"every {CRAWL_INTERVAL:.0f}s and " if CRAWL_INTERVAL > 0 else ""
+    logger.info(f"Crawler started: {every}{PREFETCH_LEAD_MINUTES} min before each slot.")
+
+    startup = None
+    try:
+        # After a restart, only crawl at once if there is no result yet or the
+        # last one is due for an interval crawl; otherwise the schedule catches up
+        latest = scraper.job_store.latest_published()
+        if latest is None or (CRAWL_INTERVAL > 0 and time.time() - latest[1] >= CRAWL_INTERVAL):
+            startup = asyncio.create_task(crawl_and_publish("startup"))
+        else:
+            logger.info(f"Published crawl #{latest[0]} is {time.time() - latest[1]:.0f}s old; waiting for the schedule.")
+        await stop.wait()
+    finally:
+        logger.info("Crawler stopping.")
+        scheduler.shutdown(wait=False)
+        # Stop a crawl still running (the startup one or a scheduled one)
+        # before its session closes under it
+        await scraper.cancel_crawl()
+        if startup is not None:
+            startup.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await startup
+        await scraper.http_client.close()
+        if metrics_server is not None:
+            await metrics_server.cleanup()
+        parsing.shutdown()
+
+
+def main():
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
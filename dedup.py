@@ -0,0 +1,212 @@
+import os
+import re
+import zlib
+import functools
+import urllib.parse
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from job import Job  # job.py imports this module for its normalisers
+
+# Two postings from the same company are the same job when the Jaccard
+# similarity of their title shingles is at least this
+DEDUP_TITLE_SIMILARITY = float(os.environ.get("DEDUP_TITLE_SIMILARITY", "0.8"))
+
+# MinHash signature of SHINGLE_SIZE-character title shingles, cut into
+# LSH_BANDS bands of LSH_ROWS values; titles sharing any band with the same
+# company are compared. With 8 x 3 a pair at 0.8 similarity is a candidate
+# over 99% of the time, one at 0.3 about 20%.
+SHINGLE_SIZE = 3
+LSH_BANDS = 8
+LSH_ROWS = 3
+
+# Query parameters that only say how a link was reached (tracking ids,
+# search context) and are dropped from the URL; any other parameter may
+# identify the posting (Indeed's jk, a portal's jobId) and is kept.
+# Compared case-insensitively, plus everything starting with utm_.
+_TRACKING_PARAMS = {
+    "refid", "trackingid", "trk", "trkinfo", "position", "pagenum", "from", "fccid", "tk", "vjs",
+    "advn", "adid", "ref", "src", "gclid", "fbclid", "msclkid", "mc_cid", "mc_eid", "_ga",
+}
+
+# Trailing words that differ between how sources spell the same employer
+_COMPANY_SUFFIXES = {
+    "pte", "ltd", "limited", "private", "inc", "incorporated", "corp", "corporation",
+    "co", "company", "llc", "llp", "plc", "bhd", "sdn",
+}
+_TITLE_NOISE = {"urgent", "hiring", "immediate", "immediately", "new", "job", "singapore", "sg"}
+
+_BRACKETED = re.compile(r"\([^)]*\)|\[[^\]]*\]")
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+_SIGNATURE_SIZE = LSH_BANDS * LSH_ROWS
+_EMPTY = 1 << 32
+
+
+# ─── Normalisation ───────────────────────────────────────────────────────────
+
+def _is_tracking(param: str) -> bool:
+    param = param.lower()
+    return param in _TRACKING_PARAMS or param.startswith("utm_")
+
+
+def canonical_url(url: str) -> str:
+    """Host and path of a posting URL plus its query without tracking parameters, in a fixed order."""
+    url, _, query = url.partition("#")[0].partition("?")
+    scheme, sep, rest = url.partition("://")
+    if not sep:
+        return _canonical_url_slow(url + ("?" + query if query else ""))
+    host, slash, path = rest.partition("/")
+    path = (slash + path).rstrip("/")
+    if query:
+        query = "&".join(sorted(p for p in query.split("&") if p and not _is_tracking(p.partition("=")[0])))
+    return f"{host.lower()}{path}?{query}" if query else f"{host.lower()}{path}"
+
+
+def _canonical_url_slow(url: str) -> str:
+    parts = urllib.parse.urlsplit(url)
+    query = urllib.parse.urlencode(
+        sorted((k, v) for k, v in urllib.parse.parse_qsl(parts.query) if not _is_tracking(k))
+    )
+    path = parts.path.rstrip("/")
+    return f"{parts.netloc.lower()}{path}?{query}" if query else f"{parts.netloc.lower()}{path}"
+
+
+def normalize_company(name: str) -> str:
+    """'SATS Ltd.', 'SATS LTD' and 'Sats (Singapore) Pte. Ltd.' all become 'sats'."""
+    words = _NON_WORD.sub(" ", _BRACKETED.sub(" ", name.lower())).split()
+    while words and words[-1] in _COMPANY_SUFFIXES:
+        words.pop()
+    return " ".join(words)
+
+
+def normalize_title(title: str) -> str:
+    words = _NON_WORD.sub(" ", _BRACKETED.sub(" ", title.lower())).split()
+    return " ".join(w for w in words if w not in _TITLE_NOISE)
+
+
+@functools.lru_cache(maxsize=65536)
+def _full_title(title: str) -> str:
+    """normalize_title() keeping bracketed text: "Officer (Terminal 1)" stays apart from "(Terminal 2)"."""
+    words = _NON_WORD.sub(" ", title.lower()).split()
+    return " ".join(w for w in words if w not in _TITLE_NOISE)
+
+
+def title_shingles(title: str) -> frozenset:
+    """Hashed character shingles of the normalised title."""
+    return _title_signature(normalize_title(title))[0]
+
+
+@functools.lru_cache(maxsize=65536)
+def _title_signature(normalized: str) -> tuple[frozenset, tuple]:
+    text = f" {normalized} "
+    grams = [text[i:i + SHINGLE_SIZE] for i in range(max(1, len(text) - SHINGLE_SIZE + 1))]
+    shingles = frozenset(zlib.crc32(g.encode()) for g in grams)
+    return shingles, minhash(shingles)
+
+
+def minhash(shingles: frozenset) -> tuple:
+    """
+    One-permutation MinHash: each shingle hash lands in one of the signature's
+    bins and each bin keeps its smallest value, so a signature costs one pass
+    over the shingles rather than one per hash function. Bins no shingle fell
+    into borrow the next filled bin's value (offset by the distance), which
+    keeps similar titles agreeing on them.
+    """
+    bins = [_EMPTY] * _SIGNATURE_SIZE
+    for h in shingles:
+        i, value = h % _SIGNATURE_SIZE, h // _SIGNATURE_SIZE
+        if value < bins[i]:
+            bins[i] = value
+    filled = [i for i, value in enumerate(bins) if value != _EMPTY]
+    if len(filled) < _SIGNATURE_SIZE:
+        for i in range(_SIGNATURE_SIZE):
+            if bins[i] == _EMPTY:
+                j = next((f for f in filled if f > i), filled[0])
+                bins[i] = bins[j] + ((j - i) % _SIGNATURE_SIZE) * _EMPTY
+    return tuple(bins)
+
+
+def _similarity(a: frozenset, b: frozenset) -> float:
+    return len(a & b) / len(a | b)
+
+
+# ─── Index ───────────────────────────────────────────────────────────────────
+
+class DedupIndex:
+    """
+    Finds, for each Job added, an earlier job that is the same posting: the
+    same canonical URL, or the same normalised company with a near-identical
+    title (found through MinHash LSH buckets, then confirmed on the exact
+    shingle similarity). Within one source, two URLs are only merged as a
+    repost when their titles match exactly, bracketed text included, so
+    "Officer (Terminal 1)" and "Officer (Terminal 2)" stay apart and near
+    matches are left alone. Each add costs a constant number of bucket
+    lookups, so indexing n jobs stays near-linear.
+    """
+
+    def __init__(self, threshold: float = DEDUP_TITLE_SIMILARITY):
+        self.threshold = threshold
+        self._by_url: dict[str, "Job"] = {}
+        self._by_title: dict[tuple, "Job"] = {}
+        self._by_full_title: dict[tuple, "Job"] = {}  # (_full_title, company) -> first job
+        self._buckets: dict[tuple, list] = {}
+        self._kept: dict[int, "Job"] = {}  # id(job) -> job it was merged into
+        self._shingles: dict[int, frozenset] = {}
+
+    def add(self, job: "Job") -> "Job":
+        """Index `job` and return the job it duplicates, or `job` itself if it is new."""
+        kept = self._find(job)
+        self._kept[id(job)] = kept
+        return kept
+
+    def kept(self, job: "Job") -> "Job":
+        """The job an added `job` was merged into (itself if it was kept)."""
+        return self._kept.get(id(job), job)
+
+    def _find(self, job: "Job") -> "Job":
+        url = job.key if job.url else ""
+        if url and url in self._by_url:
+            return self._by_url[url]
+        company = job.norm_company
+        match = self._by_title.get(job.dedup_key)
+        if match is not None and _one_source(job, match) and _full_title(job.title) != _full_title(match.title):
+            # Same normalised title, different bracketed text: only an exact repost of this variant merges
+            match = self._by_full_title.get((_full_title(job.title), company))
+        if match is None:
+            shingles, signature = _title_signature(job.norm_title)
+            bands = [
+                (company, band, signature[band * LSH_ROWS:(band + 1) * LSH_ROWS])
+                for band in range(LSH_BANDS)
+            ]
+            match = self._best_candidate(job, bands, shingles)
+            if match is None:
+                for band in bands:
+                    self._buckets.setdefault(band, []).append(job)
+                self._shingles[id(job)] = shingles
+                self._by_title.setdefault(job.dedup_key, job)
+                self._by_full_title.setdefault((_full_title(job.title), company), job)
+
+        kept = job if match is None else match
+        if url:
+            self._by_url.setdefault(url, kept)
+        return kept
+
+    def _best_candidate(self, job: "Job", bands: list, shingles: frozenset):
+        best, best_similarity, seen = None, 0.0, set()
+        for band in bands:
+            for candidate in self._buckets.get(band, ()):
+                if id(candidate) in seen:
+                    continue
+                seen.add(id(candidate))
+                if _one_source(job, candidate):
+                    continue  # near matches only merge across sources
+                similarity = _similarity(shingles, self._shingles[id(candidate)])
+                if similarity >= self.threshold and similarity > best_similarity:
+                    best, best_similarity = candidate, similarity
+        return best
+
+
+def _one_source(job: "Job", other: "Job") -> bool:
+    """Whether `job` and `other` are two URLs listed by the same source."""
+    return job.source == other.source and bool(job.url and other.url)
@@ -0,0 +1,158 @@
+import re
+import json
+from typing import NamedTuple
+from job import Job
+from keywords import JOB_CATEGORIES, job_categories, title_words
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Names subscribers use in /filter sources; "portals" covers every company
+# career portal (any source that is not one of the job boards)
+SOURCE_NAMES = {
+    "mcf": "MyCareersFuture",
+    "indeed": "Indeed",
+    "linkedin": "LinkedIn",
+}
+PORTALS = "portals"
+
+
+def _tokens(text: str) -> tuple[str, ...]:
+    return tuple(_TOKEN_RE.findall(text.lower()))
+
+
+class JobFilter(NamedTuple):
+    """
+    What a subscriber wants in their digest. Each non-empty field must match
+    (a job passes a field if it matches any of its values); empty means any.
+    """
+    categories: frozenset = frozenset()
+    keywords: tuple = ()          # matched as whole words in the title
+    sources: frozenset = frozenset()
+
+    def __bool__(self) -> bool:
+        return bool(self.categories or self.keywords or self.sources)
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "categories": sorted(self.categories),
+            "keywords": list(self.keywords),
+            "sources": sorted(self.sources),
+        })
+
+    @classmethod
+    def from_json(cls, text: str) -> "JobFilter":
+        if not text:
+            return NO_FILTER
+        data = json.loads(text)
+        return cls(
+            frozenset(data.get("categories", ())),
+            tuple(data.get("keywords", ())),
+            frozenset(data.get("sources", ())),
+        )
+
+    def describe(self) -> str:
+        if not self:
+            return "All jobs (no filters set)."
+        lines = []
+        if self.categories:
+            lines.append("Categories: " + ", ".join(sorted(self.categories)))
+        if self.keywords:
+            lines.append("Keywords: " + ", ".join(self.keywords))
+        if self.sources:
+            lines.append("Sources: " + ", ".join(sorted(self.sources)))
+        return "\n".join(lines)
+
+
+NO_FILTER = JobFilter()
+
+
+def parse_filter_args(current: JobFilter, args: list[str]) -> JobFilter:
+    """
+    Apply a /filter command to `current`:
+        categories counter admin | keywords ramp, check in | sources mcf portals | clear
+    A field given with no values is cleared. Unknown names raise ValueError.
+    """
+    if not args:
+        raise ValueError("missing filter type")
+    kind, values = args[0].lower(), args[1:]
+    if kind == "clear":
+        return NO_FILTER
+    if kind in ("category", "categories"):
+        names = {v.lower().strip(",") for v in values} - {""}
+        unknown = names - JOB_CATEGORIES.keys()
+        if unknown:
+            raise ValueError(f"unknown category: {', '.join(sorted(unknown))}")
+        return current._replace(categories=frozenset(names))
+    if kind in ("keyword", "keywords"):
+        phrases = (" ".join(_tokens(p)) for p in " ".join(values).split(","))
+        return current._replace(keywords=tuple(dict.fromkeys(p for p in phrases if p)))
+    if kind in ("source", "sources"):
+        names = {v.lower().strip(",") for v in values} - {""}
+        unknown = names - SOURCE_NAMES.keys() - {PORTALS}
+        if unknown:
+            raise ValueError(f"unknown source: {', '.join(sorted(unknown))}")
+        return current._replace(sources=frozenset(names))
+    raise ValueError(f"unknown filter type: {kind}")
+
+
+# ─── Inverted Index ──────────────────────────────────────────────────────────
+
+class JobIndex:
+    """
+    Inverted indexes over one crawl's ranked jobs: category, source and title
+    word -> job positions. Built once per crawl; a filter is answered with a
+    few set operations instead of scanning every job, and each distinct
+    filter is only evaluated once.
+    """
+
+    def __init__(self, jobs: list[Job]):
+        self.jobs = jobs
+        self._all = frozenset(range(len(jobs)))
+        self._titles: list[tuple[str, ...]] = []
+        self._by_category: dict[str, set] = {}
+        self._by_source: dict[str, set] = {}
+        self._by_word: dict[str, set] = {}
+        for i, job in enumerate(jobs):
+            title = job.title
+            words = title_words(title)
+            self._titles.append(words)
+            for category in job_categories(title):
+                self._by_category.setdefault(category, set()).add(i)
+            self._by_source.setdefault(job.source, set()).add(i)
+            for word in words:
+                self._by_word.setdefault(word, set()).add(i)
+        boards = set().union(*(self._by_source.get(s, ()) for s in SOURCE_NAMES.values()))
+        self._portals = self._all - boards
+        self._results: dict[JobFilter, tuple[int, ...]] = {}
+
+    def _with_phrase(self, phrase: str) -> set:
+        words = title_words(phrase)
+        if not words:
+            return set()
+        candidates = set.intersection(*(self._by_word.get(w, set()) for w in words))
+        if len(words) == 1:
+            return candidates
+        n = len(words)
+        return {
+            i for i in candidates
+            if any(self._titles[i][k:k + n] == words for k in range(len(self._titles[i]) - n + 1))
+        }
+
+    def _for_source(self, name: str) -> set:
+        if name == PORTALS:
+            return self._portals
+        return self._by_source.get(SOURCE_NAMES.get(name, name), set())
+
+    def match(self, job_filter: JobFilter) -> tuple[int, ...]:
+        """Positions of the jobs `job_filter` lets through, in ranking order."""
+        if job_filter in self._results:
+            return self._results[job_filter]
+        ids = set(self._all)
+        if job_filter.categories:
+            ids &= set().union(*(self._by_category.get(c, ()) for c in job_filter.categories))
+        if job_filter.sources:
+            ids &= set().union(*(self._for_source(s) for s in job_filter.sources))
+        if job_filter.keywords:
+            ids &= set().union(*(self._with_phrase(k) for k in job_filter.keywords))
+        result = self._results[job_filter] = tuple(sorted(ids))
+        return result
@@ -1,128 +1,12 @@
+import os
+from collections import OrderedDict
 from datetime import datetime
 import pytz
+from job import Job
+from keywords import ATM_SKILLS_MAP, SKILL_PREFIX, title_labels
 
 SGT = pytz.timezone("Asia/Singapore")
 
-# Skills from an Air Transport Management degree that are useful per job type
-ATM_SKILLS_MAP = {
-    "aviation": [
-        "Air Transport Economics", "Aviation Safety & Security", "Airport Planning & Management",
-        "Airline Strategy", "ICAO/IATA Regulations"
-    ],
-    "airport": [
-        "Airport Operations", "Airport Planning & Management", "Passenger Experience",
-        "Ground Handling", "Security Compliance"
-    ],
-    "airline": [
-        "Airline Strategy", "Revenue Management", "Network Planning",
-        "Airline Economics", "Fleet Planning"
-    ],
-    "flight": [
-        "Flight Operations Principles", "ICAO/IATA Standards", "Airspace Management",
-        "Operational Scheduling", "Aviation Safety & Security"
-    ],
-    "ground": [
-        "Ground Handling Operations", "Turnaround Coordination", "Airport Safety Procedures",
-        "Resource Allocation", "Service Level Management"
-    ],
-    "ramp": [
-        "Ramp Operations", "Turnaround Coordination", "Ground Handling",
-        "Aviation Safety Procedures", "Aircraft Servicing Protocols"
-    ],
-    "baggage": [
-        "Baggage Handling Systems", "Airport Operations", "Ground Handling",
-        "Service Recovery", "Passenger Experience"
-    ],
-    "air traffic": [
-        "Airspace Management", "Air Traffic Flow", "ICAO Procedures",
-        "Aviation Safety & Security", "Air Transport Economics"
-    ],
-    "customer service": [
-        "Passenger Experience Management", "Service Excellence", "Complaint Handling",
-        "Airport Operations", "Cross-Cultural Communication"
-    ],
-    "passenger": [
-        "Passenger Experience Management", "Airport Terminal Operations",
-        "Service Delivery", "Check-in & Boarding Procedures", "Customer Relations"
-    ],
-    "project": [
-        "Project Management", "Stakeholder Management", "Operations Research",
-        "Strategic Planning", "Risk Management"
-    ],
-    "data": [
-        "Data Analysis", "Aviation Statistics", "Demand Forecasting",
-        "Traffic Flow Analysis", "Operations Research"
-    ],
-    "business analyst": [
-        "Business Analysis", "Process Mapping", "Data Analysis",
-        "Stakeholder Management", "Report Writing"
-    ],
-    "operations": [
-        "Operations Management", "Process Optimisation", "Resource Planning",
-        "Service Delivery", "KPI Monitoring"
-    ],
-    "logistics": [
-        "Supply Chain Fundamentals", "Cargo Operations", "Air Freight Management",
-        "Transport Economics", "Logistics Planning"
-    ],
-    "cargo": [
-        "Air Cargo Management", "Freight Operations", "Dangerous Goods Regulations",
-        "Cargo Revenue Management", "IATA Cargo Standards"
-    ],
-    "safety": [
-        "Aviation Safety Management Systems (SMS)", "Risk Assessment",
-        "ICAO Safety Standards", "Safety Auditing", "Incident Investigation"
-    ],
-    "analyst": [
-        "Data Analysis", "Market Research", "Business Intelligence",
-        "Statistical Analysis", "Report Writing"
-    ],
-    "manager": [
-        "Leadership & Team Management", "Strategic Planning", "Budget Management",
-        "Stakeholder Engagement", "Change Management"
-    ],
-    "coordinator": [
-        "Coordination & Scheduling", "Stakeholder Communication", "Project Support",
-        "Operations Planning", "Documentation & Reporting"
-    ],
-    "admin": [
-        "Administrative Support", "Documentation & Records Management",
-        "Scheduling & Coordination", "Office Operations", "Report Writing"
-    ],
-    "administrative": [
-        "Administrative Support", "Documentation & Records Management",
-        "Scheduling & Coordination", "Office Operations", "Report Writing"
-    ],
-    "check-in": [
-        "Passenger Experience Management", "Check-in & Boarding Procedures",
-        "Airport Customer Service", "IATA Ticketing Standards", "Baggage Handling"
-    ],
-    "check in": [
-        "Passenger Experience Management", "Check-in & Boarding Procedures",
-        "Airport Customer Service", "IATA Ticketing Standards", "Baggage Handling"
-    ],
-    "ticketing": [
-        "IATA Ticketing & Fares", "Airline Reservation Systems",
-        "Passenger Experience", "Revenue Management Basics", "Customer Service"
-    ],
-    "counter": [
-        "Airport Terminal Operations", "Passenger Experience Management",
-        "Check-in & Boarding Procedures", "Customer Relations", "Service Recovery"
-    ],
-    "guest service": [
-        "Passenger Experience Management", "Service Excellence",
-        "Airport Terminal Operations", "Complaint Handling", "Cross-Cultural Communication"
-    ],
-    "business analyst": [
-        "Business Analysis", "Process Mapping & Improvement", "Data Analysis",
-        "Stakeholder Management", "Aviation Market Research"
-    ],
-    "junior business": [
-        "Business Analysis", "Process Mapping & Improvement", "Data Analysis",
-        "Stakeholder Management", "Report Writing"
-    ],
-}
-
 SOURCE_EMOJI = {
     "MyCareersFuture": "🇸🇬",
     "Indeed": "🔍",
@@ -137,22 +21,22 @@ SOURCE_EMOJI = {
 
 def get_atm_skills(title: str) -> list[str]:
     """Return relevant ATM degree skills for a given job title."""
-    title_lower = title.lower()
-    skills = set()
+    labels = title_labels(title)
+    skills = []
     for keyword, skill_list in ATM_SKILLS_MAP.items():
-        if keyword in title_lower:
-            skills.update(skill_list)
-    return list(skills)[:5]  # cap at 5 skills per job
-
-
-def format_job_entry(job: dict) -> str:
-    title = job.get("title", "Untitled")
-    company = job.get("company", "")
-    location = job.get("location", "")
-    url = job.get("url", "")
-    salary = job.get("salary", "")
-    source = job.get("source", "")
-    snippet = job.get("snippet", "")
+        if SKILL_PREFIX + keyword in labels:
+            skills.extend(s for s in skill_list if s not in skills)
+    return skills[:5]  # cap at 5 skills per job
+
+
+def format_job_entry(job: Job) -> str:
+    title = job.title or "Untitled"
+    company = job.company
+    location = job.location
+    url = job.url
+    salary = job.salary
+    source = job.source
+    snippet = job.snippet
     emoji = SOURCE_EMOJI.get(source, "📋")
 
     skills = get_atm_skills(title)
@@ -188,47 +72,97 @@ def format_job_entry(job: dict) -> str:
     return "\n".join(lines)
 
 
+# Markdown special characters, each escaped with a backslash in one translate() pass
+_ESCAPES = str.maketrans({ch: f"\\{ch}" for ch in "_*[]()~`>#+-=|{}.!"})
+
+
 def _escape(text: str) -> str:
     """Escape Markdown special characters."""
-    for ch in ["_", "*", "[", "]", "(", ")", "~", "`", ">", "#", "+", "-", "=", "|", "{", "}", ".", "!"]:
-        text = text.replace(ch, f"\\{ch}")
-    return text
+    return text.translate(_ESCAPES)
 
 
-def format_jobs_message(jobs: list[dict], schedule_label: str = None) -> list[str]:
-    """Split jobs into Telegram-safe messages (max 4096 chars each)."""
-    if not jobs:
-        return ["No relevant jobs found at this time. Please check back later."]
+# ─── Digests ─────────────────────────────────────────────────────────────────
+# Entries are rendered once per job and reused by every digest the job
+# appears in (/latest, each slot, each subscriber group); only the header
+# and footer are built per message.
+
+MESSAGE_LIMIT = 4000  # Telegram allows 4096; the footer goes on top of this
+RENDER_CACHE_SIZE = int(os.environ.get("RENDER_CACHE_SIZE", "4096"))
+
+_SEPARATOR = "─" * 30
+_ENTRY_END = f"\n\n{_SEPARATOR}\n\n"
+_FOOTER = (
+    "\n\n💡 *Tip:* Use /latest to refresh at any time\\."
+    "\nJobs auto\\-refresh daily at *9:00 AM SGT*\\."
+)
+
+# job key -> (the fields the entry was rendered from, entry text), least recently used first
+_entries: OrderedDict = OrderedDict()
 
+
+def _cached_entry(job: Job) -> str:
+    """The job's entry plus separator, rendered on first use and whenever its shown fields change."""
+    fields = (job.title, job.company, job.location, job.url, job.salary, job.source, job.snippet)
+    cached = _entries.get(job.key)
+    if cached is not None and cached[0] == fields:
+        _entries.move_to_end(job.key)
+        return cached[1]
+    entry = format_job_entry(job) + _ENTRY_END
+    _entries[job.key] = (fields, entry)
+    _entries.move_to_end(job.key)
+    if len(_entries) > RENDER_CACHE_SIZE:
+        _entries.popitem(last=False)
+    return entry
+
+
+def _header(count: int, schedule_label: str = None, part: str = None) -> str:
     now = datetime.now(SGT).strftime("%d %b %Y, %I:%M %p SGT")
     slot_line = f"🔔 *{schedule_label} SGT Update*\n" if schedule_label else ""
-    header = (
+    if part == "first":
+        count_line = f"📊 Top {count} jobs so far, still searching..."
+    elif part == "rest":
+        count_line = f"📊 {count} more jobs found"
+    else:
+        count_line = f"📊 {count} jobs found"
+    return (
         f"✈️ *Aviation & PM Job Listings*\n"
         f"{slot_line}"
         f"🎯 Fresh Grad & 1–2 Years Exp\n"
         f"🕐 Updated: {now}\n"
-        f"📊 {len(jobs)} jobs found\n"
-        f"{'─' * 30}"
+        f"{count_line}\n"
+        f"{_SEPARATOR}"
     )
 
-    messages = []
-    current = header + "\n\n"
 
-    for i, job in enumerate(jobs):
-        entry = format_job_entry(job) + "\n\n" + "─" * 30 + "\n\n"
-        if len(current) + len(entry) > 4000:
-            messages.append(current.strip())
-            current = entry
+def _chunk(header: str, entries: list[str]) -> list[str]:
+    """Pack the header and entries into messages of at most MESSAGE_LIMIT characters, each joined once."""
+    messages = []
+    parts = [header + "\n\n"]
+    size = len(parts[0])
+    for entry in entries:
+        if size + len(entry) > MESSAGE_LIMIT:
+            messages.append("".join(parts).strip())
+            parts, size = [entry], len(entry)
         else:
-            current += entry
+            parts.append(entry)
+            size += len(entry)
+    last = "".join(parts).strip()
+    if last:
+        messages.append(last)
+    return messages
 
-    if current.strip():
-        messages.append(current.strip())
 
-    # Add footer to last message
-    messages[-1] += (
-        "\n\n💡 *Tip:* Use /latest to refresh at any time\\."
-        "\nJobs auto\\-refresh daily at *9:00 AM SGT*\\."
-    )
+def format_jobs_message(jobs: list[Job], schedule_label: str = None, part: str = None) -> list[str]:
+    """
+    Split jobs into Telegram-safe messages (max 4096 chars each).
+    `part` is set when results go out in two steps: "first" for the early
+    page sent while the crawl is still running (no footer), "rest" for the
+    jobs that follow it.
+    """
+    if not jobs:
+        return ["No relevant jobs found at this time. Please check back later."]
 
+    messages = _chunk(_header(len(jobs), schedule_label, part), [_cached_entry(job) for job in jobs])
+    if part != "first":
+        messages[-1] += _FOOTER
     return messages
@@ -0,0 +1,140 @@
+import os
+import asyncio
+import logging
+import urllib.parse
+from collections import Counter
+import aiohttp
+from metrics import HTTP_BYTES, HTTP_LATENCY, HTTP_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+# Connection pool shared by every crawl and link check for the life of the
+# process, so repeat requests to the same few hosts skip DNS and TCP/TLS setup.
+HTTP_POOL_LIMIT = int(os.environ.get("HTTP_POOL_LIMIT", "64"))
+HTTP_POOL_PER_HOST = int(os.environ.get("HTTP_POOL_PER_HOST", "8"))
+HTTP_KEEPALIVE = float(os.environ.get("HTTP_KEEPALIVE", "60"))
+HTTP_DNS_TTL = int(os.environ.get("HTTP_DNS_TTL", "600"))
+
+# Default for requests that don't pass their own timeout
+DEFAULT_TIMEOUT = aiohttp.ClientTimeout(total=15)
+
+
+class HttpClient:
+    """
+    One long-lived aiohttp session over a tuned TCPConnector: per-host
+    connection caps, keep-alive, cached DNS answers and compressed responses.
+
+    The session is opened on first use (inside the running event loop) and
+    closed with close(). `trace_configs` is read when the session opens, so
+    extra tracers can be appended until then.
+    """
+
+    def __init__(self, headers: dict = None, trace_configs: list = None):
+        self.headers = {"Accept-Encoding": "gzip, deflate", **(headers or {})}
+        self.trace_configs = trace_configs if trace_configs is not None else []
+        self._session: aiohttp.ClientSession = None
+        self._lock = asyncio.Lock()
+        self._stats = Counter()
+
+    async def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            async with self._lock:
+                if self._session is None or self._session.closed:
+                    self._session = self._open()
+        return self._session
+
+    def _open(self) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(
+            limit=HTTP_POOL_LIMIT,
+            limit_per_host=HTTP_POOL_PER_HOST,
+            keepalive_timeout=HTTP_KEEPALIVE,
+            use_dns_cache=True,
+            ttl_dns_cache=HTTP_DNS_TTL,
+            enable_cleanup_closed=True,
+        )
+        logger.info(
+            f"HTTP pool opened ({HTTP_POOL_LIMIT} connections, {HTTP_POOL_PER_HOST} per host, "
+            f"keep-alive {HTTP_KEEPALIVE:.0f}s, DNS cache {HTTP_DNS_TTL}s)"
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            headers=self.headers,
+            timeout=DEFAULT_TIMEOUT,
+            trace_configs=[self._stats_trace(), _metrics_trace(), *self.trace_configs],
+        )
+
+    def _stats_trace(self) -> aiohttp.TraceConfig:
+        stats = self._stats
+
+        async def on_request_start(session, ctx, params):
+            stats["requests"] += 1
+
+        async def on_connection_create_end(session, ctx, params):
+            stats["connections_opened"] += 1
+
+        async def on_connection_reuseconn(session, ctx, params):
+            stats["connections_reused"] += 1
+
+        async def on_dns_cache_hit(session, ctx, params):
+            stats["dns_cache_hits"] += 1
+
+        async def on_dns_cache_miss(session, ctx, params):
+            stats["dns_lookups"] += 1
+
+        trace = aiohttp.TraceConfig()
+        trace.on_request_start.append(on_request_start)
+        trace.on_connection_create_end.append(on_connection_create_end)
+        trace.on_connection_reuseconn.append(on_connection_reuseconn)
+        trace.on_dns_cache_hit.append(on_dns_cache_hit)
+        trace.on_dns_cache_miss.append(on_dns_cache_miss)
+        return trace
+
+    def stats(self) -> dict:
+        """Counters since the client was created: requests, connections opened/reused, DNS lookups/cache hits."""
+        keys = ("requests", "connections_opened", "connections_reused", "dns_lookups", "dns_cache_hits")
+        return {key: self._stats[key] for key in keys}
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+def request_host(url) -> str:
+    """Host label for metrics: the URL's netloc, as the rate limiter keys hosts."""
+    return urllib.parse.urlsplit(str(url)).netloc.lower()
+
+
+def _metrics_trace() -> aiohttp.TraceConfig:
+    """Per-host request counts by status, time to response headers, and bytes read in full."""
+    loop = asyncio.get_event_loop
+
+    async def on_request_start(session, ctx, params):
+        ctx.start = loop().time()
+
+    async def on_request_end(session, ctx, params):
+        host = request_host(params.url)
+        HTTP_REQUESTS.inc(host=host, status=params.response.status)
+        HTTP_LATENCY.observe(loop().time() - ctx.start, host=host)
+
+    async def on_request_exception(session, ctx, params):
+        status = "timeout" if isinstance(params.exception, asyncio.TimeoutError) else "error"
+        HTTP_REQUESTS.inc(host=request_host(params.url), status=status)
+
+    async def on_response_chunk_received(session, ctx, params):
+        HTTP_BYTES.inc(len(params.chunk), host=request_host(params.url))
+
+    trace = aiohttp.TraceConfig()
+    trace.on_request_start.append(on_request_start)
+    trace.on_request_end.append(on_request_end)
+    trace.on_request_exception.append(on_request_exception)
+    trace.on_response_chunk_received.append(on_response_chunk_received)
+    return trace
+
+
+def stats_delta(before: dict, after: dict) -> dict:
+    """Counters accumulated between two stats() snapshots, plus the connection reuse ratio."""
+    delta = {key: after[key] - before.get(key, 0) for key in after}
+    connections = delta["connections_opened"] + delta["connections_reused"]
+    delta["reuse_ratio"] = delta["connections_reused"] / connections if connections else 0.0
+    return delta
@@ -0,0 +1,51 @@
+import sys
+from dedup import canonical_url, normalize_company, normalize_title
+
+# Fields a job is built from and stored as, in order
+FIELDS = ("source", "title", "company", "location", "url", "salary", "snippet")
+
+
+class Job:
+    """
+    One crawled posting. Slotted rather than a dict; the values that repeat
+    across thousands of jobs (source, company, location, snippet, normalised
+    title and company) are interned so every job shares one copy of each,
+    and everything derived from the text is worked out once on construction:
+
+    - `key`: stable identity across crawls (see jobstore.job_key)
+    - `norm_title`, `norm_company`: as dedup.py normalises them
+    - `dedup_key`: (norm_title, norm_company), what deduplicate() and the
+      query planner group on
+
+    The derived values are not kept in step with the fields, so a job is
+    treated as read-only once built.
+    """
+
+    __slots__ = FIELDS + ("key", "norm_title", "norm_company", "dedup_key")
+
+    def __init__(self, source: str, title: str, company: str = "", location: str = "",
+                 url: str = "", salary: str = "", snippet: str = ""):
+        self.source = sys.intern(source)
+        self.title = title
+        self.company = sys.intern(company)
+        self.location = sys.intern(location)
+        self.url = url
+        self.salary = salary
+        self.snippet = sys.intern(snippet)
+        self.norm_title = sys.intern(normalize_title(title))
+        self.norm_company = sys.intern(normalize_company(company))
+        self.dedup_key = (self.norm_title, self.norm_company)
+        if url:
+            self.key = canonical_url(url)
+        else:
+            self.key = f"{self.source}|{title.lower()}|{company.lower()}"
+
+    def to_dict(self) -> dict:
+        return {field: getattr(self, field) for field in FIELDS}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Job":
+        return cls(**{field: data.get(field) or "" for field in FIELDS})
+
+    def __repr__(self):
+        return f"Job({self.source!r}, {self.title!r}, {self.company!r}, url={self.url!r})"
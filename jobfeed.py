@@ -0,0 +1,146 @@
+import os
+import time
+import asyncio
+import logging
+from typing import AsyncIterator
+from job import Job
+from jobstore import JobStore
+
+logger = logging.getLogger(__name__)
+
+# "inline": the bot crawls in its own event loop (one process, as deployed).
+# "worker": a separate `python crawler.py` process crawls and publishes to
+# the job store; the bot only reads finished results and delivers them.
+CRAWLER_MODE = os.environ.get("CRAWLER_MODE", "inline")
+# Seconds between checks of the store for a newly published crawl (worker mode)
+PUBLISH_POLL_SECONDS = float(os.environ.get("PUBLISH_POLL_SECONDS", "5"))
+# Longest a caller waits for the crawler to publish a fresh enough result
+# before making do with the newest one there is (worker mode)
+PUBLISH_WAIT_SECONDS = float(os.environ.get("PUBLISH_WAIT_SECONDS", "600"))
+
+
+class InlineFeed:
+    """Jobs from crawls run in this process, through scraper.py's shared cached crawl."""
+
+    def __init__(self):
+        # Imported here so a bot in worker mode never loads the scrapers
+        import scraper
+        self._scraper = scraper
+        self.store = scraper.job_store
+        self.crawls = True
+
+    async def start(self):
+        # One connection pool for every crawl, kept open for the bot's lifetime
+        await self._scraper.http_client.session()
+
+    async def close(self):
+        import parsing
+        await self._scraper.http_client.close()
+        parsing.shutdown()
+
+    async def fetch(self, max_age: float = None, allow_stale: bool = True, force_refresh: bool = False) -> list[Job]:
+        return await self._scraper.fetch_all_jobs(max_age=max_age, allow_stale=allow_stale, force_refresh=force_refresh)
+
+    def stream(self, max_age: float = None, allow_stale: bool = True) -> AsyncIterator[tuple[list[Job], bool]]:
+        return self._scraper.stream_all_jobs(max_age=max_age, allow_stale=allow_stale)
+
+    def age(self):
+        return self._scraper.cached_jobs_age()
+
+    def invalidate(self):
+        self._scraper.invalidate_jobs()
+
+    def last_stats(self) -> dict:
+        return self._scraper.last_crawl_stats
+
+
+class StoreFeed:
+    """
+    Jobs from the crawls a crawler.py process publishes to the job store.
+    Never crawls: fetch() waits (up to PUBLISH_WAIT_SECONDS) for the next
+    publish when the newest result is not fresh enough, which only the
+    scheduled pushes ask for; stream(), behind /latest, never waits. The
+    newest result is decoded once and kept until a newer one appears.
+    """
+
+    def __init__(self, store: JobStore = None):
+        self.store = store if store is not None else JobStore()
+        self.crawls = False
+        self._id = None
+        self._crawled_at = None
+        self._jobs: list[Job] = []
+        self._stats: dict = {}
+
+    async def start(self):
+        self._refresh()
+        if self._id is None:
+            logger.warning("No published crawl in the job store yet; is crawler.py running?")
+        else:
+            logger.info(f"Serving published crawl #{self._id} ({self.age():.0f}s old, {len(self._jobs)} jobs)")
+
+    async def close(self):
+        pass
+
+    def _refresh(self):
+        head = self.store.latest_published()
+        if head is None or head[0] == self._id:
+            return
+        published = self.store.published(head[0])
+        if published is not None:
+            self._id = head[0]
+            self._crawled_at, self._jobs, self._stats = published
+
+    async def _wait(self, ready) -> bool:
+        """Poll the store until ready() holds or PUBLISH_WAIT_SECONDS pass; returns ready()."""
+        deadline = time.monotonic() + PUBLISH_WAIT_SECONDS
+        self._refresh()
+        while not ready() and time.monotonic() < deadline:
+            await asyncio.sleep(PUBLISH_POLL_SECONDS)
+            self._refresh()
+        return ready()
+
+    async def fetch(self, max_age: float = None, allow_stale: bool = True, force_refresh: bool = False) -> list[Job]:
+        """
+        The newest published jobs. `force_refresh` waits for a crawl published
+        after the call; `allow_stale=False` waits for one at most `max_age`
+        seconds old. Either way, the newest there is is returned on timeout.
+        """
+        since = time.time()
+        if force_refresh:
+            ready = lambda: self._crawled_at is not None and self._crawled_at >= since  # noqa: E731
+        elif not allow_stale and max_age is not None:
+            ready = lambda: self._crawled_at is not None and time.time() - self._crawled_at <= max_age  # noqa: E731
+        else:
+            ready = lambda: self._crawled_at is not None  # noqa: E731
+        if not await self._wait(ready) and self._crawled_at is not None:
+            logger.warning(f"No fresh enough crawl was published; using the newest ({self.age():.0f}s old)")
+        return list(self._jobs)
+
+    async def stream(self, max_age: float = None, allow_stale: bool = True) -> AsyncIterator[tuple[list[Job], bool]]:
+        """
+        The newest published result, at once and as final (it is already
+        complete); nothing if none has been published yet. Never waits, as a
+        command handler must not hold up the bot's other updates.
+        """
+        self._refresh()
+        if self._crawled_at is not None:
+            yield list(self._jobs), True
+
+    def age(self):
+        """Seconds since the newest published crawl finished, or None if there is none."""
+        self._refresh()
+        return time.time() - self._crawled_at if self._crawled_at is not None else None
+
+    def invalidate(self):
+        pass  # results belong to the crawler
+
+    def last_stats(self) -> dict:
+        return self._stats
+
+
+def open_feed(mode: str = CRAWLER_MODE):
+    if mode == "inline":
+        return InlineFeed()
+    if mode == "worker":
+        return StoreFeed()
+    raise ValueError(f"CRAWLER_MODE must be 'inline' or 'worker', not {mode!r}")
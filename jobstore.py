@@ -0,0 +1,252 @@
+import os
+import json
+import time
+import sqlite3
+import logging
+from job import Job
+
+logger = logging.getLogger(__name__)
+
+JOBS_DB = os.environ.get("JOBS_DB", "jobs.db")
+# Published crawl results kept for the bot (see publish())
+PUBLISHED_KEEP = 5
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    key         TEXT PRIMARY KEY,
+    data        TEXT NOT NULL,      -- JSON of the job's fields as last crawled
+    fingerprint TEXT NOT NULL,      -- title + snippet the score was computed from
+    score       INTEGER NOT NULL,
+    first_seen  REAL NOT NULL,
+    last_seen   REAL NOT NULL,
+    pushed_at   REAL                -- first scheduled push the job was in (NULL = never pushed)
+);
+CREATE TABLE IF NOT EXISTS query_watermarks (
+    source     TEXT NOT NULL,
+    query      TEXT NOT NULL,
+    watermark  TEXT NOT NULL,       -- newest posting date seen for this query
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (source, query)
+);
+CREATE TABLE IF NOT EXISTS query_yields (
+    source      TEXT NOT NULL,
+    query       TEXT NOT NULL,
+    runs        INTEGER NOT NULL,
+    requests    REAL NOT NULL,      -- running averages per crawl the query ran in
+    unique_jobs REAL NOT NULL,
+    avg_score   REAL NOT NULL,
+    last_run    REAL NOT NULL,
+    PRIMARY KEY (source, query)
+);
+CREATE TABLE IF NOT EXISTS breakers (
+    source    TEXT PRIMARY KEY,
+    state     TEXT NOT NULL,        -- closed / open
+    failures  INTEGER NOT NULL,     -- consecutive failures so far
+    opened_at REAL,
+    cooldown  REAL NOT NULL,        -- seconds from opened_at until a probe is allowed
+    reason    TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS published (
+    id         INTEGER PRIMARY KEY AUTOINCREMENT,
+    crawled_at REAL NOT NULL,
+    jobs       TEXT NOT NULL,       -- JSON list of the crawl's validated jobs, best first
+    stats      TEXT NOT NULL        -- JSON of the crawl's stage timings and counts
+);
+CREATE TABLE IF NOT EXISTS watermarks (
+    chat_id         TEXT PRIMARY KEY,
+    delivered_until REAL NOT NULL   -- jobs first pushed after this (or never) are new to the chat
+);
+"""
+
+def job_key(job: Job) -> str:
+    """Stable identity for a job across crawls: its canonical URL, or source, title and company without one."""
+    return job.key
+
+
+def _fingerprint(job: Job) -> str:
+    return f"{job.title}\x1f{job.snippet}"
+
+
+class JobStore:
+    """
+    Every job ever crawled, keyed by job_key(), with first/last-seen times,
+    the last score and when it was first pushed, plus per-query crawl watermarks and
+    yields, per-source circuit breaker state, the latest published crawl
+    results, and per-subscriber delivery watermarks.
+    """
+
+    def __init__(self, path: str = JOBS_DB):
+        self.path = path
+        # A bot and a crawler.py process may share the file; wait out each other's writes
+        self._db = sqlite3.connect(path, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        # Stores created before pushes were tracked per job
+        if "pushed_at" not in {row[1] for row in self._db.execute("PRAGMA table_info(jobs)")}:
+            self._db.execute("ALTER TABLE jobs ADD COLUMN pushed_at REAL")
+
+    def _rows(self, keys: list[str], columns: str) -> dict:
+        rows = {}
+        keys = list(keys)
+        for i in range(0, len(keys), 500):  # stay under SQLite's variable limit
+            chunk = keys[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            for row in self._db.execute(
+                f"SELECT key, {columns} FROM jobs WHERE key IN ({placeholders})", chunk
+            ):
+                rows[row[0]] = row[1:]
+        return rows
+
+    # ── Crawl bookkeeping ────────────────────────────────────────────────────
+
+    def known_scores(self, jobs: list[Job]) -> dict:
+        """key -> stored score, for jobs whose title and snippet are unchanged."""
+        rows = self._rows((job_key(j) for j in jobs), "fingerprint, score")
+        scores = {}
+        for job in jobs:
+            key = job_key(job)
+            row = rows.get(key)
+            if row is not None and row[0] == _fingerprint(job):
+                scores[key] = row[1]
+        return scores
+
+    def record_crawl(self, jobs: list[Job], scores: dict):
+        """Upsert every crawled job; `scores` maps key -> score."""
+        now = time.time()
+        with self._db:
+            for job in jobs:
+                key = job_key(job)
+                self._db.execute(
+                    """
+                    INSERT INTO jobs (key, data, fingerprint, score, first_seen, last_seen)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(key) DO UPDATE SET
+                        data = excluded.data,
+                        fingerprint = excluded.fingerprint,
+                        score = excluded.score,
+                        last_seen = excluded.last_seen
+                    """,
+                    (key, json.dumps(job.to_dict()), _fingerprint(job), scores[key], now, now),
+                )
+
+    # ── Pushes ───────────────────────────────────────────────────────────────
+
+    def pushed_at(self, jobs: list[Job]) -> dict:
+        """key -> when the job was first in a scheduled push; jobs never pushed are absent."""
+        return {
+            key: row[0]
+            for key, row in self._rows((job_key(j) for j in jobs), "pushed_at").items()
+            if row[0] is not None
+        }
+
+    def mark_pushed(self, jobs: list[Job], pushed_at: float):
+        """Record that `jobs` went out in the push at `pushed_at`; earlier pushes are kept."""
+        with self._db:
+            self._db.executemany(
+                "UPDATE jobs SET pushed_at = ? WHERE key = ? AND pushed_at IS NULL",
+                ((pushed_at, job_key(job)) for job in jobs),
+            )
+
+    # ── Crawl watermarks ─────────────────────────────────────────────────────
+
+    def query_watermark(self, source: str, query: str):
+        row = self._db.execute(
+            "SELECT watermark FROM query_watermarks WHERE source = ? AND query = ?", (source, query)
+        ).fetchone()
+        return row[0] if row else None
+
+    def set_query_watermark(self, source: str, query: str, watermark: str):
+        with self._db:
+            self._db.execute(
+                "INSERT INTO query_watermarks (source, query, watermark, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(source, query) DO UPDATE SET watermark = excluded.watermark, updated_at = excluded.updated_at",
+                (source, query, watermark, time.time()),
+            )
+
+    # ── Query yields ─────────────────────────────────────────────────────────
+
+    def query_yields(self, source: str) -> dict:
+        """query -> {runs, requests, unique_jobs, avg_score, last_run} for `source`."""
+        return {
+            row[0]: dict(zip(("runs", "requests", "unique_jobs", "avg_score", "last_run"), row[1:]))
+            for row in self._db.execute(
+                "SELECT query, runs, requests, unique_jobs, avg_score, last_run FROM query_yields WHERE source = ?",
+                (source,),
+            )
+        }
+
+    def record_query_yields(self, source: str, rows):
+        """Replace the yields of the given queries; rows are (query, runs, requests, unique_jobs, avg_score, last_run)."""
+        with self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO query_yields (source, query, runs, requests, unique_jobs, avg_score, last_run) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                ((source, *row) for row in rows),
+            )
+
+    # ── Circuit breakers ─────────────────────────────────────────────────────
+
+    def breaker_state(self, source: str):
+        """{state, failures, opened_at, cooldown, reason} for `source`, or None if never recorded."""
+        row = self._db.execute(
+            "SELECT state, failures, opened_at, cooldown, reason FROM breakers WHERE source = ?", (source,)
+        ).fetchone()
+        return dict(zip(("state", "failures", "opened_at", "cooldown", "reason"), row)) if row else None
+
+    def set_breaker_state(self, source: str, state: str, failures: int, opened_at, cooldown: float, reason: str):
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO breakers (source, state, failures, opened_at, cooldown, reason) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (source, state, failures, opened_at, cooldown, reason),
+            )
+
+    # ── Published crawls ─────────────────────────────────────────────────────
+    # Written by a crawler.py process, read by a bot running with
+    # CRAWLER_MODE=worker (see jobfeed.py).
+
+    def publish(self, jobs: list[Job], stats: dict, keep: int = PUBLISHED_KEEP) -> int:
+        """Store a finished crawl's result as the newest; only the last `keep` are kept."""
+        with self._db:
+            cursor = self._db.execute(
+                "INSERT INTO published (crawled_at, jobs, stats) VALUES (?, ?, ?)",
+                (time.time(), json.dumps([job.to_dict() for job in jobs]), json.dumps(stats, default=str)),
+            )
+            self._db.execute("DELETE FROM published WHERE id <= ?", (cursor.lastrowid - keep,))
+        return cursor.lastrowid
+
+    def latest_published(self):
+        """(id, crawled_at) of the newest published crawl, or None; cheap enough to poll."""
+        return self._db.execute("SELECT id, crawled_at FROM published ORDER BY id DESC LIMIT 1").fetchone()
+
+    def published(self, publish_id: int):
+        """(crawled_at, jobs, stats) of a published crawl, or None if it has been pruned."""
+        row = self._db.execute(
+            "SELECT crawled_at, jobs, stats FROM published WHERE id = ?", (publish_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return row[0], [Job.from_dict(data) for data in json.loads(row[1])], json.loads(row[2])
+
+    # ── Delivery watermarks ──────────────────────────────────────────────────
+
+    def watermarks(self, chat_ids: list[str]) -> dict:
+        """chat_id -> delivered_until; chats never delivered to are absent."""
+        marks = {}
+        chat_ids = list(chat_ids)
+        for i in range(0, len(chat_ids), 500):
+            chunk = chat_ids[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            marks.update(self._db.execute(
+                f"SELECT chat_id, delivered_until FROM watermarks WHERE chat_id IN ({placeholders})", chunk
+            ).fetchall())
+        return marks
+
+    def set_watermarks(self, chat_ids, delivered_until: float):
+        with self._db:
+            self._db.executemany(
+                "INSERT INTO watermarks (chat_id, delivered_until) VALUES (?, ?) "
+                "ON CONFLICT(chat_id) DO UPDATE SET delivered_until = excluded.delivered_until",
+                ((str(chat_id), delivered_until) for chat_id in chat_ids),
+            )
@@ -0,0 +1,319 @@
+import re
+from functools import lru_cache
+
+# All keyword tables used to filter, score and annotate job titles live here,
+# so one matcher can be compiled from them. Matching is on whole words:
+# "coo" does not match "coordinator" and "atm" does not match "treatment".
+# Simple plurals are folded, so "airline" matches "Singapore Airlines".
+
+# Titles that suggest too much seniority — used to filter out irrelevant roles
+SENIOR_TITLE_KEYWORDS = [
+    "senior", "sr.", "lead", "head of", "director", "vp ", "vice president",
+    "chief", "principal", "general manager", "gm ", "c-suite", "coo", "ceo",
+    "cto", "cfo", "svp", "evp", "partner", "managing director"
+]
+
+# Titles that look relevant on the aviation career portals
+RELEVANT_KEYWORDS = [
+    "manager", "analyst", "operations", "aviation", "airport", "airline",
+    "project", "data", "planning", "coordinator", "executive", "officer",
+    "logistics", "transport", "fleet", "ground", "cargo", "safety", "compliance",
+    "strategy", "business", "commercial", "network", "revenue", "finance",
+    "flight", "ramp", "baggage", "air traffic", "customer service",
+    "handler", "agent", "attendant", "trainee", "graduate", "associate",
+    "air transport", "airside", "landside", "passenger", "terminal",
+    # New
+    "admin", "administrative", "check-in", "check in", "ticketing",
+    "counter", "guest service", "passenger service", "front desk",
+    "junior", "entry level", "fresh graduate",
+]
+
+# Title keywords that raise a job's relevance score (see scraper.score_job)
+HIGH_VALUE_KEYWORDS = [
+    "aviation", "airline", "airport", "air transport", "flight operations",
+    "ground operations", "ground handling", "ramp", "baggage",
+    "air traffic", "airside", "cargo", "atm", "caas", "changi", "iata",
+    "airport operations", "passenger services", "customer service aviation",
+    "passenger service", "check-in", "check in", "ticketing",
+    "guest service", "airport counter",
+]
+MEDIUM_VALUE_KEYWORDS = [
+    "project coordinator", "data analyst", "data analysis",
+    "operations analyst", "business analyst", "operations executive",
+    "planning", "logistics", "supply chain", "customer service",
+    "operations", "transport", "terminal",
+    "admin", "administrative", "admin assistant", "admin executive",
+    "junior business analyst", "front desk", "counter staff",
+]
+ENTRY_LEVEL_BONUS_KEYWORDS = [
+    "junior", "associate", "graduate", "trainee", "officer",
+    "executive", "coordinator", "assistant", "entry"
+]
+
+# Job categories subscribers can filter their digests by (/filter categories ...)
+JOB_CATEGORIES = {
+    "aviation": [
+        "aviation", "airline", "airport", "air transport", "flight", "ground operations",
+        "ground handling", "ramp", "baggage", "air traffic", "airside", "cargo", "aircraft",
+    ],
+    "counter": [
+        "check-in", "check in", "ticketing", "counter", "passenger service", "guest service",
+        "customer service", "front desk", "service agent", "service officer",
+    ],
+    "admin": [
+        "admin", "administrative", "administrator", "office", "clerk", "secretary",
+    ],
+    "analyst": [
+        "analyst", "data", "analytics", "business analysis", "reporting",
+    ],
+    "project": [
+        "project", "coordinator", "planning", "planner", "programme",
+    ],
+    "operations": [
+        "operations", "logistics", "supply chain", "transport", "terminal",
+    ],
+}
+
+# Skills from an Air Transport Management degree that are useful per job type
+ATM_SKILLS_MAP = {
+    "aviation": [
+        "Air Transport Economics", "Aviation Safety & Security", "Airport Planning & Management",
+        "Airline Strategy", "ICAO/IATA Regulations"
+    ],
+    "airport": [
+        "Airport Operations", "Airport Planning & Management", "Passenger Experience",
+        "Ground Handling", "Security Compliance"
+    ],
+    "airline": [
+        "Airline Strategy", "Revenue Management", "Network Planning",
+        "Airline Economics", "Fleet Planning"
+    ],
+    "flight": [
+        "Flight Operations Principles", "ICAO/IATA Standards", "Airspace Management",
+        "Operational Scheduling", "Aviation Safety & Security"
+    ],
+    "ground": [
+        "Ground Handling Operations", "Turnaround Coordination", "Airport Safety Procedures",
+        "Resource Allocation", "Service Level Management"
+    ],
+    "ramp": [
+        "Ramp Operations", "Turnaround Coordination", "Ground Handling",
+        "Aviation Safety Procedures", "Aircraft Servicing Protocols"
+    ],
+    "baggage": [
+        "Baggage Handling Systems", "Airport Operations", "Ground Handling",
+        "Service Recovery", "Passenger Experience"
+    ],
+    "air traffic": [
+        "Airspace Management", "Air Traffic Flow", "ICAO Procedures",
+        "Aviation Safety & Security", "Air Transport Economics"
+    ],
+    "customer service": [
+        "Passenger Experience Management", "Service Excellence", "Complaint Handling",
+        "Airport Operations", "Cross-Cultural Communication"
+    ],
+    "passenger": [
+        "Passenger Experience Management", "Airport Terminal Operations",
+        "Service Delivery", "Check-in & Boarding Procedures", "Customer Relations"
+    ],
+    "project": [
+        "Project Management", "Stakeholder Management", "Operations Research",
+        "Strategic Planning", "Risk Management"
+    ],
+    "data": [
+        "Data Analysis", "Aviation Statistics", "Demand Forecasting",
+        "Traffic Flow Analysis", "Operations Research"
+    ],
+    "business analyst": [
+        "Business Analysis", "Process Mapping", "Data Analysis",
+        "Stakeholder Management", "Report Writing"
+    ],
+    "operations": [
+        "Operations Management", "Process Optimisation", "Resource Planning",
+        "Service Delivery", "KPI Monitoring"
+    ],
+    "logistics": [
+        "Supply Chain Fundamentals", "Cargo Operations", "Air Freight Management",
+        "Transport Economics", "Logistics Planning"
+    ],
+    "cargo": [
+        "Air Cargo Management", "Freight Operations", "Dangerous Goods Regulations",
+        "Cargo Revenue Management", "IATA Cargo Standards"
+    ],
+    "safety": [
+        "Aviation Safety Management Systems (SMS)", "Risk Assessment",
+        "ICAO Safety Standards", "Safety Auditing", "Incident Investigation"
+    ],
+    "analyst": [
+        "Data Analysis", "Market Research", "Business Intelligence",
+        "Statistical Analysis", "Report Writing"
+    ],
+    "manager": [
+        "Leadership & Team Management", "Strategic Planning", "Budget Management",
+        "Stakeholder Engagement", "Change Management"
+    ],
+    "coordinator": [
+        "Coordination & Scheduling", "Stakeholder Communication", "Project Support",
+        "Operations Planning", "Documentation & Reporting"
+    ],
+    "admin": [
+        "Administrative Support", "Documentation & Records Management",
+        "Scheduling & Coordination", "Office Operations", "Report Writing"
+    ],
+    "administrative": [
+        "Administrative Support", "Documentation & Records Management",
+        "Scheduling & Coordination", "Office Operations", "Report Writing"
+    ],
+    "check-in": [
+        "Passenger Experience Management", "Check-in & Boarding Procedures",
+        "Airport Customer Service", "IATA Ticketing Standards", "Baggage Handling"
+    ],
+    "check in": [
+        "Passenger Experience Management", "Check-in & Boarding Procedures",
+        "Airport Customer Service", "IATA Ticketing Standards", "Baggage Handling"
+    ],
+    "ticketing": [
+        "IATA Ticketing & Fares", "Airline Reservation Systems",
+        "Passenger Experience", "Revenue Management Basics", "Customer Service"
+    ],
+    "counter": [
+        "Airport Terminal Operations", "Passenger Experience Management",
+        "Check-in & Boarding Procedures", "Customer Relations", "Service Recovery"
+    ],
+    "guest service": [
+        "Passenger Experience Management", "Service Excellence",
+        "Airport Terminal Operations", "Complaint Handling", "Cross-Cultural Communication"
+    ],
+    "business analyst": [
+        "Business Analysis", "Process Mapping & Improvement", "Data Analysis",
+        "Stakeholder Management", "Aviation Market Research"
+    ],
+    "junior business": [
+        "Business Analysis", "Process Mapping & Improvement", "Data Analysis",
+        "Stakeholder Management", "Report Writing"
+    ],
+}
+
+
+# ─── Keyword Engine ──────────────────────────────────────────────────────────
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def _singular(word: str) -> str:
+    """Fold a simple plural: "airlines" -> "airline", "agencies" -> "agency"; "business", "analysis" are kept."""
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 3 and word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+
+def title_words(text: str) -> tuple[str, ...]:
+    """Lowercase alphanumeric words of `text` with plurals folded; keywords and titles both go through this."""
+    return tuple(_singular(word) for word in _TOKEN_RE.findall(text.lower()))
+
+
+def _spellings(word: str) -> set[str]:
+    """Every title word that _singular folds to `word` ("airline" -> airline, airlines)."""
+    spellings = {word}
+    for plural in (word + "s", word[:-1] + "ies" if word.endswith("y") else ""):
+        if plural and _singular(plural) == word:
+            spellings.add(plural)
+    return spellings
+
+
+class KeywordEngine:
+    """
+    Word-boundary-aware matcher compiled once from {category: [keywords]}.
+
+    Keywords and titles are both reduced to lowercase alphanumeric words
+    with plurals folded ("check-in" and "check in" become the same phrase,
+    "analysts" matches "analyst"). The keywords are compiled into a trie
+    over words, with each keyword word entered under every spelling that
+    folds to it, so titles are matched on their raw words without folding
+    them. Labelling a title is one pass over its words: a word that starts
+    no keyword costs one dict lookup, and one that does is followed down the
+    trie only as far as the title's next words match, whatever the number
+    of keywords. title_labels() memoises the result per distinct title on
+    top of this.
+    """
+
+    def __init__(self, tables: dict[str, list[str]]):
+        # node: [categories ending here (or None), the folded phrase, {word: child node}]
+        self._root: dict[str, list] = {}
+        for category, keywords in tables.items():
+            for keyword in keywords:
+                words = title_words(keyword)
+                if not words:
+                    continue
+                level = [self._root]
+                for word in words:
+                    nodes = [
+                        children.setdefault(spelling, [None, None, {}])
+                        for children in level
+                        for spelling in _spellings(word)
+                    ]
+                    level = [node[2] for node in nodes]
+                for node in nodes:
+                    node[1] = " ".join(words)
+                    if node[0] is None:
+                        node[0] = []
+                    if category not in node[0]:
+                        node[0].append(category)
+
+    def labels(self, text: str) -> dict[str, set[str]]:
+        """Return {category: {matched phrases}} for every category `text` hits."""
+        words = _TOKEN_RE.findall(text.lower())
+        found: dict[str, set[str]] = {}
+        root, count = self._root, len(words)
+        for i, word in enumerate(words):
+            node = root.get(word)
+            j = i
+            while node is not None:
+                if node[0]:
+                    for category in node[0]:
+                        phrases = found.get(category)
+                        if phrases is None:
+                            found[category] = {node[1]}
+                        else:
+                            phrases.add(node[1])
+                j += 1
+                if j == count:
+                    break
+                node = node[2].get(words[j])
+        return found
+
+
+SENIOR = "senior"
+RELEVANT = "relevant"
+HIGH_VALUE = "high_value"
+MEDIUM_VALUE = "medium_value"
+ENTRY_LEVEL_BONUS = "entry_level_bonus"
+SKILL_PREFIX = "skill:"
+CATEGORY_PREFIX = "category:"
+
+keyword_engine = KeywordEngine({
+    SENIOR: SENIOR_TITLE_KEYWORDS,
+    RELEVANT: RELEVANT_KEYWORDS,
+    HIGH_VALUE: HIGH_VALUE_KEYWORDS,
+    MEDIUM_VALUE: MEDIUM_VALUE_KEYWORDS,
+    ENTRY_LEVEL_BONUS: ENTRY_LEVEL_BONUS_KEYWORDS,
+    **{SKILL_PREFIX + keyword: [keyword] for keyword in ATM_SKILLS_MAP},
+    **{CATEGORY_PREFIX + name: keywords for name, keywords in JOB_CATEGORIES.items()},
+})
+
+
+def job_categories(title: str) -> list[str]:
+    """Names of the JOB_CATEGORIES `title` falls into."""
+    labels = title_labels(title)
+    return [name for name in JOB_CATEGORIES if CATEGORY_PREFIX + name in labels]
+
+
+@lru_cache(maxsize=8192)
+def title_labels(title: str) -> dict[str, frozenset[str]]:
+    """
+    Categories matched by `title`, computed once per distinct title.
+    The same titles come back every crawl, so results are memoised.
+    """
+    return {c: frozenset(p) for c, p in keyword_engine.labels(title).items()}
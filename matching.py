@@ -0,0 +1,89 @@
+from collections import deque
+
+
+# ─── Aho-Corasick Multi-Pattern Matcher ──────────────────────────────────────
+
+class AhoCorasick:
+    """
+    Match many phrases against a text in one left-to-right pass.
+
+    Patterns are matched case-sensitively as given, so callers lowercase both
+    the patterns and the text. A `Scanner` keeps the automaton state between
+    chunks, which means a phrase split across two chunks is still found.
+    """
+
+    def __init__(self, patterns: list[str]):
+        self.patterns = list(patterns)
+        self._goto: list[dict] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[list[int]] = [[]]  # state -> indexes of patterns ending here
+
+        for idx, pattern in enumerate(self.patterns):
+            state = 0
+            for ch in pattern:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                    self._goto[state][ch] = nxt
+                state = nxt
+            self._out[state].append(idx)
+
+        # Breadth-first pass to fill in failure links and merge outputs, then
+        # flatten goto + failure into one transition table so each character
+        # costs a single dict lookup (characters outside every pattern -> root).
+        self._delta: list[dict] = [None] * len(self._goto)
+        self._delta[0] = dict(self._goto[0])
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            delta = dict(self._delta[self._fail[state]])
+            delta.update(self._goto[state])
+            self._delta[state] = delta
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def iter_matches(self, text: str, state: int = 0):
+        """Yield (end_index, pattern_index) for every match in `text`."""
+        delta, out = self._delta, self._out
+        for i, ch in enumerate(text):
+            state = delta[state].get(ch, 0)
+            for idx in out[state]:
+                yield i, idx
+
+    def search(self, text: str):
+        """Return the first pattern found in `text`, or None."""
+        for _, idx in self.iter_matches(text):
+            return self.patterns[idx]
+        return None
+
+    def scanner(self) -> "Scanner":
+        return Scanner(self)
+
+
+class Scanner:
+    """Streaming search over consecutive chunks of one document."""
+
+    def __init__(self, automaton: AhoCorasick):
+        self._automaton = automaton
+        self._state = 0
+
+    def feed(self, chunk: str):
+        """Consume `chunk` and return the first pattern completed in it, or None."""
+        automaton = self._automaton
+        delta, out = automaton._delta, automaton._out
+        state = self._state
+        for ch in chunk:
+            state = delta[state].get(ch, 0)
+            if out[state]:
+                self._state = state
+                return automaton.patterns[out[state][0]]
+        self._state = state
+        return None
@@ -0,0 +1,267 @@
+import os
+import math
+import logging
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+# Port for the /metrics (Prometheus text) and /metrics.json endpoints; unset = not served
+METRICS_PORT = os.environ.get("METRICS_PORT", "")
+METRICS_LISTEN = os.environ.get("METRICS_LISTEN", "0.0.0.0")
+
+_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 15)
+_PARSE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1)
+_STAGE_BUCKETS = (0.01, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+
+# ─── Metric Types ────────────────────────────────────────────────────────────
+# A minimal in-process take on the Prometheus data model: every metric keeps
+# one value (or bucket set) per combination of label values.
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: tuple = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        """Sum over every series matching the given label values."""
+        return sum(v for key, v in self._values.items() if _matches(self.labels, key, labels))
+
+    def series(self) -> dict[tuple, float]:
+        return dict(self._values)
+
+    def _prometheus(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for key, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_label_text(self.labels, key)} {_number(value)}")
+        return lines
+
+    def _snapshot(self):
+        return [{"labels": dict(zip(self.labels, key)), "value": value} for key, value in sorted(self._values.items())]
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labels: tuple = (), buckets: tuple = _LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = tuple(buckets)
+        self._series: dict[tuple, list] = {}  # key -> [bucket counts..., +Inf count, sum]
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labels)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = [0] * (len(self.buckets) + 1) + [0.0]
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[i] += 1
+                break
+        else:
+            series[len(self.buckets)] += 1
+        series[-1] += value
+
+    def count(self, **labels) -> int:
+        return sum(sum(s[:-1]) for key, s in self._series.items() if _matches(self.labels, key, labels))
+
+    def total(self, **labels) -> float:
+        return sum(s[-1] for key, s in self._series.items() if _matches(self.labels, key, labels))
+
+    def quantile(self, q: float, **labels) -> float:
+        """Upper bound of the bucket holding the q-quantile (inf past the last bucket)."""
+        counts = [0] * (len(self.buckets) + 1)
+        for key, series in self._series.items():
+            if _matches(self.labels, key, labels):
+                for i in range(len(counts)):
+                    counts[i] += series[i]
+        total = sum(counts)
+        if not total:
+            return 0.0
+        running = 0
+        for i, n in enumerate(counts):
+            running += n
+            if running >= q * total:
+                return self.buckets[i] if i < len(self.buckets) else math.inf
+        return math.inf
+
+    def _prometheus(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, series in sorted(self._series.items()):
+            cumulative = 0
+            for bound, n in zip((*self.buckets, "+Inf"), series[:-1]):
+                cumulative += n
+                le = bound if bound == "+Inf" else _number(bound)
+                lines.append(f"{self.name}_bucket{_label_text(self.labels + ('le',), key + (le,))} {cumulative}")
+            lines.append(f"{self.name}_sum{_label_text(self.labels, key)} {_number(series[-1])}")
+            lines.append(f"{self.name}_count{_label_text(self.labels, key)} {cumulative}")
+        return lines
+
+    def _snapshot(self):
+        return [
+            {"labels": dict(zip(self.labels, key)), "count": sum(s[:-1]), "sum": s[-1],
+             "buckets": dict(zip((*map(str, self.buckets), "+Inf"), s[:-1]))}
+            for key, s in sorted(self._series.items())
+        ]
+
+
+def _matches(names: tuple, key: tuple, wanted: dict) -> bool:
+    return all(key[names.index(k)] == str(v) for k, v in wanted.items())
+
+
+def _label_text(names: tuple, values: tuple) -> str:
+    if not names:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for v in values)
+    return "{" + ",".join(f'{n}="{v}"' for n, v in zip(names, escaped)) + "}"
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+# ─── Registry ────────────────────────────────────────────────────────────────
+
+_REGISTRY: list = []
+
+
+def _register(metric):
+    _REGISTRY.append(metric)
+    return metric
+
+
+# Crawl requests, per host (each job source is its own host)
+HTTP_REQUESTS = _register(Counter(
+    "jobbot_http_requests_total", "HTTP requests by host and status code (or error)", ("host", "status")))
+HTTP_LATENCY = _register(Histogram(
+    "jobbot_http_request_seconds", "Time to response headers by host", ("host",), _LATENCY_BUCKETS))
+HTTP_BYTES = _register(Counter(
+    "jobbot_http_response_bytes_total", "Response body bytes read by host", ("host",)))
+
+# Crawl pipeline
+PARSE_SECONDS = _register(Histogram(
+    "jobbot_parse_seconds", "Time to parse one page by source", ("source",), _PARSE_BUCKETS))
+JOBS_FETCHED = _register(Counter(
+    "jobbot_jobs_fetched_total", "Jobs yielded by each source before deduplication", ("source",)))
+JOBS_DROPPED = _register(Counter(
+    "jobbot_jobs_dropped_total", "Jobs dropped by reason (senior, experience, duplicate, invalid_link)",
+    ("reason",)))
+LINK_CHECKS = _register(Counter(
+    "jobbot_link_checks_total", "Job link verdicts by where they came from (network, cache) and result",
+    ("origin", "result")))
+CRAWL_STAGE_SECONDS = _register(Histogram(
+    "jobbot_crawl_stage_seconds",
+    "Duration of each crawl stage (fetch, dedup, score, validate, first_page, total)",
+    ("stage",), _STAGE_BUCKETS))
+
+# Per-source circuit breakers (breaker.py)
+BREAKER_OPENED = _register(Counter(
+    "jobbot_breaker_opened_total", "Times a source's circuit breaker opened, by reason", ("source", "reason")))
+BREAKER_SKIPPED = _register(Counter(
+    "jobbot_breaker_skipped_total", "Requests skipped because the source's breaker was open", ("source",)))
+
+# Delivery
+LATEST_FIRST_MESSAGE_SECONDS = _register(Histogram(
+    "jobbot_latest_first_message_seconds", "Time from a /latest command to the first jobs message sent",
+    (), _STAGE_BUCKETS))
+BROADCAST_CHATS = _register(Counter(
+    "jobbot_broadcast_chats_total", "Chats finished per push by outcome (delivered, failed, deferred)", ("outcome",)))
+BROADCAST_MESSAGES = _register(Counter(
+    "jobbot_broadcast_messages_total", "Messages delivered to subscribers"))
+BROADCAST_THROTTLED = _register(Counter(
+    "jobbot_broadcast_throttled_total", "429 RetryAfter responses from Telegram during pushes"))
+
+
+def render_prometheus() -> str:
+    lines = []
+    for metric in _REGISTRY:
+        lines.extend(metric._prometheus())
+    return "\n".join(lines) + "\n"
+
+
+def snapshot() -> dict:
+    return {metric.name: metric._snapshot() for metric in _REGISTRY}
+
+
+def summary() -> str:
+    """Plain-text digest of the counters for the admin /metrics command."""
+    lines = ["HTTP by host (requests, p50/p95 to headers, bytes):"]
+    hosts = sorted({key[0] for key in HTTP_REQUESTS.series()})
+    for host in hosts:
+        statuses = sorted(
+            (key[1], int(n)) for key, n in HTTP_REQUESTS.series().items() if key[0] == host
+        )
+        status_text = " ".join(f"{status}×{n}" for status, n in statuses)
+        lines.append(
+            f"  {host}: {int(HTTP_REQUESTS.value(host=host))} ({status_text}), "
+            f"{_seconds(HTTP_LATENCY.quantile(0.5, host=host))}/{_seconds(HTTP_LATENCY.quantile(0.95, host=host))}, "
+            f"{HTTP_BYTES.value(host=host) / 1024:.0f} KiB"
+        )
+    if not hosts:
+        lines.append("  no requests yet")
+
+    lines.append("Parse time by source (pages, total, p95):")
+    for (source,) in sorted(PARSE_SECONDS._series):
+        lines.append(
+            f"  {source}: {PARSE_SECONDS.count(source=source)}, {PARSE_SECONDS.total(source=source):.2f}s, "
+            f"{_seconds(PARSE_SECONDS.quantile(0.95, source=source))}"
+        )
+
+    fetched = " ".join(f"{key[0]} {int(n)}" for key, n in sorted(JOBS_FETCHED.series().items()))
+    dropped = " ".join(f"{key[0]} {int(n)}" for key, n in sorted(JOBS_DROPPED.series().items()))
+    checks = " ".join(f"{key[0]}/{key[1]} {int(n)}" for key, n in sorted(LINK_CHECKS.series().items()))
+    lines.append(f"Jobs fetched: {fetched or 'none'}")
+    lines.append(f"Jobs dropped: {dropped or 'none'}")
+    lines.append(f"Link checks: {checks or 'none'}")
+    opened = " ".join(f"{key[0]} ({key[1]}) {int(n)}" for key, n in sorted(BREAKER_OPENED.series().items()))
+    skipped = " ".join(f"{key[0]} {int(n)}" for key, n in sorted(BREAKER_SKIPPED.series().items()))
+    lines.append(f"Breakers opened: {opened or 'none'}; requests skipped: {skipped or 'none'}")
+    lines.append(
+        f"Crawls: {CRAWL_STAGE_SECONDS.count(stage='total')}, "
+        f"p50 {_seconds(CRAWL_STAGE_SECONDS.quantile(0.5, stage='total'))}"
+    )
+    lines.append(
+        f"/latest first message: {LATEST_FIRST_MESSAGE_SECONDS.count()}, "
+        f"p50 {_seconds(LATEST_FIRST_MESSAGE_SECONDS.quantile(0.5))}, "
+        f"p95 {_seconds(LATEST_FIRST_MESSAGE_SECONDS.quantile(0.95))}"
+    )
+    lines.append(
+        f"Broadcasts: {int(BROADCAST_CHATS.value(outcome='delivered'))} chats delivered, "
+        f"{int(BROADCAST_CHATS.value(outcome='failed'))} failed, "
+        f"{int(BROADCAST_CHATS.value(outcome='deferred'))} deferred, "
+        f"{int(BROADCAST_MESSAGES.value())} messages, {int(BROADCAST_THROTTLED.value())} throttled"
+    )
+    return "\n".join(lines)
+
+
+def _seconds(value: float) -> str:
+    if math.isinf(value):
+        return "inf"
+    return f"{value * 1000:.0f}ms" if value < 1 else f"{value:g}s"
+
+
+# ─── Endpoint ────────────────────────────────────────────────────────────────
+
+async def start_server(port: int = None, listen: str = METRICS_LISTEN) -> web.AppRunner:
+    """Serve /metrics and /metrics.json; returns the runner to clean up."""
+
+    async def prometheus(request):
+        return web.Response(text=render_prometheus(), content_type="text/plain", charset="utf-8")
+
+    async def json_snapshot(request):
+        return web.json_response(snapshot())
+
+    app = web.Application()
+    app.router.add_get("/metrics", prometheus)
+    app.router.add_get("/metrics.json", json_snapshot)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    port = int(METRICS_PORT) if port is None else port
+    await web.TCPSite(runner, listen, port).start()
+    logger.info(f"Metrics served on {listen}:{port}/metrics")
+    return runner
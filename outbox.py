@@ -0,0 +1,187 @@
+import os
+import json
+import time
+import asyncio
+import sqlite3
+import logging
+from telegram import Bot
+from broadcast import Delivery, broadcast
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_DB = os.environ.get("OUTBOX_DB", "outbox.db")
+OUTBOX_BATCH_SIZE = int(os.environ.get("OUTBOX_BATCH_SIZE", "500"))
+OUTBOX_RETENTION = 7 * 24 * 3600  # finished broadcasts are kept this long
+# Seconds before deliveries deferred by flood control are tried again
+OUTBOX_RETRY_DELAY = float(os.environ.get("OUTBOX_RETRY_DELAY", "60"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS broadcasts (
+    id          INTEGER PRIMARY KEY,
+    label       TEXT NOT NULL,
+    created_at  REAL NOT NULL,
+    finished_at REAL
+);
+CREATE TABLE IF NOT EXISTS digests (
+    id           INTEGER PRIMARY KEY,
+    broadcast_id INTEGER NOT NULL,
+    messages     TEXT NOT NULL          -- JSON list of rendered messages
+);
+CREATE TABLE IF NOT EXISTS deliveries (
+    broadcast_id INTEGER NOT NULL,
+    chat_id      TEXT NOT NULL,
+    digest_id    INTEGER NOT NULL,
+    next_index   INTEGER NOT NULL DEFAULT 0,  -- first message not yet sent
+    status       TEXT NOT NULL DEFAULT 'pending',  -- pending | done | failed
+    PRIMARY KEY (broadcast_id, chat_id)
+);
+CREATE INDEX IF NOT EXISTS deliveries_pending ON deliveries (broadcast_id, status);
+"""
+
+
+class Outbox:
+    """
+    Durable queue of rendered digests and per-subscriber delivery progress.
+
+    A push is written here in full before the first message goes out, and
+    progress is recorded after every message, so a worker started after a
+    crash or redeploy resumes each chat exactly where it stopped.
+    """
+
+    def __init__(self, path: str = OUTBOX_DB):
+        self.path = path
+        self._db = sqlite3.connect(path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._wake = asyncio.Event()
+
+    # ── Writing ──────────────────────────────────────────────────────────────
+
+    def enqueue(self, label: str, digests) -> int:
+        """
+        Store one push atomically and return its id.
+        `digests` is an iterable of (messages, chat_ids): every chat in
+        chat_ids receives that list of messages.
+        """
+        with self._db:
+            cur = self._db.execute(
+                "INSERT INTO broadcasts (label, created_at) VALUES (?, ?)", (label, time.time())
+            )
+            broadcast_id = cur.lastrowid
+            for messages, chat_ids in digests:
+                digest_id = self._db.execute(
+                    "INSERT INTO digests (broadcast_id, messages) VALUES (?, ?)",
+                    (broadcast_id, json.dumps(messages)),
+                ).lastrowid
+                self._db.executemany(
+                    "INSERT OR IGNORE INTO deliveries (broadcast_id, chat_id, digest_id) VALUES (?, ?, ?)",
+                    ((broadcast_id, str(chat_id), digest_id) for chat_id in chat_ids),
+                )
+        self._wake.set()
+        return broadcast_id
+
+    def mark_sent(self, broadcast_id: int, chat_id: str, index: int):
+        with self._db:
+            self._db.execute(
+                "UPDATE deliveries SET next_index = ? WHERE broadcast_id = ? AND chat_id = ?",
+                (index + 1, broadcast_id, chat_id),
+            )
+
+    def mark_done(self, broadcast_id: int, chat_id: str, ok: bool):
+        with self._db:
+            self._db.execute(
+                "UPDATE deliveries SET status = ? WHERE broadcast_id = ? AND chat_id = ?",
+                ("done" if ok else "failed", broadcast_id, chat_id),
+            )
+
+    # ── Reading ──────────────────────────────────────────────────────────────
+
+    def unfinished(self) -> list[tuple[int, str]]:
+        """(id, label) of every push that still has pending deliveries, oldest first."""
+        return self._db.execute(
+            "SELECT id, label FROM broadcasts WHERE finished_at IS NULL ORDER BY id"
+        ).fetchall()
+
+    def pending_count(self, broadcast_id: int) -> int:
+        return self._db.execute(
+            "SELECT COUNT(*) FROM deliveries WHERE broadcast_id = ? AND status = 'pending'",
+            (broadcast_id,),
+        ).fetchone()[0]
+
+    async def pending(self, broadcast_id: int, batch_size: int = OUTBOX_BATCH_SIZE):
+        """Yield the pending Deliveries of one push, reading `batch_size` rows at a time."""
+        digests = {
+            digest_id: json.loads(messages)
+            for digest_id, messages in self._db.execute(
+                "SELECT id, messages FROM digests WHERE broadcast_id = ?", (broadcast_id,)
+            )
+        }
+        last_rowid = 0
+        while True:
+            rows = self._db.execute(
+                "SELECT rowid, chat_id, digest_id, next_index FROM deliveries "
+                "WHERE broadcast_id = ? AND status = 'pending' AND rowid > ? "
+                "ORDER BY rowid LIMIT ?",
+                (broadcast_id, last_rowid, batch_size),
+            ).fetchall()
+            if not rows:
+                return
+            for rowid, chat_id, digest_id, next_index in rows:
+                last_rowid = rowid
+                yield Delivery(chat_id, digests[digest_id], next_index)
+
+    def finish(self, broadcast_id: int):
+        with self._db:
+            self._db.execute(
+                "UPDATE broadcasts SET finished_at = ? WHERE id = ?", (time.time(), broadcast_id)
+            )
+            # Prune pushes that finished long ago so the file stays small
+            old = [row[0] for row in self._db.execute(
+                "SELECT id FROM broadcasts WHERE finished_at < ?", (time.time() - OUTBOX_RETENTION,)
+            )]
+            for old_id in old:
+                self._db.execute("DELETE FROM deliveries WHERE broadcast_id = ?", (old_id,))
+                self._db.execute("DELETE FROM digests WHERE broadcast_id = ?", (old_id,))
+                self._db.execute("DELETE FROM broadcasts WHERE id = ?", (old_id,))
+
+    # ── Worker ───────────────────────────────────────────────────────────────
+
+    async def drain(self, bot: Bot) -> bool:
+        """Deliver every unfinished push, oldest first; True if deliveries were deferred and remain."""
+        deferred = False
+        for broadcast_id, label in self.unfinished():
+            pending = self.pending_count(broadcast_id)
+            if pending:
+                logger.info(f"[{label}] Delivering to {pending} pending subscriber(s)...")
+                report = await broadcast(
+                    bot,
+                    self.pending(broadcast_id),
+                    on_sent=lambda chat_id, index, b=broadcast_id: self.mark_sent(b, chat_id, index),
+                    on_done=lambda chat_id, ok, b=broadcast_id: self.mark_done(b, chat_id, ok),
+                )
+                logger.info(f"[{label}] Broadcast finished: {report.summary()}")
+                if report.deferred:
+                    deferred = True
+                    continue  # still pending; finished once the deferred chats are through
+            self.finish(broadcast_id)
+        return deferred
+
+    async def run(self, bot: Bot):
+        """Long-lived worker: resume anything left over, then drain each new push."""
+        while True:
+            self._wake.clear()
+            try:
+                deferred = await self.drain(bot)
+            except Exception as e:
+                logger.error(f"Outbox worker error: {e}")
+                await asyncio.sleep(30)
+                continue
+            if not deferred:
+                await self._wake.wait()
+                continue
+            # Chats held back by flood control: retry after a pause, or sooner if a push arrives
+            try:
+                await asyncio.wait_for(self._wake.wait(), OUTBOX_RETRY_DELAY)
+            except asyncio.TimeoutError:
+                pass
@@ -0,0 +1,117 @@
+import os
+import time
+import asyncio
+import logging
+from collections import defaultdict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from bs4 import BeautifulSoup, SoupStrainer
+from metrics import PARSE_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# HTML is parsed off the event loop so Telegram updates and other requests
+# keep flowing during a crawl. "thread" is cheap to start; "process" sidesteps
+# the GIL entirely at the cost of pickling the page text.
+PARSER_POOL = os.environ.get("PARSER_POOL", "thread")
+PARSER_WORKERS = int(os.environ.get("PARSER_WORKERS", "2"))
+
+# Only the job-card subtrees are ever built into a tree
+_INDEED_CARDS = SoupStrainer("div", class_="job_seen_beacon")
+_LINKEDIN_CARDS = SoupStrainer("div", class_="base-card")
+_LINKS = SoupStrainer("a", href=True)
+
+
+# ─── Parsers ─────────────────────────────────────────────────────────────────
+# Plain module-level functions taking page text and returning plain dicts, so
+# they can run in a thread or be pickled into a worker process.
+
+def parse_indeed(html: str, limit: int = 5) -> list[dict]:
+    soup = BeautifulSoup(html, "lxml", parse_only=_INDEED_CARDS)
+    cards = []
+    for card in soup.select("div.job_seen_beacon")[:limit]:
+        title_el = card.select_one("h2.jobTitle span")
+        company_el = card.select_one("[data-testid='company-name']")
+        location_el = card.select_one("[data-testid='text-location']")
+        link_el = card.select_one("h2.jobTitle a")
+        if title_el and link_el:
+            cards.append({
+                "title": title_el.get_text(strip=True),
+                "company": company_el.get_text(strip=True) if company_el else "",
+                "location": location_el.get_text(strip=True) if location_el else "",
+                "job_id": link_el.get("data-jk", ""),
+                "href": link_el.get("href", ""),
+            })
+    return cards
+
+
+def parse_linkedin(html: str, limit: int = 5) -> list[dict]:
+    soup = BeautifulSoup(html, "lxml", parse_only=_LINKEDIN_CARDS)
+    cards = []
+    for card in soup.select("div.base-card")[:limit]:
+        title_el = card.select_one("h3.base-search-card__title")
+        company_el = card.select_one("h4.base-search-card__subtitle")
+        location_el = card.select_one("span.job-search-card__location")
+        link_el = card.select_one("a.base-card__full-link")
+        if title_el:
+            cards.append({
+                "title": title_el.get_text(strip=True),
+                "company": company_el.get_text(strip=True) if company_el else "",
+                "location": location_el.get_text(strip=True) if location_el else "",
+                "href": link_el.get("href", "") if link_el else "",
+            })
+    return cards
+
+
+def parse_links(html: str) -> list[tuple[str, str]]:
+    """(text, href) of every anchor with an href, in page order."""
+    soup = BeautifulSoup(html, "lxml", parse_only=_LINKS)
+    return [(a.get_text(strip=True), a.get("href", "")) for a in soup.find_all("a", href=True)]
+
+
+# ─── Executor ────────────────────────────────────────────────────────────────
+
+_executor: Executor = None
+
+# source -> [pages parsed, seconds spent]; reset by take_parse_stats()
+_parse_stats: dict = defaultdict(lambda: [0, 0.0])
+
+
+def _get_executor() -> Executor:
+    global _executor
+    if _executor is None:
+        if PARSER_POOL == "process":
+            _executor = ProcessPoolExecutor(max_workers=PARSER_WORKERS)
+        else:
+            _executor = ThreadPoolExecutor(max_workers=PARSER_WORKERS, thread_name_prefix="parser")
+    return _executor
+
+
+def _timed(parser, html, *args):
+    start = time.perf_counter()
+    result = parser(html, *args)
+    return result, time.perf_counter() - start
+
+
+async def parse(source: str, parser, html: str, *args):
+    """Run `parser(html, *args)` in the parser pool and record its time under `source`."""
+    loop = asyncio.get_running_loop()
+    result, elapsed = await loop.run_in_executor(_get_executor(), _timed, parser, html, *args)
+    stats = _parse_stats[source]
+    stats[0] += 1
+    stats[1] += elapsed
+    PARSE_SECONDS.observe(elapsed, source=source)
+    return result
+
+
+def take_parse_stats() -> dict:
+    """Return {source: (pages, seconds)} accumulated since the last call, and reset."""
+    stats = {source: tuple(v) for source, v in _parse_stats.items()}
+    _parse_stats.clear()
+    return stats
+
+
+def shutdown():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
@@ -0,0 +1,164 @@
+import os
+import re
+import time
+import logging
+from collections import Counter, defaultdict
+from job import Job
+
+logger = logging.getLogger(__name__)
+
+# Share of each source's request budget spent on the least recently run
+# queries (queries never run yet come first), so a query that once yielded
+# nothing still gets retried now and then. The rest goes to the best yielders.
+EXPLORE_SHARE = float(os.environ.get("QUERY_EXPLORE_SHARE", "0.25"))
+
+# Weight of the latest crawl in a query's running yield averages
+YIELD_SMOOTHING = 0.3
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+# Words that do not change what a search returns: every fetcher already
+# restricts results to Singapore and to entry-level postings
+_FILLER = {"entry", "level", "junior", "singapore"}
+
+# Role nouns the job sites treat as interchangeable in titles
+_SYNONYMS = {"agent": "officer", "staff": "officer"}
+
+
+def query_key(query: str) -> frozenset:
+    """Words that decide what `query` matches ("check-in agent" == "check in officer")."""
+    words = (_SYNONYMS.get(w, w) for w in _TOKEN.findall(query.lower()))
+    return frozenset(w for w in words if w not in _FILLER)
+
+
+def merge_queries(queries: list[str]) -> list[str]:
+    """Drop queries that search for the same words as an earlier one; order is kept."""
+    seen = set()
+    merged = []
+    for query in queries:
+        key = query_key(query)
+        if key not in seen:
+            seen.add(key)
+            merged.append(query)
+    return merged
+
+
+def parse_budgets(spec: str) -> dict[str, int]:
+    """Parse "source=requests,source2=..." (e.g. from an env var)."""
+    budgets = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        source, _, requests = item.partition("=")
+        budgets[source.strip()] = int(requests)
+    return budgets
+
+
+# ─── Crawl Plan ──────────────────────────────────────────────────────────────
+
+class CrawlPlan:
+    """The queries picked for one crawl, what is left of each budget, and what each query found."""
+
+    def __init__(self, queries: dict[str, list[str]], budgets: dict[str, int]):
+        self.queries = queries
+        self._remaining = dict(budgets)
+        self.requests: Counter = Counter()          # (source, query) -> requests made
+        self.found: dict = defaultdict(list)        # (source, query) -> jobs returned
+
+    def spend(self, source: str, query: str) -> bool:
+        """Take one request from `source`'s budget; False once it is used up."""
+        if self._remaining.get(source, 0) <= 0:
+            return False
+        self._remaining[source] -= 1
+        self.requests[(source, query)] += 1
+        return True
+
+    def observe(self, source: str, query: str, jobs: list[Job]):
+        self.found[(source, query)].extend(jobs)
+
+
+# ─── Planner ─────────────────────────────────────────────────────────────────
+
+class QueryPlanner:
+    """
+    Picks which catalogue queries each crawl runs, within a per-source
+    request budget, from the yield each query has had so far.
+
+    A query's yield is how many jobs it contributes after deduplication
+    (a job found by n queries counts 1/n towards each) and their average
+    score. Both are kept as running averages in the job store together with
+    the requests the query usually costs (MCF pages deeper on busy keywords).
+    """
+
+    def __init__(self, store, catalogue: dict[str, list[str]], budgets: dict[str, int],
+                 explore_share: float = EXPLORE_SHARE):
+        self.store = store
+        self.catalogue = {source: merge_queries(queries) for source, queries in catalogue.items()}
+        self.budgets = budgets
+        self.explore_share = explore_share
+
+    def plan(self) -> CrawlPlan:
+        chosen, budgets = {}, {}
+        for source, queries in self.catalogue.items():
+            budgets[source] = self.budgets.get(source, len(queries))
+            chosen[source] = self._choose(queries, self.store.query_yields(source), budgets[source])
+        logger.info("Query plan: " + ", ".join(
+            f"{source} {len(chosen[source])}/{len(queries)}" for source, queries in self.catalogue.items()
+        ))
+        return CrawlPlan(chosen, budgets)
+
+    def _choose(self, queries: list[str], yields: dict, budget: int) -> list[str]:
+        def cost(query):
+            return max(1.0, yields[query]["requests"]) if query in yields else 1.0
+
+        def value(query):
+            if query not in yields:
+                return float("inf")  # never run: try it before anything with a known yield
+            y = yields[query]
+            return y["unique_jobs"] / cost(query) * (1 + max(y["avg_score"], 0) / 10)
+
+        chosen, spent = [], 0.0
+
+        def take(candidates, limit):
+            nonlocal spent
+            for query in candidates:
+                if query not in chosen and spent + cost(query) <= limit:
+                    chosen.append(query)
+                    spent += cost(query)
+
+        # Exploration first: never-run queries, then the longest unrun ones
+        stalest = sorted(queries, key=lambda q: yields[q]["last_run"] if q in yields else 0.0)
+        take(stalest, budget * self.explore_share)
+        take(sorted(queries, key=value, reverse=True), budget)
+        # Run in catalogue order so the log and request order stay stable
+        return [q for q in queries if q in chosen]
+
+    def record(self, plan: CrawlPlan, dedup_key, scores: dict):
+        """
+        Fold this crawl's results into each query's yield. `dedup_key` maps a
+        job to its deduplicate() key and `scores` maps that key to the score of
+        the job kept for it.
+        """
+        keys_by_query = {
+            query: {dedup_key(job) for job in jobs} & scores.keys()
+            for query, jobs in plan.found.items()
+        }
+        finders = Counter(key for keys in keys_by_query.values() for key in keys)
+
+        now = time.time()
+        for source in plan.queries:
+            previous = self.store.query_yields(source)
+            rows = []
+            for query in plan.queries[source]:
+                requests = plan.requests[(source, query)]
+                if not requests:
+                    continue  # budget ran out before it started
+                keys = keys_by_query.get((source, query), set())
+                unique = sum(1 / finders[k] for k in keys)
+                avg_score = sum(scores[k] for k in keys) / len(keys) if keys else 0.0
+                old = previous.get(query)
+                if old:
+                    a = YIELD_SMOOTHING
+                    requests = (1 - a) * old["requests"] + a * requests
+                    unique = (1 - a) * old["unique_jobs"] + a * unique
+                    avg_score = (1 - a) * old["avg_score"] + a * avg_score
+                rows.append((query, (old["runs"] if old else 0) + 1, requests, unique, avg_score, now))
+            self.store.record_query_yields(source, rows)
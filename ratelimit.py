@@ -0,0 +1,83 @@
+import asyncio
+import time
+import urllib.parse
+from contextlib import asynccontextmanager
+from typing import NamedTuple
+
+
+class HostLimit(NamedTuple):
+    rate: float        # sustained requests per second
+    burst: int         # requests allowed back-to-back after an idle spell
+    concurrency: int   # requests in flight at once
+
+
+# ─── Token Bucket ────────────────────────────────────────────────────────────
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens/second, holding at most `burst`."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()  # waiters are served in arrival order
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+# ─── Per-Host Limiter ────────────────────────────────────────────────────────
+
+class RateLimiter:
+    """
+    Shared per-host request budget.
+
+    Each host gets its own token bucket (rate + burst) and a semaphore
+    capping requests in flight. Hosts without an explicit entry use `default`.
+    Hosts are keyed by URL netloc, so an explicit port ("127.0.0.1:8080")
+    counts as a separate host.
+    """
+
+    def __init__(self, limits: dict[str, HostLimit], default: HostLimit):
+        self.limits = dict(limits)
+        self.default = default
+        self._buckets: dict[str, TokenBucket] = {}
+        self._slots: dict[str, asyncio.Semaphore] = {}
+
+    def _host_state(self, host: str):
+        if host not in self._buckets:
+            limit = self.limits.get(host, self.default)
+            self._buckets[host] = TokenBucket(limit.rate, limit.burst)
+            self._slots[host] = asyncio.Semaphore(limit.concurrency)
+        return self._buckets[host], self._slots[host]
+
+    @asynccontextmanager
+    async def limit(self, url: str):
+        """Hold a request slot for the host of `url` for the duration of the block."""
+        host = urllib.parse.urlsplit(url).netloc.lower()
+        bucket, slots = self._host_state(host)
+        async with slots:
+            await bucket.acquire()
+            yield
+
+
+def parse_host_limits(spec: str) -> dict[str, HostLimit]:
+    """
+    Parse "host=rate:burst:concurrency,host2=..." (e.g. from an env var).
+    Malformed entries raise ValueError so a bad config fails at startup.
+    """
+    limits = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        host, _, values = item.partition("=")
+        rate, burst, concurrency = values.split(":")
+        limits[host.strip()] = HostLimit(float(rate), int(burst), int(concurrency))
+    return limits
@@ -1,63 +1,115 @@
+import os
+import time
+import codecs
+import heapq
+import math
 import asyncio
+import itertools
 import logging
+import weakref
+import contextlib
 import aiohttp
-from bs4 import BeautifulSoup
 import urllib.parse
+from typing import AsyncIterator
+from breaker import CircuitBreaker
+from cache import LinkCache, ResultCache
+from dedup import DedupIndex
+from job import Job
+from jobstore import JobStore, job_key
+from keywords import ENTRY_LEVEL_BONUS, HIGH_VALUE, MEDIUM_VALUE, RELEVANT, SENIOR, title_labels
+from matching import AhoCorasick
+from parsing import parse, parse_indeed, parse_linkedin, parse_links, take_parse_stats
+from httpclient import HttpClient, request_host, stats_delta
+from metrics import CRAWL_STAGE_SECONDS, HTTP_BYTES, JOBS_DROPPED, JOBS_FETCHED, LINK_CHECKS
+from planner import CrawlPlan, QueryPlanner, parse_budgets
+from ratelimit import HostLimit, RateLimiter, parse_host_limits
 
 logger = logging.getLogger(__name__)
 
-# Keywords relevant to the user's background (entry-level focused)
-SEARCH_QUERIES = [
-    "aviation executive",
-    "airport operations executive",
-    "airline operations executive",
-    "junior data analyst aviation",
-    "air transport associate",
-    "flight operations officer",
-    "ground operations officer",
-    "ground handling officer",
-    "baggage officer",
-    "ramp officer",
-    "ramp agent",
-    "air traffic officer",
-    "project coordinator aviation",
-    "operations analyst entry level",
-    "customer service aviation",
-    "operations executive",
-    "data analyst entry level",
-    "business analyst entry level",
-    "graduate aviation",
-    "graduate trainee operations",
-    # Admin
-    "admin assistant aviation",
-    "administrative executive aviation",
-    "admin executive airport",
-    "office administrator aviation",
-    "operations admin",
-    # Business analyst
-    "business analyst entry level",
-    "junior business analyst",
-    "business analyst aviation",
-    "business analyst operations",
-    # Airport counter / airline customer-facing
-    "check-in agent",
-    "check in officer",
-    "airport counter staff",
-    "passenger service agent",
-    "passenger service officer",
-    "airline customer service officer",
-    "airport service agent",
-    "ticketing officer",
-    "ticketing agent airline",
-    "guest service officer airport",
-]
+# Every search the crawl may run, per source. Searches that only differ by
+# filler words are merged and the planner decides which ones each crawl runs
+# (see planner.py); the source's own filters keep results entry-level.
+QUERY_CATALOGUE = {
+    "MyCareersFuture": [
+        "aviation", "airport", "air transport", "airline",
+        "flight operations", "ground operations", "ground handling",
+        "baggage", "ramp", "air traffic",
+        "airport operations", "customer service aviation",
+        "data analyst", "business analyst",
+        "project coordinator", "operations executive",
+        "graduate trainee",
+        # Admin
+        "admin assistant", "administrative executive", "operations admin",
+        # Business analyst
+        "junior business analyst", "business analyst operations",
+        # Counter / passenger-facing
+        "check-in agent", "passenger service agent", "passenger service officer",
+        "airline customer service", "ticketing officer", "airport counter",
+        "guest service officer",
+    ],
+    "Indeed": [
+        "aviation officer entry level",
+        "airport operations officer",
+        "flight operations officer",
+        "ground operations officer",
+        "ramp agent entry level",
+        "baggage handler officer",
+        "air traffic officer",
+        "junior data analyst aviation",
+        "business analyst entry level",
+        "customer service aviation officer",
+        "operations executive entry level",
+        "project coordinator aviation",
+        "graduate trainee aviation",
+        # Admin
+        "admin assistant aviation",
+        "administrative executive airport",
+        "operations admin officer",
+        # Business analyst
+        "junior business analyst",
+        "business analyst aviation operations",
+        # Counter / passenger-facing
+        "check-in agent airline",
+        "passenger service agent airport",
+        "airline customer service officer",
+        "ticketing officer airline",
+        "guest service officer airport",
+        "airport counter staff",
+    ],
+    "LinkedIn": [
+        "aviation officer entry level Singapore",
+        "airport operations officer Singapore",
+        "flight operations officer Singapore",
+        "ground operations officer Singapore",
+        "ramp agent Singapore",
+        "baggage officer aviation Singapore",
+        "air traffic officer Singapore",
+        "junior data analyst aviation Singapore",
+        "junior business analyst Singapore",
+        "customer service aviation Singapore",
+        "operations executive entry level Singapore",
+        "project coordinator aviation Singapore",
+        "air transport management graduate Singapore",
+        # Admin
+        "admin assistant aviation Singapore",
+        "administrative executive airport Singapore",
+        "operations admin aviation Singapore",
+        # Business analyst
+        "business analyst aviation Singapore",
+        "junior business analyst operations Singapore",
+        # Counter / passenger-facing
+        "check-in agent airline Singapore",
+        "passenger service agent airport Singapore",
+        "airline customer service officer Singapore",
+        "ticketing officer airline Singapore",
+        "guest service officer airport Singapore",
+    ],
+}
 
-# Titles that suggest too much seniority — used to filter out irrelevant roles
-SENIOR_TITLE_KEYWORDS = [
-    "senior", "sr.", "lead", "head of", "director", "vp ", "vice president",
-    "chief", "principal", "general manager", "gm ", "c-suite", "coo", "ceo",
-    "cto", "cfo", "svp", "evp", "partner", "managing director"
-]
+# Requests each crawl may spend per source. Override with
+# QUERY_BUDGETS="source=requests,...".
+QUERY_BUDGETS = {"MyCareersFuture": 40, "Indeed": 16, "LinkedIn": 16}
+QUERY_BUDGETS.update(parse_budgets(os.environ.get("QUERY_BUDGETS", "")))
 
 # Entry-level positive signals in titles
 ENTRY_LEVEL_TITLE_SIGNALS = [
@@ -66,6 +118,29 @@ ENTRY_LEVEL_TITLE_SIGNALS = [
     "agent", "attendant", "handler"
 ]
 
+# Source endpoints (module-level so the offline benchmark can point them at
+# its local stand-in server)
+MCF_BASE_URL = "https://www.mycareersfuture.gov.sg"
+INDEED_BASE_URL = "https://sg.indeed.com"
+LINKEDIN_BASE_URL = "https://www.linkedin.com"
+
+# Per-host request budget shared by all fetchers: sustained rate (req/s),
+# burst, and requests in flight. Override with
+# HOST_RATE_LIMITS="host=rate:burst:concurrency,...".
+HOST_RATE_LIMITS = {
+    "www.mycareersfuture.gov.sg": HostLimit(rate=1.0, burst=3, concurrency=3),
+    "sg.indeed.com": HostLimit(rate=1 / 1.5, burst=1, concurrency=2),
+    "www.linkedin.com": HostLimit(rate=1 / 1.5, burst=1, concurrency=2),
+}
+HOST_RATE_LIMITS.update(parse_host_limits(os.environ.get("HOST_RATE_LIMITS", "")))
+DEFAULT_HOST_LIMIT = HostLimit(rate=1.0, burst=1, concurrency=1)
+
+rate_limiter = RateLimiter(HOST_RATE_LIMITS, DEFAULT_HOST_LIMIT)
+
+# Fetchers give a search page 15s; a job page checked during validation gets 12s
+SEARCH_TIMEOUT = aiohttp.ClientTimeout(total=15)
+VALIDATION_TIMEOUT = aiohttp.ClientTimeout(total=12)
+
 HEADERS = {
     "User-Agent": (
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -75,61 +150,177 @@ HEADERS = {
     "Accept-Language": "en-US,en;q=0.9",
 }
 
+# Responses that mean a source is blocking us: these open its circuit breaker
+# at once (see breaker.py). A 200 page with no job cards counts as a block
+# when it carries one of the challenge markers.
+BLOCK_STATUSES = {403, 429}
+BLOCK_PAGE_SIGNALS = ("captcha", "unusual traffic", "verify you are human", "authwall", "checkpoint/challenge")
+
+
+def _record_status(breaker: CircuitBreaker, status: int):
+    breaker.record_failure(f"HTTP {status}", blocked=status in BLOCK_STATUSES)
+
+
+def _is_block_page(html: str) -> bool:
+    text = html.lower()
+    return any(signal in text for signal in BLOCK_PAGE_SIGNALS)
+
+
+def _failure_reason(e: Exception) -> str:
+    return "timeout" if isinstance(e, asyncio.TimeoutError) else type(e).__name__
+
+
+async def _as_completed(tasks: list[asyncio.Task]) -> AsyncIterator:
+    """Yield each task's result as it finishes; cancelled or failed tasks are skipped."""
+    pending = set(tasks)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if not task.cancelled() and task.exception() is None:
+                    yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+# Search tasks that have sent at least one request (see _search_slot)
+_requesting: "weakref.WeakSet[asyncio.Task]" = weakref.WeakSet()
+
+
+@contextlib.asynccontextmanager
+async def _search_slot(url: str):
+    """rate_limiter.limit(url) for a search, marking the calling task as having started requesting."""
+    async with rate_limiter.limit(url):
+        _requesting.add(asyncio.current_task())
+        yield
+
+
+async def _stream_source(source: str, coros) -> AsyncIterator[list[Job]]:
+    """
+    Run one source's requests concurrently, yielding each one's jobs as it
+    finishes. Searches still queued behind the rate limiter are cancelled as
+    soon as the source's breaker opens; those that have sent a request are
+    left to return what they have read (each checks the breaker before its
+    next page).
+    """
+    tasks = [asyncio.ensure_future(c) for c in coros]
+
+    def cancel_pending():
+        for task in tasks:
+            if task not in _requesting:
+                task.cancel()
+
+    breaker = breakers[source]
+    breaker.listeners.append(cancel_pending)
+    try:
+        async for found in _as_completed(tasks):
+            yield found
+    finally:
+        breaker.listeners.remove(cancel_pending)
+
 
 # ─── MyCareersFuture ─────────────────────────────────────────────────────────
 
-async def fetch_mcf(session: aiohttp.ClientSession) -> list[dict]:
-    jobs = []
-    keywords = [
-        "aviation", "airport", "air transport", "airline",
-        "flight operations", "ground operations", "ground handling",
-        "baggage", "ramp", "air traffic",
-        "airport operations", "customer service aviation",
-        "data analyst", "business analyst",
-        "project coordinator", "operations executive",
-        "graduate trainee",
-        # Admin
-        "admin assistant", "administrative executive", "operations admin",
-        # Business analyst
-        "junior business analyst", "business analyst operations",
-        # Counter / passenger-facing
-        "check-in agent", "passenger service agent", "passenger service officer",
-        "airline customer service", "ticketing officer", "airport counter",
-        "guest service officer",
-    ]
-    for keyword in keywords:  # iterate all keywords
+# Page size and page caps for MCF search. A keyword with no watermark yet
+# (first crawl) only reads MCF_FIRST_CRAWL_PAGES pages to seed one.
+MCF_PAGE_SIZE = int(os.environ.get("MCF_PAGE_SIZE", "15"))
+MCF_MAX_PAGES = int(os.environ.get("MCF_MAX_PAGES", "5"))
+MCF_FIRST_CRAWL_PAGES = int(os.environ.get("MCF_FIRST_CRAWL_PAGES", "1"))
+
+async def fetch_mcf(session: aiohttp.ClientSession, plan: CrawlPlan) -> AsyncIterator[list[Job]]:
+    """Yields each keyword's jobs as its search finishes."""
+
+    async def fetch_keyword(keyword: str) -> list[Job]:
+        # Results are newest first. Page until a page reaches postings older
+        # than this keyword's watermark (the newest posting date seen last
+        # crawl), so busy keywords are fully covered and quiet ones cost one page.
+        # The watermark only moves once the gap down to it has been read.
+        found = []
+        breaker = breakers["MyCareersFuture"]
+        watermark = job_store.query_watermark("MyCareersFuture", keyword)
+        max_pages = MCF_MAX_PAGES if watermark else MCF_FIRST_CRAWL_PAGES
+        newest = watermark
+        covered = watermark is None  # a first crawl starts from the newest postings
         try:
-            # MCF supports filtering by max years of experience via the API
-            url = (
-                f"https://www.mycareersfuture.gov.sg/api/v2/search"
-                f"?search={urllib.parse.quote(keyword)}&limit=15&page=0"
-                f"&sortBy=new_posting_date"
-                f"&minimumYearsExperience=0&maximumYearsExperience=2"
-            )
-            async with session.get(url, headers=HEADERS, timeout=aiohttp.ClientTimeout(total=15)) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    results = data.get("results", [])
-                    for item in results:
-                        min_exp = item.get("minimumYearsExperience", 0) or 0
-                        max_exp = item.get("maximumYearsExperience", 2) or 2
-                        # Only include jobs asking for 0–2 years experience
-                        if min_exp <= 2:
-                            title = item.get("title", "")
-                            if not _is_senior_title(title):
-                                jobs.append({
-                                    "source": "MyCareersFuture",
-                                    "title": title,
-                                    "company": item.get("postedCompany", {}).get("name", ""),
-                                    "location": "Singapore",
-                                    "url": f"https://www.mycareersfuture.gov.sg/job/{item.get('uuid', '')}",
-                                    "salary": _mcf_salary(item),
-                                    "snippet": _mcf_exp_label(min_exp, max_exp),
-                                })
+            for page in range(max_pages):
+                if not breaker.allow():
+                    return found  # source blocked; the watermark stays put
+                if not plan.spend("MyCareersFuture", keyword):
+                    return found  # out of budget; the watermark stays put
+                # MCF supports filtering by max years of experience via the API
+                url = (
+                    f"{MCF_BASE_URL}/api/v2/search"
+                    f"?search={urllib.parse.quote(keyword)}&limit={MCF_PAGE_SIZE}&page={page}"
+                    f"&sortBy=new_posting_date"
+                    f"&minimumYearsExperience=0&maximumYearsExperience=2"
+                )
+                async with _search_slot(url):
+                    async with session.get(url, timeout=SEARCH_TIMEOUT) as resp:
+                        if resp.status != 200:
+                            _record_status(breaker, resp.status)
+                            return found  # watermark left alone so the gap is retried
+                        data = await resp.json()
+                breaker.record_success()
+                results = data.get("results", [])
+                for item in results:
+                    job = _mcf_job(item)
+                    if job is not None:
+                        found.append(job)
+                dates = [d for d in (_mcf_posting_date(item) for item in results) if d]
+                if dates and (newest is None or max(dates) > newest):
+                    newest = max(dates)
+                if len(results) < MCF_PAGE_SIZE:
+                    covered = True
+                    break  # last page
+                if watermark and dates and min(dates) < watermark:
+                    covered = True
+                    break  # reached postings from before the last crawl
+            if not covered:
+                # Stopped at MCF_MAX_PAGES with unread postings above the old
+                # watermark; keep it so the next crawl pages down to it again
+                logger.info(f"MCF '{keyword}': {max_pages} page(s) did not reach the watermark {watermark}")
+            elif newest:
+                job_store.set_query_watermark("MyCareersFuture", keyword, newest)
         except Exception as e:
+            breaker.record_failure(_failure_reason(e))
             logger.warning(f"MCF error for '{keyword}': {e}")
-        await asyncio.sleep(1)
-    return jobs
+        finally:
+            plan.observe("MyCareersFuture", keyword, found)
+        return found
+
+    # Keywords run concurrently; rate_limiter keeps MCF within its budget
+    async for found in _stream_source("MyCareersFuture", [fetch_keyword(k) for k in plan.queries["MyCareersFuture"]]):
+        yield found
+
+
+def _mcf_job(item: dict):
+    """Convert one MCF search result to a Job, or None if it is filtered out."""
+    min_exp = item.get("minimumYearsExperience", 0) or 0
+    max_exp = item.get("maximumYearsExperience", 2) or 2
+    # Only include jobs asking for 0–2 years experience
+    if min_exp > 2:
+        JOBS_DROPPED.inc(reason="experience")
+        return None
+    title = item.get("title", "")
+    if _is_senior_title(title):
+        JOBS_DROPPED.inc(reason="senior")
+        return None
+    return Job(
+        source="MyCareersFuture",
+        title=title,
+        company=item.get("postedCompany", {}).get("name", ""),
+        location="Singapore",
+        url=f"{MCF_BASE_URL}/job/{item.get('uuid', '')}",
+        salary=_mcf_salary(item),
+        snippet=_mcf_exp_label(min_exp, max_exp),
+    )
+
+
+def _mcf_posting_date(item: dict) -> str:
+    """ISO posting date ("2024-03-28") of an MCF result; sorts chronologically as a string."""
+    metadata = item.get("metadata") or {}
+    return (metadata.get("newPostingDate") or metadata.get("createdAt") or "")[:10]
 
 
 def _mcf_salary(item):
@@ -150,148 +341,110 @@ def _mcf_exp_label(min_exp: int, max_exp: int) -> str:
 
 def _is_senior_title(title: str) -> bool:
     """Return True if the title signals a senior/leadership role to filter out."""
-    t = title.lower()
-    return any(kw in t for kw in SENIOR_TITLE_KEYWORDS)
+    return SENIOR in title_labels(title)
 
 
 # ─── Indeed (Singapore) ──────────────────────────────────────────────────────
 
-async def fetch_indeed(session: aiohttp.ClientSession) -> list[dict]:
-    jobs = []
-    queries = [
-        ("aviation officer entry level", "Singapore"),
-        ("airport operations officer", "Singapore"),
-        ("flight operations officer", "Singapore"),
-        ("ground operations officer", "Singapore"),
-        ("ramp agent entry level", "Singapore"),
-        ("baggage handler officer", "Singapore"),
-        ("air traffic officer", "Singapore"),
-        ("junior data analyst aviation", "Singapore"),
-        ("business analyst entry level", "Singapore"),
-        ("customer service aviation officer", "Singapore"),
-        ("operations executive entry level", "Singapore"),
-        ("project coordinator aviation", "Singapore"),
-        ("graduate trainee aviation", "Singapore"),
-        # Admin
-        ("admin assistant aviation", "Singapore"),
-        ("administrative executive airport", "Singapore"),
-        ("operations admin officer", "Singapore"),
-        # Business analyst
-        ("junior business analyst", "Singapore"),
-        ("business analyst aviation operations", "Singapore"),
-        # Counter / passenger-facing
-        ("check-in agent airline", "Singapore"),
-        ("passenger service agent airport", "Singapore"),
-        ("airline customer service officer", "Singapore"),
-        ("ticketing officer airline", "Singapore"),
-        ("guest service officer airport", "Singapore"),
-        ("airport counter staff", "Singapore"),
-    ]
-    for q, loc in queries:
+async def fetch_indeed(session: aiohttp.ClientSession, plan: CrawlPlan) -> AsyncIterator[list[Job]]:
+    """Yields each query's jobs as its search finishes."""
+
+    async def fetch_query(q: str) -> list[Job]:
+        found = []
+        breaker = breakers["Indeed"]
+        if not breaker.allow() or not plan.spend("Indeed", q):
+            return found
         try:
             # &explvl=entry_level filters Indeed to entry-level postings
             url = (
-                f"https://sg.indeed.com/jobs"
-                f"?q={urllib.parse.quote(q)}&l={urllib.parse.quote(loc)}"
+                f"{INDEED_BASE_URL}/jobs"
+                f"?q={urllib.parse.quote(q)}&l=Singapore"
                 f"&sort=date&explvl=entry_level"
             )
-            async with session.get(url, headers=HEADERS, timeout=aiohttp.ClientTimeout(total=15)) as resp:
-                if resp.status == 200:
+            async with _search_slot(url):
+                async with session.get(url, timeout=SEARCH_TIMEOUT) as resp:
+                    if resp.status != 200:
+                        _record_status(breaker, resp.status)
+                        return found
                     html = await resp.text()
-                    soup = BeautifulSoup(html, "html.parser")
-                    cards = soup.select("div.job_seen_beacon")[:5]
-                    for card in cards:
-                        title_el = card.select_one("h2.jobTitle span")
-                        company_el = card.select_one("[data-testid='company-name']")
-                        location_el = card.select_one("[data-testid='text-location']")
-                        link_el = card.select_one("h2.jobTitle a")
-                        if title_el and link_el:
-                            title = title_el.get_text(strip=True)
-                            if _is_senior_title(title):
-                                continue
-                            job_id = link_el.get("data-jk", "")
-                            jobs.append({
-                                "source": "Indeed",
-                                "title": title,
-                                "company": company_el.get_text(strip=True) if company_el else "",
-                                "location": location_el.get_text(strip=True) if location_el else "Singapore",
-                                "url": f"https://sg.indeed.com/viewjob?jk={job_id}" if job_id else f"https://sg.indeed.com{link_el.get('href','')}",
-                                "salary": "",
-                                "snippet": "Entry level",
-                            })
+            cards = await parse("Indeed", parse_indeed, html)
+            if not cards and _is_block_page(html):
+                breaker.record_failure("captcha", blocked=True)
+                return found
+            breaker.record_success()
+            for card in cards:
+                if _is_senior_title(card["title"]):
+                    JOBS_DROPPED.inc(reason="senior")
+                    continue
+                job_id = card["job_id"]
+                found.append(Job(
+                    source="Indeed",
+                    title=card["title"],
+                    company=card["company"],
+                    location=card["location"] or "Singapore",
+                    url=f"{INDEED_BASE_URL}/viewjob?jk={job_id}" if job_id else f"{INDEED_BASE_URL}{card['href']}",
+                    snippet="Entry level",
+                ))
         except Exception as e:
+            breaker.record_failure(_failure_reason(e))
             logger.warning(f"Indeed error for '{q}': {e}")
-        await asyncio.sleep(1.5)
-    return jobs
+        finally:
+            plan.observe("Indeed", q, found)
+        return found
+
+    async for found in _stream_source("Indeed", [fetch_query(q) for q in plan.queries["Indeed"]]):
+        yield found
 
 
 # ─── LinkedIn ────────────────────────────────────────────────────────────────
 
-async def fetch_linkedin(session: aiohttp.ClientSession) -> list[dict]:
-    jobs = []
-    queries = [
-        "aviation officer entry level Singapore",
-        "airport operations officer Singapore",
-        "flight operations officer Singapore",
-        "ground operations officer Singapore",
-        "ramp agent Singapore",
-        "baggage officer aviation Singapore",
-        "air traffic officer Singapore",
-        "junior data analyst aviation Singapore",
-        "junior business analyst Singapore",
-        "customer service aviation Singapore",
-        "operations executive entry level Singapore",
-        "project coordinator aviation Singapore",
-        "air transport management graduate Singapore",
-        # Admin
-        "admin assistant aviation Singapore",
-        "administrative executive airport Singapore",
-        "operations admin aviation Singapore",
-        # Business analyst
-        "business analyst aviation Singapore",
-        "junior business analyst operations Singapore",
-        # Counter / passenger-facing
-        "check-in agent airline Singapore",
-        "passenger service agent airport Singapore",
-        "airline customer service officer Singapore",
-        "ticketing officer airline Singapore",
-        "guest service officer airport Singapore",
-    ]
-    for q in queries:
+async def fetch_linkedin(session: aiohttp.ClientSession, plan: CrawlPlan) -> AsyncIterator[list[Job]]:
+    """Yields each query's jobs as its search finishes."""
+
+    async def fetch_query(q: str) -> list[Job]:
+        found = []
+        breaker = breakers["LinkedIn"]
+        if not breaker.allow() or not plan.spend("LinkedIn", q):
+            return found
         try:
             # f_E=2 = Entry level on LinkedIn
             url = (
-                f"https://www.linkedin.com/jobs/search"
+                f"{LINKEDIN_BASE_URL}/jobs/search"
                 f"?keywords={urllib.parse.quote(q)}&location=Singapore"
                 f"&sortBy=DD&f_TPR=r86400&f_E=2"  # last 24h + entry level
             )
-            async with session.get(url, headers=HEADERS, timeout=aiohttp.ClientTimeout(total=15)) as resp:
-                if resp.status == 200:
+            async with _search_slot(url):
+                async with session.get(url, timeout=SEARCH_TIMEOUT) as resp:
+                    if resp.status != 200:
+                        _record_status(breaker, resp.status)
+                        return found
                     html = await resp.text()
-                    soup = BeautifulSoup(html, "html.parser")
-                    cards = soup.select("div.base-card")[:5]
-                    for card in cards:
-                        title_el = card.select_one("h3.base-search-card__title")
-                        company_el = card.select_one("h4.base-search-card__subtitle")
-                        location_el = card.select_one("span.job-search-card__location")
-                        link_el = card.select_one("a.base-card__full-link")
-                        if title_el:
-                            title = title_el.get_text(strip=True)
-                            if _is_senior_title(title):
-                                continue
-                            jobs.append({
-                                "source": "LinkedIn",
-                                "title": title,
-                                "company": company_el.get_text(strip=True) if company_el else "",
-                                "location": location_el.get_text(strip=True) if location_el else "Singapore",
-                                "url": link_el.get("href", "") if link_el else "",
-                                "salary": "",
-                                "snippet": "Entry level",
-                            })
+            cards = await parse("LinkedIn", parse_linkedin, html)
+            if not cards and _is_block_page(html):
+                breaker.record_failure("captcha", blocked=True)
+                return found
+            breaker.record_success()
+            for card in cards:
+                if _is_senior_title(card["title"]):
+                    JOBS_DROPPED.inc(reason="senior")
+                    continue
+                found.append(Job(
+                    source="LinkedIn",
+                    title=card["title"],
+                    company=card["company"],
+                    location=card["location"] or "Singapore",
+                    url=card["href"],
+                    snippet="Entry level",
+                ))
         except Exception as e:
+            breaker.record_failure(_failure_reason(e))
             logger.warning(f"LinkedIn error for '{q}': {e}")
-        await asyncio.sleep(1.5)
-    return jobs
+        finally:
+            plan.observe("LinkedIn", q, found)
+        return found
+
+    async for found in _stream_source("LinkedIn", [fetch_query(q) for q in plan.queries["LinkedIn"]]):
+        yield found
 
 
 # ─── Aviation Company Career Portals ─────────────────────────────────────────
@@ -324,138 +477,94 @@ AVIATION_PORTALS = [
     },
 ]
 
-async def fetch_aviation_portals(session: aiohttp.ClientSession) -> list[dict]:
-    jobs = []
-    for portal in AVIATION_PORTALS:
+async def fetch_aviation_portals(session: aiohttp.ClientSession, plan: CrawlPlan = None) -> AsyncIterator[list[Job]]:
+    """Yields each portal's jobs as its page is read."""
+
+    async def fetch_portal(portal: dict) -> list[Job]:
+        found = []
         try:
-            async with session.get(portal["url"], headers=HEADERS, timeout=aiohttp.ClientTimeout(total=15)) as resp:
-                if resp.status == 200:
+            async with rate_limiter.limit(portal["url"]):
+                async with session.get(portal["url"], timeout=SEARCH_TIMEOUT) as resp:
+                    if resp.status != 200:
+                        return found
                     html = await resp.text()
-                    soup = BeautifulSoup(html, "html.parser")
-                    # Generic extraction: look for job-like links
-                    links = soup.find_all("a", href=True)
-                    found = 0
-                    for link in links:
-                        text = link.get_text(strip=True)
-                        href = link.get("href", "")
-                        if len(text) > 10 and _is_relevant_title(text):
-                            full_url = href if href.startswith("http") else portal["url"].rstrip("/") + "/" + href.lstrip("/")
-                            jobs.append({
-                                "source": portal["name"],
-                                "title": text[:120],
-                                "company": portal["company"],
-                                "location": "Singapore",
-                                "url": full_url,
-                                "salary": "",
-                                "snippet": "",
-                            })
-                            found += 1
-                            if found >= 3:
-                                break
-                    # If nothing matched, add the portal itself as a reference
-                    if found == 0:
-                        jobs.append({
-                            "source": portal["name"],
-                            "title": f"Visit {portal['company']} careers page",
-                            "company": portal["company"],
-                            "location": "Singapore",
-                            "url": portal["url"],
-                            "salary": "",
-                            "snippet": "Check portal for latest openings",
-                        })
+            # Generic extraction: look for job-like links
+            for text, href in await parse(portal["name"], parse_links, html):
+                if len(text) > 10 and _is_relevant_title(text):
+                    full_url = href if href.startswith("http") else portal["url"].rstrip("/") + "/" + href.lstrip("/")
+                    found.append(Job(
+                        source=portal["name"],
+                        title=text[:120],
+                        company=portal["company"],
+                        location="Singapore",
+                        url=full_url,
+                    ))
+                    if len(found) >= 3:
+                        break
+            # If nothing matched, add the portal itself as a reference
+            if not found:
+                found.append(_portal_reference(portal))
         except Exception as e:
             logger.warning(f"Portal error for {portal['name']}: {e}")
-            jobs.append({
-                "source": portal["name"],
-                "title": f"Visit {portal['company']} careers page",
-                "company": portal["company"],
-                "location": "Singapore",
-                "url": portal["url"],
-                "salary": "",
-                "snippet": "Check portal for latest openings",
-            })
-        await asyncio.sleep(1)
-    return jobs
-
-
-RELEVANT_KEYWORDS = [
-    "manager", "analyst", "operations", "aviation", "airport", "airline",
-    "project", "data", "planning", "coordinator", "executive", "officer",
-    "logistics", "transport", "fleet", "ground", "cargo", "safety", "compliance",
-    "strategy", "business", "commercial", "network", "revenue", "finance",
-    "flight", "ramp", "baggage", "air traffic", "customer service",
-    "handler", "agent", "attendant", "trainee", "graduate", "associate",
-    "air transport", "airside", "landside", "passenger", "terminal",
-    # New
-    "admin", "administrative", "check-in", "check in", "ticketing",
-    "counter", "guest service", "passenger service", "front desk",
-    "junior", "entry level", "fresh graduate",
-]
+            found = [_portal_reference(portal)]
+        return found
+
+    # Each portal is a different host, so they all run at once
+    async for found in _as_completed([asyncio.ensure_future(fetch_portal(p)) for p in AVIATION_PORTALS]):
+        yield found
+
+
+def _portal_reference(portal: dict) -> Job:
+    return Job(
+        source=portal["name"],
+        title=f"Visit {portal['company']} careers page",
+        company=portal["company"],
+        location="Singapore",
+        url=portal["url"],
+        snippet="Check portal for latest openings",
+    )
+
 
 def _is_relevant_title(text: str) -> bool:
-    t = text.lower()
-    return any(kw in t for kw in RELEVANT_KEYWORDS)
+    return RELEVANT in title_labels(text)
 
 
 # ─── Deduplication & Relevance Scoring ───────────────────────────────────────
 
-def score_job(job: dict) -> int:
+def score_job(job: Job) -> int:
     """Score a job based on relevance to the user's Air Transport Management background."""
-    title = (job.get("title") or "").lower()
-    snippet = (job.get("snippet") or "").lower()
+    labels = title_labels(job.title)
+    snippet = job.snippet.lower()
     score = 0
 
-    high_value = [
-        "aviation", "airline", "airport", "air transport", "flight operations",
-        "ground operations", "ground handling", "ramp", "baggage",
-        "air traffic", "airside", "cargo", "atm", "caas", "changi", "iata",
-        "airport operations", "passenger services", "customer service aviation",
-        "passenger service", "check-in", "check in", "ticketing",
-        "guest service", "airport counter",
-    ]
-    medium_value = [
-        "project coordinator", "data analyst", "data analysis",
-        "operations analyst", "business analyst", "operations executive",
-        "planning", "logistics", "supply chain", "customer service",
-        "operations", "transport", "terminal",
-        "admin", "administrative", "admin assistant", "admin executive",
-        "junior business analyst", "front desk", "counter staff",
-    ]
-    entry_level_bonus = [
-        "junior", "associate", "graduate", "trainee", "officer",
-        "executive", "coordinator", "assistant", "entry"
-    ]
-
-    for kw in high_value:
-        if kw in title:
-            score += 3
-    for kw in medium_value:
-        if kw in title:
-            score += 2
-    for kw in entry_level_bonus:
-        if kw in title:
-            score += 2
+    score += 3 * len(labels.get(HIGH_VALUE, ()))
+    score += 2 * len(labels.get(MEDIUM_VALUE, ()))
+    score += 2 * len(labels.get(ENTRY_LEVEL_BONUS, ()))
 
     # Boost if explicitly flagged as fresh-grad friendly
     if "fresh" in snippet or "graduate" in snippet or "entry" in snippet:
         score += 3
 
     # Penalise any senior role that slipped through
-    if _is_senior_title(title):
+    if SENIOR in labels:
         score -= 10
 
     return score
 
 
-def deduplicate(jobs: list[dict]) -> list[dict]:
-    seen = set()
-    unique = []
-    for job in jobs:
-        key = (job["title"].lower()[:40], job["company"].lower()[:30])
-        if key not in seen:
-            seen.add(key)
-            unique.append(job)
-    return unique
+def dedup_key(job: Job) -> tuple:
+    return job.dedup_key
+
+
+def deduplicate(jobs: list[Job], index: DedupIndex = None) -> list[Job]:
+    """
+    Drop repeat postings, keeping the first: the same canonical URL, or the
+    same employer under a near-identical title from another source or query
+    (see dedup.py). Pass `index` to look up afterwards which job each
+    dropped one was merged into.
+    """
+    index = DedupIndex() if index is None else index
+    return [job for job in jobs if index.add(job) is job]
 
 
 # ─── Link Validation ─────────────────────────────────────────────────────────
@@ -470,48 +579,85 @@ EXPIRED_SIGNALS = [
     "job listing is no longer", "this job is no longer",
 ]
 
+_expiry_matcher = AhoCorasick(EXPIRED_SIGNALS)
+
+# Pages are read in VALIDATION_CHUNK_SIZE pieces and never past the byte limit
+# for their host; expiry notices sit near the top of the page.
+VALIDATION_CHUNK_SIZE = 16 * 1024
+VALIDATION_MAX_BYTES = int(os.environ.get("VALIDATION_MAX_BYTES", str(256 * 1024)))
+VALIDATION_HOST_MAX_BYTES = {
+    "www.linkedin.com": 512 * 1024,
+    "sg.linkedin.com": 512 * 1024,
+    "sg.indeed.com": 384 * 1024,
+    "www.mycareersfuture.gov.sg": 128 * 1024,
+}
+
+
+def _validation_byte_limit(url: str) -> int:
+    host = urllib.parse.urlsplit(url).hostname or ""
+    return VALIDATION_HOST_MAX_BYTES.get(host, VALIDATION_MAX_BYTES)
+
+
+async def _scan_for_expiry(resp: aiohttp.ClientResponse, max_bytes: int):
+    """
+    Read the body in chunks, feeding each into one multi-pattern scan.
+    Returns the first expiry signal found, or None once the body ends or
+    `max_bytes` have been read. The scanner keeps its state between chunks,
+    so a phrase split across a chunk boundary still matches.
+    """
+    scanner = _expiry_matcher.scanner()
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+    read = 0
+    host = request_host(resp.url)
+    async for chunk in resp.content.iter_chunked(VALIDATION_CHUNK_SIZE):
+        chunk = chunk[:max_bytes - read]
+        read += len(chunk)
+        HTTP_BYTES.inc(len(chunk), host=host)
+        signal = scanner.feed(decoder.decode(chunk).lower())
+        if signal or read >= max_bytes:
+            return signal
+    return scanner.feed(decoder.decode(b"", final=True).lower())
+
+
+# Verdicts are remembered across runs: live links are rechecked after
+# LINK_CACHE_LIVE_TTL seconds, dead ones after LINK_CACHE_DEAD_TTL seconds.
+LINK_CACHE_FILE = os.environ.get("LINK_CACHE_FILE", "link_cache.json")
+LINK_CACHE_LIVE_TTL = int(os.environ.get("LINK_CACHE_LIVE_TTL", str(6 * 3600)))
+LINK_CACHE_DEAD_TTL = int(os.environ.get("LINK_CACHE_DEAD_TTL", str(7 * 24 * 3600)))
+
+link_cache = LinkCache(LINK_CACHE_FILE, live_ttl=LINK_CACHE_LIVE_TTL, dead_ttl=LINK_CACHE_DEAD_TTL)
+
+# Statuses that say nothing about the listing itself (rate limits, server
+# trouble, HEAD not supported) — never cached as a dead verdict
+_TRANSIENT_STATUSES = {405, 408, 429, 501}
+
+
+def _is_portal_link(url: str) -> bool:
+    return url.endswith(".html") or url.endswith("/careers") or "careers.html" in url
+
+
 async def is_valid_job_url(session: aiohttp.ClientSession, url: str) -> bool:
     """
     Return True if the URL resolves to a live, valid job listing.
     Checks:
-      1. HTTP status — anything 4xx/5xx is dead
-      2. Page content — scans for expiry/error phrases
+      1. Link cache — a fresh live/dead verdict is returned without a request
+      2. HTTP status — anything 4xx/5xx is dead
+      3. Page content — scans for expiry/error phrases
     Portal "Visit careers page" links are always trusted (no uuid in path).
     """
     if not url or not url.startswith("http"):
         return False
 
     # Trust bare portal homepage links — these are always valid reference links
-    if url.endswith(".html") or url.endswith("/careers") or "careers.html" in url:
+    if _is_portal_link(url):
         return True
 
-    try:
-        async with session.get(
-            url,
-            headers=HEADERS,
-            timeout=aiohttp.ClientTimeout(total=12),
-            allow_redirects=True,
-            max_redirects=5,
-        ) as resp:
-            # Hard fail on 4xx / 5xx
-            if resp.status >= 400:
-                logger.debug(f"Dead link ({resp.status}): {url}")
-                return False
-
-            # Read a chunk of the page — enough to catch error/expiry messages
-            try:
-                html = await resp.text(encoding="utf-8", errors="ignore")
-            except Exception:
-                return True  # can't read body, assume live
-
-            text_lower = html.lower()
-            for signal in EXPIRED_SIGNALS:
-                if signal in text_lower:
-                    logger.debug(f"Expired listing detected ('{signal}'): {url}")
-                    return False
-
-            return True
+    cached = link_cache.verdict(url)
+    if cached is not None:
+        return cached
 
+    try:
+        return await _check_job_url(session, url, link_cache.entry(url))
     except asyncio.TimeoutError:
         logger.debug(f"Timeout validating: {url}")
         return False
@@ -520,56 +666,434 @@ async def is_valid_job_url(session: aiohttp.ClientSession, url: str) -> bool:
         return False
 
 
-async def validate_jobs(session: aiohttp.ClientSession, jobs: list[dict]) -> list[dict]:
+async def _check_job_url(session: aiohttp.ClientSession, url: str, previous: dict) -> bool:
     """
-    Concurrently validate all job URLs, dropping dead/expired ones.
-    Uses a semaphore to avoid hammering servers.
+    Check `url` over the network and record the verdict in the link cache.
+    - A link that was dead last time is rechecked with HEAD; if it is still
+      4xx the body is never downloaded.
+    - A link that was live and sent ETag / Last-Modified is rechecked with a
+      conditional GET; 304 means unchanged, so still live.
+    - Otherwise the page is downloaded and scanned for expiry phrases.
     """
-    sem = asyncio.Semaphore(8)  # max 8 concurrent checks
-
-    async def check(job):
-        async with sem:
-            valid = await is_valid_job_url(session, job.get("url", ""))
-            return job if valid else None
-
-    results = await asyncio.gather(*[check(j) for j in jobs])
-    valid_jobs = [j for j in results if j is not None]
-    dropped = len(jobs) - len(valid_jobs)
-    if dropped:
-        logger.info(f"Link validation: removed {dropped} expired/dead listing(s)")
-    return valid_jobs
+    if previous is not None and not previous["live"]:
+        async with session.head(url, timeout=VALIDATION_TIMEOUT,
+                                allow_redirects=True, max_redirects=5) as resp:
+            if 400 <= resp.status < 500 and resp.status not in _TRANSIENT_STATUSES:
+                logger.debug(f"Still dead ({resp.status}): {url}")
+                link_cache.record(url, False)
+                return False
+
+    headers = {}
+    if previous is not None and previous["live"]:
+        if previous.get("etag"):
+            headers["If-None-Match"] = previous["etag"]
+        if previous.get("last_modified"):
+            headers["If-Modified-Since"] = previous["last_modified"]
+
+    async with session.get(url, headers=headers, timeout=VALIDATION_TIMEOUT,
+                           allow_redirects=True, max_redirects=5) as resp:
+        if resp.status == 304:
+            logger.debug(f"Unchanged since last check: {url}")
+            link_cache.record(url, True, previous.get("etag"), previous.get("last_modified"))
+            return True
+
+        # Hard fail on 4xx / 5xx; only a definite answer is cached
+        if resp.status >= 400:
+            logger.debug(f"Dead link ({resp.status}): {url}")
+            if resp.status < 500 and resp.status not in _TRANSIENT_STATUSES:
+                link_cache.record(url, False)
+            return False
+
+        # Stream the page and stop at the first expiry/error phrase
+        try:
+            signal = await _scan_for_expiry(resp, _validation_byte_limit(url))
+        except Exception:
+            return True  # can't read body, assume live
+        if signal:
+            logger.debug(f"Expired listing detected ('{signal}'): {url}")
+            link_cache.record(url, False)
+            return False
+
+        link_cache.record(url, True, resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+        return True
+
+
+def _known_verdict(url: str):
+    """The verdict is_valid_job_url would give without a request, or None if it needs one."""
+    if not url or not url.startswith("http"):
+        return False
+    if _is_portal_link(url):
+        return True
+    return link_cache.verdict(url)
+
+
+async def _check_link(session: aiohttp.ClientSession, url: str) -> bool:
+    """is_valid_job_url for a link with no known verdict, counted in LINK_CHECKS as a network check."""
+    live = await is_valid_job_url(session, url)
+    LINK_CHECKS.inc(origin="network", result="live" if live else "dead")
+    return live
 
 
 # ─── Main Entry ──────────────────────────────────────────────────────────────
 
-async def fetch_all_jobs() -> list[dict]:
-    async with aiohttp.ClientSession() as session:
-        # Step 1: fetch from all sources in parallel
-        results = await asyncio.gather(
-            fetch_mcf(session),
-            fetch_indeed(session),
-            fetch_linkedin(session),
-            fetch_aviation_portals(session),
-            return_exceptions=True
-        )
-
-        all_jobs = []
-        for r in results:
-            if isinstance(r, list):
-                all_jobs.extend(r)
+# Crawl results are shared between /latest and the scheduled pushes.
+# Within JOB_CACHE_TTL seconds a result is served as-is; for a further
+# JOB_CACHE_STALE_TTL seconds it is served while a refresh runs in the background.
+JOB_CACHE_TTL = int(os.environ.get("JOB_CACHE_TTL", "900"))
+JOB_CACHE_STALE_TTL = int(os.environ.get("JOB_CACHE_STALE_TTL", "2700"))
+JOB_CACHE_MAXSIZE = int(os.environ.get("JOB_CACHE_MAXSIZE", "4"))
+
+job_store = JobStore()
+
+# One breaker per scraped search source; their state lives in job_store
+breakers = {source: CircuitBreaker(source, job_store) for source in ("MyCareersFuture", "Indeed", "LinkedIn")}
+query_planner = QueryPlanner(job_store, QUERY_CATALOGUE, QUERY_BUDGETS)
+
+job_cache = ResultCache(ttl=JOB_CACHE_TTL, stale_ttl=JOB_CACHE_STALE_TTL, maxsize=JOB_CACHE_MAXSIZE)
+_CACHE_KEY = "all_jobs"
+
+# First page of the crawl in flight, for stream_all_jobs
+_first_page: asyncio.Future = None
+
+# A crawl returns the VALIDATION_TARGET best-scoring jobs with live links.
+# Links are checked in score order (at most VALIDATION_CONCURRENCY at a time)
+# only until that many are confirmed, going no deeper than the
+# VALIDATION_MAX_CANDIDATES best jobs when many turn out dead.
+VALIDATION_TARGET = int(os.environ.get("VALIDATION_TARGET", "40"))
+VALIDATION_MAX_CANDIDATES = int(os.environ.get("VALIDATION_MAX_CANDIDATES", "120"))
+VALIDATION_CONCURRENCY = 8
+
+# How many top jobs every crawl used to check up front; the savings logged
+# after each crawl are measured against it
+_EAGER_CANDIDATES = 60
+
+# /latest gets a first message once this many live jobs scoring at least
+# FIRST_PAGE_MIN_SCORE are confirmed, without waiting for the slowest source
+FIRST_PAGE_SIZE = int(os.environ.get("FIRST_PAGE_SIZE", "8"))
+FIRST_PAGE_MIN_SCORE = int(os.environ.get("FIRST_PAGE_MIN_SCORE", "3"))
+
+
+def _start_crawl():
+    """Loader for job_cache: a fresh crawl coroutine with its own first-page future."""
+    global _first_page
+    _first_page = asyncio.get_running_loop().create_future()
+    return _crawl_all_jobs(_first_page)
+
+
+async def fetch_all_jobs(max_age: float = None, allow_stale: bool = True, force_refresh: bool = False) -> list[Job]:
+    """
+    Return the top validated jobs, crawling only when the cached result is too old.
+    Concurrent callers share a single crawl.
+    """
+    if force_refresh:
+        jobs = await job_cache.refresh(_CACHE_KEY, _start_crawl)
+    else:
+        jobs = await job_cache.get(_CACHE_KEY, _start_crawl, max_age=max_age, allow_stale=allow_stale)
+    return list(jobs)
+
+
+async def stream_all_jobs(max_age: float = None, allow_stale: bool = True) -> AsyncIterator[tuple[list[Job], bool]]:
+    """
+    fetch_all_jobs for callers that can show results in two steps: yields
+    (jobs, final). While a crawl is running, its first page (see
+    _crawl_all_jobs) is yielded with final=False as soon as it is ready,
+    then the full result with final=True. A cached result is yielded once.
+    """
+    result = asyncio.ensure_future(fetch_all_jobs(max_age=max_age, allow_stale=allow_stale))
+    await asyncio.sleep(0)  # let it start or join the crawl
+    first_page = _first_page
+    if not result.done() and job_cache.is_loading(_CACHE_KEY) and first_page is not None:
+        await asyncio.wait({result, first_page}, return_when=asyncio.FIRST_COMPLETED)
+        if not result.done() and first_page.done() and not first_page.cancelled():
+            yield list(first_page.result()), False
+    yield await result, True
+
+
+def cached_jobs_age():
+    """Seconds since the cached crawl result was stored, or None if there is none."""
+    entry = job_cache.peek(_CACHE_KEY)
+    return entry[0] if entry is not None else None
+
+
+def invalidate_jobs():
+    """Drop the cached crawl result so the next caller crawls afresh."""
+    job_cache.invalidate(_CACHE_KEY)
+
+
+async def cancel_crawl():
+    """Cancel the crawl in flight, if any, and wait for it to unwind (before http_client closes)."""
+    task = job_cache.cancel(_CACHE_KEY)
+    if task is not None:
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
+
+# Extra aiohttp TraceConfigs attached to the shared session (the offline
+# benchmark uses this to count bytes read); read when the session opens
+TRACE_CONFIGS: list = []
+
+# Shared by every crawl for the life of the process. The bot opens it in
+# post_init and closes it in post_shutdown.
+http_client = HttpClient(HEADERS, TRACE_CONFIGS)
+
+# Stage timings and counts from the most recent crawl
+last_crawl_stats: dict = {}
+
+
+async def _timed_source(name: str, stream: AsyncIterator[list[Job]], timings: dict) -> AsyncIterator[list[Job]]:
+    start = time.perf_counter()
+    try:
+        async for found in stream:
+            JOBS_FETCHED.inc(len(found), source=name)
+            yield found
+    finally:
+        timings[name] = time.perf_counter() - start
+
+
+async def _merge(streams: list) -> AsyncIterator[list[Job]]:
+    """Interleave the sources' batches in the order they arrive; a failing source is logged and dropped."""
+    queue = asyncio.Queue()
+    finished = object()
+
+    async def pump(stream):
+        try:
+            async for batch in stream:
+                queue.put_nowait(batch)
+        except Exception as e:
+            logger.warning(f"A source returned an exception: {e}")
+        finally:
+            queue.put_nowait(finished)
+
+    pumps = [asyncio.ensure_future(pump(stream)) for stream in streams]
+    try:
+        remaining = len(pumps)
+        while remaining:
+            batch = await queue.get()
+            if batch is finished:
+                remaining -= 1
             else:
-                logger.warning(f"A source returned an exception: {r}")
+                yield batch
+    finally:
+        for task in pumps:
+            task.cancel()
+
+
+async def _dedup_stage(batches, index: DedupIndex, unique: list, stats: dict) -> AsyncIterator[list[Job]]:
+    """Drop each batch's repeats of jobs already seen; every job kept is also appended to `unique`."""
+    async for batch in batches:
+        start = time.perf_counter()
+        kept = deduplicate(batch, index)
+        unique.extend(kept)
+        stats["fetched"] += len(batch)
+        stats["dedup_s"] += time.perf_counter() - start
+        JOBS_DROPPED.inc(len(batch) - len(kept), reason="duplicate")
+        if kept:
+            yield kept
+
+
+async def _score_stage(batches, scores: dict, stats: dict) -> AsyncIterator[list[Job]]:
+    """Fill in `scores` for each batch; jobs unchanged since the store last saw them keep their stored score."""
+    async for batch in batches:
+        start = time.perf_counter()
+        known = job_store.known_scores(batch)
+        for job in batch:
+            key = job_key(job)
+            if key in known:
+                scores[key] = known[key]
+            else:
+                scores[key] = score_job(job)
+                stats["rescored"] += 1
+        stats["score_s"] += time.perf_counter() - start
+        yield batch
+
+
+async def _next_batch(batches):
+    return await anext(batches, None)
+
+
+async def _validate_stage(session: aiohttp.ClientSession, batches, scores: dict, verdicts: dict,
+                          checked: set, stats: dict, early: int = 0, early_min_score: float = 0) -> AsyncIterator[Job]:
+    """
+    Yield live jobs, checking as few links as possible. Every job arriving
+    goes into one max-heap by score and is taken off it best first:
+    - while batches are still arriving, only until `early` live jobs scoring
+      at least `early_min_score` are known (a first page for /latest);
+    - once they are all in, until VALIDATION_TARGET live jobs rank above
+      everything still on the heap. Checks are topped up only by as many as
+      are still missing, so the list goes deeper only when links are dead,
+      and never past VALIDATION_MAX_CANDIDATES jobs.
+    Fresh verdicts from the link cache cost no request.
+    """
+    ranked, running, live_scores = [], {}, []
+    arrival = itertools.count()
+    upstream = asyncio.ensure_future(_next_batch(batches))
+    taken = 0
+    tail_start = None
 
-        # Step 2: deduplicate and pre-sort before validation
-        all_jobs = deduplicate(all_jobs)
-        all_jobs.sort(key=score_job, reverse=True)
+    def wanted() -> int:
+        """How many more checks should be in flight now."""
+        if upstream is not None:
+            if not ranked or -ranked[0][0] < early_min_score:
+                return 0
+            return early - sum(s >= early_min_score for s in live_scores) - len(running)
+        if taken >= VALIDATION_MAX_CANDIDATES:
+            return 0
+        frontier = -ranked[0][0] if ranked else -math.inf
+        return VALIDATION_TARGET - sum(s >= frontier for s in live_scores) - len(running)
 
-        # Step 3: take top 60 candidates, then validate links (drop expired/dead)
-        # We validate more than the final 40 so we still have enough after filtering
-        candidates = all_jobs[:60]
-        logger.info(f"Validating {len(candidates)} job links...")
-        valid_jobs = await validate_jobs(session, candidates)
+    try:
+        while True:
+            while ranked and len(running) < VALIDATION_CONCURRENCY and wanted() > 0:
+                negative_score, _, job = heapq.heappop(ranked)
+                taken += 1
+                key = job_key(job)
+                known = _known_verdict(job.url)
+                if known is None:
+                    running[asyncio.ensure_future(_check_link(session, job.url))] = job
+                    stats["validated"] += 1
+                    continue
+                verdicts[key] = known
+                if job.url in link_cache:
+                    LINK_CHECKS.inc(origin="cache", result="live" if known else "dead")
+                if known:
+                    live_scores.append(-negative_score)
+                    yield job
+                else:
+                    stats["dead"] += 1
+            if upstream is None and not running:
+                break
+
+            waiting = set(running) if upstream is None else {upstream, *running}
+            done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+            if upstream in done:
+                batch = upstream.result()
+                if batch is None:
+                    upstream, tail_start = None, time.perf_counter()
+                else:
+                    upstream = asyncio.ensure_future(_next_batch(batches))
+                    for job in batch:
+                        heapq.heappush(ranked, (-scores[job_key(job)], next(arrival), job))
+            for task in done & running.keys():
+                job = running.pop(task)
+                key = job_key(job)
+                verdicts[key] = task.result()
+                checked.add(key)
+                if verdicts[key]:
+                    live_scores.append(scores[key])
+                    yield job
+                else:
+                    stats["dead"] += 1
+    finally:
+        for task in running:
+            task.cancel()
+        if upstream is not None:
+            upstream.cancel()
+        link_cache.save()
+        if tail_start is not None:
+            stats["validate_s"] = time.perf_counter() - tail_start
+
+
+_SOURCE_NAMES = ("MyCareersFuture", "Indeed", "LinkedIn", "Portals")
 
-    # Step 4: return top 40 after validation
-    logger.info(f"{len(valid_jobs)} valid jobs after link check")
-    return valid_jobs[:40]
+
+async def _crawl_all_jobs(first_page: asyncio.Future = None) -> list[Job]:
+    """
+    Run one crawl as a pipeline: every source's batches are deduplicated
+    and scored as they arrive, and links are checked best first, only as
+    many as needed (see _validate_stage). `first_page`, if given, is
+    resolved with the first FIRST_PAGE_SIZE live jobs scoring at least
+    FIRST_PAGE_MIN_SCORE, best first.
+    """
+    stats = {"sources": {}, "fetched": 0, "rescored": 0, "validated": 0, "dead": 0, "dedup_s": 0.0, "score_s": 0.0}
+    crawl_start = time.perf_counter()
+    plan = query_planner.plan()
+    for breaker in breakers.values():
+        if breaker.retry_in():
+            logger.info(
+                f"Skipping {breaker.source}: circuit open ({breaker.reason}), "
+                f"probe in {breaker.retry_in() / 60:.0f} min"
+            )
+    session = await http_client.session()
+    http_before = http_client.stats()
+
+    # Sources stream their jobs in as each query finishes; a job moves on to
+    # dedup, scoring and link checking as soon as its batch arrives
+    fetchers = (fetch_mcf, fetch_indeed, fetch_linkedin, fetch_aviation_portals)
+    sources = _merge([
+        _timed_source(name, fetcher(session, plan), stats["sources"])
+        for name, fetcher in zip(_SOURCE_NAMES, fetchers)
+    ])
+    duplicates = DedupIndex()
+    all_jobs, scores, verdicts, checked = [], {}, {}, set()
+    pipeline = _validate_stage(
+        session,
+        _score_stage(_dedup_stage(sources, duplicates, all_jobs, stats), scores, stats),
+        scores, verdicts, checked, stats,
+        early=FIRST_PAGE_SIZE if first_page is not None else 0, early_min_score=FIRST_PAGE_MIN_SCORE,
+    )
+    live, early = set(), []
+    try:
+        async for job in pipeline:
+            live.add(job_key(job))
+            if first_page is None or first_page.done() or scores[job_key(job)] < FIRST_PAGE_MIN_SCORE:
+                continue
+            early.append(job)
+            if len(early) >= FIRST_PAGE_SIZE:
+                first_page.set_result(sorted(early, key=lambda j: scores[job_key(j)], reverse=True))
+                stats["first_page_s"] = time.perf_counter() - crawl_start
+                CRAWL_STAGE_SECONDS.observe(stats["first_page_s"], stage="first_page")
+                logger.info(f"First page of {len(early)} live jobs ready after {stats['first_page_s']:.1f}s")
+    finally:
+        if first_page is not None and not first_page.done():
+            first_page.cancel()
+
+    stats["parse"] = take_parse_stats()
+    parse_summary = ", ".join(
+        f"{source} {seconds * 1000:.0f}ms/{pages}p" for source, (pages, seconds) in stats["parse"].items()
+    )
+    if parse_summary:
+        logger.info(f"Parse time: {parse_summary}")
+    stats["fetch_s"] = max(stats["sources"].values(), default=0.0)
+    stats["unique"] = len(all_jobs)
+    stats.setdefault("validate_s", 0.0)
+    CRAWL_STAGE_SECONDS.observe(stats["fetch_s"], stage="fetch")
+    CRAWL_STAGE_SECONDS.observe(stats["dedup_s"], stage="dedup")
+    CRAWL_STAGE_SECONDS.observe(stats["score_s"], stage="score")
+    CRAWL_STAGE_SECONDS.observe(stats["validate_s"], stage="validate")
+    logger.info(
+        f"Scored {stats['rescored']} new/changed job(s), reused {len(all_jobs) - stats['rescored']} stored score(s)"
+    )
+
+    # Everything above the last job taken off the heap has a verdict, so the
+    # first VALIDATION_TARGET live jobs in score order are the best ones
+    all_jobs.sort(key=lambda j: scores[job_key(j)], reverse=True)
+    valid_jobs = [j for j in all_jobs if job_key(j) in live][:VALIDATION_TARGET]
+    cache_known = verdicts.keys() - checked
+    eager = sum(1 for j in all_jobs[:_EAGER_CANDIDATES] if job_key(j) not in cache_known)
+    saved = stats["validation_saved"] = eager - stats["validated"]
+    if saved >= 0:
+        outcome = f"saved {saved} over checking the top {_EAGER_CANDIDATES}"
+    else:
+        outcome = f"{-saved} more than checking the top {_EAGER_CANDIDATES}, to replace dead links"
+    logger.info(f"Link validation: {stats['validated']} checked for {len(valid_jobs)} live job(s), {outcome}")
+    stats["valid"] = len(valid_jobs)
+    JOBS_DROPPED.inc(stats["dead"], reason="invalid_link")
+
+    job_store.record_crawl(all_jobs, scores)
+    query_planner.record(
+        plan, lambda job: dedup_key(duplicates.kept(job)), {dedup_key(j): scores[job_key(j)] for j in all_jobs}
+    )
+    stats["queries"] = {source: len(queries) for source, queries in plan.queries.items()}
+    stats["breakers"] = {source: breaker.state for source, breaker in breakers.items()}
+    stats["http"] = stats_delta(http_before, http_client.stats())
+    logger.info(
+        f"HTTP: {stats['http']['requests']} requests, {stats['http']['connections_opened']} new connection(s), "
+        f"{stats['http']['connections_reused']} reused ({stats['http']['reuse_ratio']:.0%}), "
+        f"{stats['http']['dns_lookups']} DNS lookup(s)"
+    )
+    stats["total_s"] = time.perf_counter() - crawl_start
+    CRAWL_STAGE_SECONDS.observe(stats["total_s"], stage="total")
+    last_crawl_stats.clear()
+    last_crawl_stats.update(stats)
+
+    return valid_jobs
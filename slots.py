@@ -0,0 +1,23 @@
+import os
+import pytz
+
+SGT = pytz.timezone("Asia/Singapore")
+
+# Scheduled push times (hour, SGT) and how each is labelled in its digest
+SCHEDULE_LABELS = {
+    9:  "9:00 AM",
+    12: "12:00 PM",
+    15: "3:00 PM",
+}
+
+# The crawl for each slot starts this long before it, so at :00 the push only
+# renders and sends. 0 turns prefetching off.
+PREFETCH_LEAD_MINUTES = int(os.environ.get("PREFETCH_LEAD_MINUTES", "10"))
+# A result this old or newer at slot time counts as that slot's prefetch
+# (the lead time plus slack for a late-running prefetch)
+SLOT_MAX_AGE = PREFETCH_LEAD_MINUTES * 60 + 300
+
+
+def prefetch_time(hour: int) -> tuple[int, int]:
+    """(hour, minute) SGT at which the crawl for the `hour` slot starts."""
+    return divmod((hour * 60 - PREFETCH_LEAD_MINUTES) % (24 * 60), 60)
@@ -0,0 +1,139 @@
+import os
+import json
+import time
+import asyncio
+import sqlite3
+import logging
+import threading
+from filters import JobFilter
+
+logger = logging.getLogger(__name__)
+
+SUBSCRIBERS_DB = os.environ.get("SUBSCRIBERS_DB", "subscribers.db")
+SUBSCRIBERS_BATCH_SIZE = int(os.environ.get("SUBSCRIBERS_BATCH_SIZE", "1000"))
+
+# Subscriber list from before the database; imported once, then renamed
+LEGACY_SUBSCRIBERS_FILE = "subscribers.json"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS subscribers (
+    chat_id       TEXT PRIMARY KEY,
+    subscribed_at REAL NOT NULL,
+    filters       TEXT              -- JobFilter JSON; NULL = every job
+);
+"""
+
+
+class SubscriberStore:
+    """
+    Subscribed chat ids and their digest filters in SQLite (WAL), one row per chat.
+
+    Subscribing or unsubscribing touches a single row in its own transaction,
+    so a crash can never lose the rest of the list. Writes run in a worker
+    thread to keep the event loop free; lookups are primary-key reads.
+    """
+
+    def __init__(self, path: str = SUBSCRIBERS_DB, legacy_file: str = LEGACY_SUBSCRIBERS_FILE):
+        self.path = path
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(subscribers)")}
+        if "filters" not in columns:  # store created before filters existed
+            self._db.execute("ALTER TABLE subscribers ADD COLUMN filters TEXT")
+        self._lock = threading.Lock()
+        if legacy_file and os.path.exists(legacy_file):
+            self._import_legacy(legacy_file)
+
+    def _import_legacy(self, legacy_file: str):
+        try:
+            with open(legacy_file, "r") as f:
+                chat_ids = [str(cid) for cid in json.load(f)]
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Could not read {legacy_file} for migration: {e}")
+            return
+        now = time.time()
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR IGNORE INTO subscribers (chat_id, subscribed_at) VALUES (?, ?)",
+                ((chat_id, now) for chat_id in chat_ids),
+            )
+        os.replace(legacy_file, legacy_file + ".migrated")
+        logger.info(f"Migrated {len(chat_ids)} subscriber(s) from {legacy_file}")
+
+    # ── Writing ──────────────────────────────────────────────────────────────
+
+    def _add(self, chat_id: str) -> bool:
+        with self._lock, self._db:
+            cur = self._db.execute(
+                "INSERT OR IGNORE INTO subscribers (chat_id, subscribed_at) VALUES (?, ?)",
+                (chat_id, time.time()),
+            )
+        return cur.rowcount > 0
+
+    def _remove(self, chat_id: str) -> bool:
+        with self._lock, self._db:
+            cur = self._db.execute("DELETE FROM subscribers WHERE chat_id = ?", (chat_id,))
+        return cur.rowcount > 0
+
+    def _set_filters(self, chat_id: str, filters: str) -> bool:
+        with self._lock, self._db:
+            cur = self._db.execute("UPDATE subscribers SET filters = ? WHERE chat_id = ?", (filters, chat_id))
+        return cur.rowcount > 0
+
+    async def add(self, chat_id) -> bool:
+        """Subscribe `chat_id`; False if it already was."""
+        return await asyncio.to_thread(self._add, str(chat_id))
+
+    async def remove(self, chat_id) -> bool:
+        """Unsubscribe `chat_id`; False if it was not subscribed."""
+        return await asyncio.to_thread(self._remove, str(chat_id))
+
+    async def set_filters(self, chat_id, job_filter: JobFilter) -> bool:
+        """Store the digest filter of a subscribed chat; False if it is not subscribed."""
+        return await asyncio.to_thread(
+            self._set_filters, str(chat_id), job_filter.to_json() if job_filter else None
+        )
+
+    # ── Reading ──────────────────────────────────────────────────────────────
+
+    def __contains__(self, chat_id) -> bool:
+        with self._lock:
+            return self._db.execute(
+                "SELECT 1 FROM subscribers WHERE chat_id = ?", (str(chat_id),)
+            ).fetchone() is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM subscribers").fetchone()[0]
+
+    def filters(self, chat_id) -> JobFilter:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT filters FROM subscribers WHERE chat_id = ?", (str(chat_id),)
+            ).fetchone()
+        return JobFilter.from_json(row[0] if row else None)
+
+    def batches(self, size: int = SUBSCRIBERS_BATCH_SIZE):
+        """
+        Yield every subscriber as (chat_id, JobFilter) in lists of up to
+        `size`, without loading them all at once.
+        """
+        after = ""
+        parsed = {}  # most subscribers share a handful of filters
+        while True:
+            with self._lock:
+                rows = self._db.execute(
+                    "SELECT chat_id, filters FROM subscribers WHERE chat_id > ? ORDER BY chat_id LIMIT ?",
+                    (after, size),
+                ).fetchall()
+            if not rows:
+                return
+            batch = []
+            for chat_id, filters in rows:
+                if filters not in parsed:
+                    parsed[filters] = JobFilter.from_json(filters)
+                batch.append((chat_id, parsed[filters]))
+            yield batch
+            after = rows[-1][0]
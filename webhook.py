@@ -0,0 +1,97 @@
+import os
+import signal
+import asyncio
+import hashlib
+import logging
+from aiohttp import web
+from telegram import Update
+from telegram.ext import Application
+
+logger = logging.getLogger(__name__)
+
+# Public HTTPS base URL Telegram posts updates to, e.g. https://my-bot.up.railway.app
+WEBHOOK_URL = os.environ.get("WEBHOOK_URL", "")
+WEBHOOK_PATH = os.environ.get("WEBHOOK_PATH", "/telegram")
+WEBHOOK_LISTEN = os.environ.get("WEBHOOK_LISTEN", "0.0.0.0")
+# Railway and Render pass the port to bind as PORT
+WEBHOOK_PORT = int(os.environ.get("WEBHOOK_PORT", os.environ.get("PORT", "8080")))
+# Telegram echoes this in X-Telegram-Bot-Api-Secret-Token on every call;
+# derived from the bot token when not set
+WEBHOOK_SECRET = os.environ.get("WEBHOOK_SECRET", "")
+
+_SECRET_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+
+
+def webhook_secret(token: str) -> str:
+    return WEBHOOK_SECRET or hashlib.sha256(token.encode()).hexdigest()[:32]
+
+
+def webhook_app(application: Application, secret: str) -> web.Application:
+    """aiohttp app that feeds Telegram's POSTs into the application's update queue."""
+
+    async def receive(request: web.Request) -> web.Response:
+        if request.headers.get(_SECRET_HEADER) != secret:
+            return web.Response(status=403)
+        try:
+            update = Update.de_json(await request.json(), application.bot)
+        except Exception as e:
+            logger.warning(f"Rejected malformed webhook update: {e}")
+            return web.Response(status=400)
+        # Answer at once; handlers run off the queue like in polling mode
+        await application.update_queue.put(update)
+        return web.Response()
+
+    app = web.Application()
+    app.router.add_post(WEBHOOK_PATH, receive)
+    return app
+
+
+async def start_webhook(application: Application, allowed_updates: list[str],
+                        url: str = None, listen: str = None, port: int = None) -> web.AppRunner:
+    """Serve the webhook endpoint and register it with Telegram; returns the runner to clean up."""
+    url = (url or WEBHOOK_URL).rstrip("/")
+    if not url:
+        raise ValueError("WEBHOOK_URL environment variable not set")
+    secret = webhook_secret(application.bot.token)
+    runner = web.AppRunner(webhook_app(application, secret), access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, listen or WEBHOOK_LISTEN, WEBHOOK_PORT if port is None else port).start()
+    await application.bot.set_webhook(
+        url + WEBHOOK_PATH, allowed_updates=allowed_updates, secret_token=secret,
+    )
+    logger.info(f"Webhook set to {url}{WEBHOOK_PATH} (updates: {', '.join(allowed_updates)})")
+    return runner
+
+
+def run_webhook(application: Application, allowed_updates: list[str]):
+    """
+    Blocking counterpart of Application.run_polling for webhook mode: runs the
+    same post_init / post_shutdown hooks, serves updates from the embedded
+    aiohttp server and stops on SIGINT / SIGTERM.
+    """
+    loop = asyncio.get_event_loop()
+    stop = asyncio.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:  # Windows
+            pass
+
+    runner = None
+    try:
+        loop.run_until_complete(application.initialize())
+        if application.post_init:
+            loop.run_until_complete(application.post_init(application))
+        runner = loop.run_until_complete(start_webhook(application, allowed_updates))
+        loop.run_until_complete(application.start())
+        loop.run_until_complete(stop.wait())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if runner is not None:
+            loop.run_until_complete(runner.cleanup())
+        if application.running:
+            loop.run_until_complete(application.stop())
+        loop.run_until_complete(application.shutdown())
+        if application.post_shutdown:
+            loop.run_until_complete(application.post_shutdown(application))